@@ -1,7 +1,11 @@
 """Application entry point."""
 
+import multiprocessing
+
 from smart_home_app.main import run_app
 
 
 if __name__ == "__main__":
+    # Needed for camera capture child processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     run_app()
@@ -1,6 +1,13 @@
 """Smart Home application package."""
 
-from .main import run_app
 
-__all__ = ["run_app"]
+def __getattr__(name):
+    # Imported on first use, so the Qt-free services (and capture child
+    # processes, and the tests) do not pull in the whole UI
+    if name == "run_app":
+        from .main import run_app
+        return run_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
+__all__ = ["run_app"]
@@ -21,6 +21,7 @@ COLOR_POWER_ON_TEXT = "#000000"
 
 # --- Hardware constants ---
 WIZ_PORT = 38899
+WIZ_PUSH_PORT = 38900 # Bulbs send syncPilot state pushes here
 
 # --- Xiaomi device properties ---
 PROP_POWER = {"siid": 2, "piid": 1}
@@ -34,6 +35,8 @@ CONFIG_FILE = Path.home() / ".xiaomi_config.json"
 XIAOMI_CONFIG = CONFIG_FILE
 ICSEE_CONFIG = Path.home() / ".home_control_config.json"
 LOG_FILE = Path.home() / ".home_control.log"
+RECORDINGS_DIR = Path.home() / "Home Control Recordings"
+THUMBNAIL_DIR = Path.home() / ".home_control_thumbnails"
 
 # --- UI ---
 ICON_WIDTH = 40
@@ -61,6 +64,7 @@ __all__ = [
     "COLOR_POWER_ON",
     "COLOR_POWER_ON_TEXT",
     "WIZ_PORT",
+    "WIZ_PUSH_PORT",
     "PROP_POWER",
     "PROP_MODE",
     "PROP_AQI",
@@ -76,5 +80,7 @@ __all__ = [
     "XIAOMI_CONFIG",
     "ICSEE_CONFIG",
     "LOG_FILE",
+    "RECORDINGS_DIR",
+    "THUMBNAIL_DIR",
 ]
 
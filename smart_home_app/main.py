@@ -6,13 +6,13 @@ import os
 import logging
 import traceback
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QEvent
+from PyQt6.QtCore import QEvent, QTimer
 from PyQt6.QtGui import QFontDatabase
 from PyQt6.QtNetwork import QLocalServer, QLocalSocket
 
 from .core.constants import LOG_FILE, ICSEE_CONFIG
+from .services.startup import BridgeBootstrap, StartupTimeline
 from .ui.main_window import SmartHomeApp
-import json
 
 # --- Logging Setup ---
 logging.basicConfig(
@@ -81,28 +81,23 @@ class HomeControlApplication(QApplication):
         return super().event(event)
 
 def run_app():
+    timeline = StartupTimeline()
     app = HomeControlApplication(sys.argv)
     
     if app.is_running():
         print("Another instance is already running. Focusing existing window.")
         sys.exit(0)
+    timeline.mark("qt application")
     
     # Load fonts
     QFontDatabase.addApplicationFont(os.path.join(os.path.dirname(__file__), "fonts/SF-Pro-Display-Regular.otf"))
     QFontDatabase.addApplicationFont(os.path.join(os.path.dirname(__file__), "fonts/SF-Pro-Display-Bold.otf"))
     QFontDatabase.addApplicationFont(os.path.join(os.path.dirname(__file__), "fonts/SF-Pro-Text-Regular.otf"))
-    
+    timeline.mark("fonts")
     
     # Start go2rtc bridge
-    import subprocess
-    import signal
     import tempfile
     
-    go2rtc_process = None
-    
-    # Generate go2rtc.yaml to temp location
-    yaml_path = os.path.join(tempfile.gettempdir(), "home_control_go2rtc.yaml")
-    
     # Bundle-aware path resolution
     if getattr(sys, 'frozen', False):
         # Running in PyInstaller bundle
@@ -124,95 +119,29 @@ def run_app():
     
     # Generate go2rtc.yaml to temp location
     yaml_path = os.path.join(tempfile.gettempdir(), "home_control_go2rtc.yaml")
+    # Redirect go2rtc output to a dedicated log file (sys.stdout is None in --noconsole mode)
+    rtc_log_path = os.path.join(os.path.dirname(LOG_FILE), "go2rtc.log")
     
-    if os.path.exists(ICSEE_CONFIG):
-        try:
-            streams = {}
-            with open(ICSEE_CONFIG, 'r') as f:
-                data = json.load(f)
-                for i, cam in enumerate(data.get("cameras", [])):
-                    if cam.get("protocol") == "xmeye":
-                        user = cam.get("user", "admin")
-                        pwd = cam.get("pass", "")
-                        ip = cam.get("ip", "")
-                        if ip:
-                            # dvrip scheme for XMeye cameras
-                            # channel=0 default
-                            streams[f"cam_{i}_raw"] = f"dvrip://{user}:{pwd}@{ip}"
-                            streams[f"cam_{i}"] = f"ffmpeg:rtsp://127.0.0.1:8554/cam_{i}_raw#video=h264"
-            
-            if streams:
-                with open(yaml_path, "w") as f:
-                    f.write("api:\n  listen: \":1984\"\n")
-                    f.write("streams:\n")
-                    for k, v in streams.items():
-                        f.write(f"  {k}: {v}\n")
-                logging.info(f"Generated go2rtc config at {yaml_path}")
-        except Exception as e:
-            logging.error(f"Failed to generate go2rtc config: {e}")
-
-    # Start go2rtc with the generated config
-    # Ensure no zombies
-    try:
-        if os.name == 'nt':
-             subprocess.run(["taskkill", "/F", "/IM", "go2rtc.exe"], stderr=subprocess.DEVNULL)
-        else:
-             subprocess.run(["pkill", "go2rtc"], stderr=subprocess.DEVNULL)
-    except: pass
-    
-    # Cleanup old local file if exists to avoid confusion
-    if os.path.exists(os.path.join(project_root, "go2rtc.yaml")):
-        try: os.remove(os.path.join(project_root, "go2rtc.yaml"))
-        except: pass
-
-    if os.path.exists(go2rtc_path):
-        try:
-            # FIX: PyInstaller 'onefile' extracts to tmp without execute permissions on macOS/Linux
-            if os.name != 'nt':
-                os.chmod(go2rtc_path, 0o755)
-
-            logging.info(f"Starting go2rtc bridge from {go2rtc_path}...")
-            
-            # Redirect go2rtc output to the main log file (or separate) so we can see it
-            # sys.stdout/stderr are None in --noconsole mode
-            
-            # We use the same log file handle? Or just pipe to subprocess.PIPE and log lines?
-            # Piping and logging lines in a thread is best but complex.
-            # Simpler: Redirect to a dedicated log file for go2rtc
-            rtc_log_path = os.path.join(os.path.dirname(LOG_FILE), "go2rtc.log")
-            
-            rtc_log = open(rtc_log_path, "w")
-            go2rtc_process = subprocess.Popen(
-                [go2rtc_path, "-c", yaml_path], 
-                cwd=project_root, 
-                stdout=rtc_log, 
-                stderr=subprocess.STDOUT
-            )
-            logging.info(f"go2rtc started. PID: {go2rtc_process.pid}. Logs at {rtc_log_path}")
-            
-        except Exception as e:
-            logging.error(f"Failed to start go2rtc: {e}")
-    else:
-        logging.error(f"go2rtc binary NOT found at {go2rtc_path}")
+    # Kill stale go2rtc, write the config and spawn it in the background;
+    # the camera page waits for it only when it first needs the bridge
+    bridge_bootstrap = BridgeBootstrap(go2rtc_path, yaml_path, str(ICSEE_CONFIG), cwd=project_root,
+                                       log_path=rtc_log_path, timeline=timeline)
+    bridge_bootstrap.start()
 
     window = SmartHomeApp()
     app.window = window
+    timeline.mark("main window")
+    window.cam_tab.attach_bridge(bridge_bootstrap)
     window.show()
+    # Runs on the first event loop pass, right after the window is first painted
+    QTimer.singleShot(0, lambda: timeline.mark("first paint"))
     
     exit_code = app.exec()
     
     # Cleanup
-    if go2rtc_process:
-        logging.info("Stopping go2rtc bridge...")
-        go2rtc_process.terminate()
-        try:
-            go2rtc_process.wait(timeout=2)
-        except subprocess.TimeoutExpired:
-            go2rtc_process.kill()
-        
-        # Close log file
-        try:
-            rtc_log.close()
-        except: pass
+    window.cam_tab.shutdown()
+    window.wiz_tab.shutdown()
+    logging.info("Stopping go2rtc bridge...")
+    bridge_bootstrap.stop()
             
     sys.exit(exit_code)
@@ -0,0 +1,282 @@
+"""Camera audio: an ``ffmpeg`` PCM decoder feeding a small adaptive jitter buffer.
+
+The video pipeline (OpenCV) only ever sees the picture, so audio is pulled
+separately from the same go2rtc bridge stream by an ``ffmpeg`` child that
+decodes it to mono 16-bit PCM on stdout. A reader thread pushes the PCM
+into :class:`JitterBuffer`, and the audio device pulls from it on its own
+clock. Nothing here touches the video path, so enabling audio adds no
+video latency.
+
+OpenCV exposes no presentation timestamps, so audio is synced against the
+measured display latency of the video instead: the buffer never plays
+audio sooner than the picture it belongs to is shown
+(:meth:`JitterBuffer.set_video_delay`). Above that floor the buffer grows
+when the network starves it and shrinks again once delivery is steady.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from .video import ReconnectPolicy, reconnect_status
+
+SAMPLE_RATE = 16000
+CHANNELS = 1
+SAMPLE_BYTES = 2 # s16le
+CHUNK_MS = 20
+TARGET_MS = 80.0
+MIN_MS = 40.0
+MAX_MS = 300.0
+# Target change per underrun, and per steady period without one
+STEP_MS = 20.0
+DECAY_SECONDS = 10.0
+
+
+class JitterBuffer:
+    """Thread-safe PCM FIFO that absorbs network jitter with minimal delay.
+
+    ``push`` is called by the decoder, ``pull`` by the audio device. On an
+    underrun the target depth grows by ``STEP_MS`` and playback waits
+    (silence) until that much is buffered again; a burst that overfills the
+    buffer is trimmed from the oldest end, so latency cannot creep up.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        channels: int = CHANNELS,
+        target_ms: float = TARGET_MS,
+        min_ms: float = MIN_MS,
+        max_ms: float = MAX_MS,
+    ) -> None:
+        self.frame_bytes = channels * SAMPLE_BYTES
+        self.bytes_per_ms = sample_rate * self.frame_bytes / 1000.0
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.target_ms = min(max(target_ms, min_ms), max_ms)
+        self.video_delay_ms = 0.0
+        self.underruns = 0
+        self.dropped_ms = 0.0
+        self._buffer = bytearray()
+        self._priming = True # Silence until the target depth is first reached
+        self._steady_since = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def buffered_ms(self) -> float:
+        return len(self._buffer) / self.bytes_per_ms
+
+    def _bytes(self, ms: float) -> int:
+        n = int(ms * self.bytes_per_ms)
+        return n - n % self.frame_bytes
+
+    def _depth_ms(self) -> float:
+        # Never play ahead of the picture, whatever the network allows
+        return min(max(self.target_ms, self.video_delay_ms), self.max_ms)
+
+    def set_video_delay(self, ms: float) -> None:
+        """Latency from receiving a video frame to showing it."""
+        with self._lock:
+            self.video_delay_ms = max(0.0, ms)
+            if self.buffered_ms + STEP_MS < self._depth_ms():
+                # The picture fell further behind: pause briefly to fall back in step
+                self._priming = True
+
+    def push(self, data: bytes) -> None:
+        with self._lock:
+            self._buffer += data
+            # A burst after a stall: drop the oldest audio rather than lag behind
+            depth = self._depth_ms()
+            if len(self._buffer) > self._bytes(depth * 2 + CHUNK_MS):
+                excess = len(self._buffer) - self._bytes(depth)
+                excess -= excess % self.frame_bytes # Keep sample alignment
+                del self._buffer[:excess]
+                self.dropped_ms += excess / self.bytes_per_ms
+
+    def pull(self, size: int) -> bytes:
+        """Return up to ``size`` bytes of PCM; silence while (re)buffering."""
+        size -= size % self.frame_bytes
+        with self._lock:
+            now = time.monotonic()
+            if self._priming:
+                if len(self._buffer) < self._bytes(self._depth_ms()):
+                    return bytes(size)
+                self._priming = False
+                self._steady_since = now
+            if not self._buffer:
+                # Starved: rebuild a deeper cushion before playing again
+                self.underruns += 1
+                self.target_ms = min(self.target_ms + STEP_MS, self.max_ms)
+                self._priming = True
+                return bytes(size)
+            if now - self._steady_since > DECAY_SECONDS and self.target_ms > self.min_ms:
+                self.target_ms = max(self.target_ms - STEP_MS, self.min_ms)
+                self._steady_since = now
+            size = min(size, len(self._buffer))
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+            return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buffer.clear()
+            self._priming = True
+
+    def stats(self) -> dict:
+        return {
+            "buffered_ms": round(self.buffered_ms, 1),
+            "target_ms": round(self._depth_ms(), 1),
+            "underruns": self.underruns,
+            "dropped_ms": round(self.dropped_ms, 1),
+        }
+
+
+class AudioStream:
+    """Decodes a stream's first audio track into a :class:`JitterBuffer`.
+
+    Runs ``ffmpeg`` in a reader thread and restarts it with backoff if it
+    exits; gives up for good if the stream has no audio track.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        sample_rate: int = SAMPLE_RATE,
+        channels: int = CHANNELS,
+        buffer: Optional[JitterBuffer] = None,
+        on_status: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.url = url
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.buffer = buffer or JitterBuffer(sample_rate, channels)
+        # Called on the reader thread
+        self.on_status = on_status
+        self.policy = ReconnectPolicy(max_attempts=None, cap=30.0)
+        self.status = ""
+        self._process: Optional[subprocess.Popen] = None
+        self._running = False
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="audio-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._running = False
+        self._wakeup.set()
+        self._kill()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+        self.buffer.clear()
+
+    def _set_status(self, status: str) -> None:
+        self.status = status
+        if self.on_status:
+            try:
+                self.on_status(status)
+            except Exception as e:
+                logging.error(f"Audio status callback failed: {e}")
+
+    def _command(self, ffmpeg: str) -> list:
+        return [
+            ffmpeg, "-hide_banner", "-loglevel", "error", "-nostdin",
+            "-rtsp_transport", "tcp",
+            "-fflags", "nobuffer", "-flags", "low_delay",
+            "-analyzeduration", "500000", "-probesize", "32768",
+            "-i", self.url,
+            "-vn", "-map", "0:a:0",
+            "-ac", str(self.channels), "-ar", str(self.sample_rate),
+            "-f", "s16le", "pipe:1",
+        ]
+
+    def _run(self) -> None:
+        ffmpeg = shutil.which("ffmpeg")
+        if not ffmpeg:
+            self._set_status("ffmpeg not found")
+            return
+        chunk = int(self.sample_rate * self.channels * SAMPLE_BYTES * CHUNK_MS / 1000)
+        attempt = 0
+        while self._running:
+            self._set_status("Connecting...")
+            try:
+                self._process = subprocess.Popen(
+                    self._command(ffmpeg),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    stdin=subprocess.DEVNULL,
+                )
+            except OSError as e:
+                self._set_status(f"Failed: {e}")
+                return
+            process = self._process
+            # Drain stderr as it is written; a full pipe would block ffmpeg
+            errors: deque = deque(maxlen=20)
+            drain = threading.Thread(
+                target=self._drain, args=(process.stderr, errors), name="audio-stderr", daemon=True
+            )
+            drain.start()
+            received = False
+            fd = process.stdout.fileno()
+            while self._running:
+                try:
+                    data = os.read(fd, chunk) # Returns as soon as ffmpeg writes anything
+                except OSError:
+                    break
+                if not data:
+                    break
+                if not received:
+                    received = True
+                    attempt = 0
+                    self._set_status("Live")
+                self.buffer.push(data)
+            self._kill()
+            drain.join(1.0)
+            if not self._running:
+                break
+            error = "\n".join(errors)
+            if not received and "matches no streams" in error:
+                self._set_status("No audio")
+                return
+            attempt += 1
+            delay = self.policy.delay(attempt)
+            if error:
+                logging.warning(f"Audio stream exited: {error.splitlines()[-1]}")
+            self._set_status(reconnect_status(attempt, delay))
+            self.buffer.clear()
+            self._wakeup.wait(delay)
+
+    @staticmethod
+    def _drain(pipe, lines: deque) -> None:
+        try:
+            for raw in pipe:
+                line = raw.decode(errors="replace").strip()
+                if line:
+                    lines.append(line)
+        except (OSError, ValueError):
+            pass
+
+    def _kill(self) -> None:
+        process = self._process
+        if process is None or process.poll() is not None:
+            return
+        process.kill()
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+__all__ = ["AudioStream", "JitterBuffer", "SAMPLE_RATE", "CHANNELS"]
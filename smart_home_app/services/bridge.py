@@ -0,0 +1,242 @@
+"""Keeps go2rtc's stream list in sync with the camera config.
+
+The camera page hands :class:`BridgeClient` the full set of streams it
+wants (``{name: source}``) whenever the config changes. A background
+thread reads go2rtc's current streams, works out the minimal set of
+additions, source changes and deletions, and applies them over a single
+keep-alive HTTP connection. Only streams whose names start with the
+managed prefix are touched. If go2rtc is unreachable the sync is retried
+with backoff until it succeeds or a newer config replaces it.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import logging
+import threading
+import urllib.parse
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .video import ReconnectPolicy
+
+GO2RTC_HOST = "127.0.0.1"
+GO2RTC_PORT = 1984
+GO2RTC_API = f"http://{GO2RTC_HOST}:{GO2RTC_PORT}/api"
+BRIDGE_RTSP = "rtsp://127.0.0.1:8554"
+STREAM_PREFIX = "cam_"
+
+
+def new_camera_id() -> str:
+    """Short random ID that names a camera's bridge streams for its lifetime."""
+    return uuid.uuid4().hex[:8]
+
+
+def ensure_camera_ids(cameras: List[dict]) -> bool:
+    """Give every camera without one an ``id``; returns whether any was added."""
+    changed = False
+    for cam in cameras:
+        if not cam.get("id"):
+            cam["id"] = new_camera_id()
+            changed = True
+    return changed
+
+
+def stream_sources(info) -> List[str]:
+    """Producer URLs of one entry of go2rtc's ``/api/streams`` payload."""
+    if not isinstance(info, dict):
+        return []
+    return [p.get("url", "") for p in info.get("producers") or [] if isinstance(p, dict)]
+
+
+def diff_streams(
+    current: Dict[str, List[str]],
+    desired: Dict[str, str],
+    prefix: str = STREAM_PREFIX,
+) -> Tuple[Dict[str, str], Dict[str, str], List[str]]:
+    """Return ``(add, update, delete)`` to turn ``current`` into ``desired``.
+
+    ``current`` maps stream names to their producer sources. Names outside
+    ``prefix`` are never deleted.
+    """
+    add: Dict[str, str] = {}
+    update: Dict[str, str] = {}
+    for name, src in desired.items():
+        if name not in current:
+            add[name] = src
+        elif current[name] != [src]:
+            update[name] = src
+    delete = [name for name in current if name.startswith(prefix) and name not in desired]
+    return add, update, delete
+
+
+def bridge_config_yaml(streams: Dict[str, str], port: int = GO2RTC_PORT) -> str:
+    """go2rtc config file for ``streams``, used to seed the bridge at startup."""
+    lines = ["api:", f'  listen: ":{port}"']
+    if streams:
+        lines.append("streams:")
+        # JSON strings are valid YAML scalars, so credentials with ':' or '#' survive
+        lines += [f"  {json.dumps(name)}: {json.dumps(src)}" for name, src in streams.items()]
+    return "\n".join(lines) + "\n"
+
+
+class BridgeClient:
+    """Applies stream config to go2rtc asynchronously; the latest config wins."""
+
+    def __init__(
+        self,
+        host: str = GO2RTC_HOST,
+        port: int = GO2RTC_PORT,
+        prefix: str = STREAM_PREFIX,
+        timeout: float = 3.0,
+        on_synced: Optional[Callable[[bool, str], None]] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.prefix = prefix
+        self.timeout = timeout
+        # Called on the client thread with (ok, summary) after each attempt
+        self.on_synced = on_synced
+        self.policy = ReconnectPolicy(max_attempts=None, cap=30.0)
+        self.synced = False
+        self._desired: Optional[Dict[str, str]] = None
+        self._dirty = False
+        self._conn: Optional[http.client.HTTPConnection] = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------ #
+    # Public API (any thread, never blocks)
+    # ------------------------------------------------------------------ #
+    def sync(self, streams: Dict[str, str]) -> None:
+        """Make go2rtc's managed streams exactly ``streams``."""
+        with self._lock:
+            self._desired = dict(streams)
+            self._dirty = True
+        self._ensure_thread()
+        self._wakeup.set()
+
+    def resync(self) -> None:
+        """Re-apply the last config (e.g. after go2rtc restarted)."""
+        with self._lock:
+            if self._desired is None:
+                return
+            self._dirty = True
+        self._ensure_thread()
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        self._running = False
+        self._wakeup.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(self.timeout)
+
+    # ------------------------------------------------------------------ #
+    # Client thread
+    # ------------------------------------------------------------------ #
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name="bridge-sync", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        attempt = 0
+        delay = None
+        while self._running:
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+            if not self._running:
+                break
+            with self._lock:
+                desired, self._dirty = self._desired, False
+            if desired is None:
+                delay = None
+                continue
+            try:
+                summary = self._apply(desired)
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                self._close()
+                self.synced = False
+                attempt += 1
+                delay = self.policy.delay(attempt)
+                logging.warning(f"go2rtc sync failed ({e}); retrying in {delay:.0f}s")
+                with self._lock:
+                    self._dirty = True
+                self._notify(False, str(e))
+                continue
+            attempt = 0
+            self.synced = True
+            with self._lock:
+                delay = 0 if self._dirty else None  # A newer config arrived meanwhile
+            if summary:
+                logging.info(f"go2rtc streams synced: {summary}")
+            self._notify(True, summary)
+        self._close()
+
+    def _apply(self, desired: Dict[str, str]) -> str:
+        status, body = self._request("GET", "/api/streams")
+        if status != 200:
+            raise OSError(f"GET /api/streams returned {status}")
+        payload = json.loads(body or b"{}") or {}
+        current = {name: stream_sources(info) for name, info in payload.items()}
+        add, update, delete = diff_streams(current, desired, self.prefix)
+
+        # Deletions first (a renamed camera frees its old names), then
+        # additions in config order, so raw sources exist before re-streams
+        for name in delete:
+            self._check("DELETE", {"src": name})
+        for name, src in add.items():
+            self._check("PUT", {"name": name, "src": src})
+        for name, src in update.items():
+            self._check("PATCH", {"name": name, "src": src})
+        parts = [f"{len(items)} {label}" for label, items in (("added", add), ("updated", update), ("removed", delete)) if items]
+        return ", ".join(parts)
+
+    def _check(self, method: str, params: Dict[str, str]) -> None:
+        status, _ = self._request(method, "/api/streams?" + urllib.parse.urlencode(params))
+        if status >= 400:
+            raise OSError(f"{method} {params.get('name') or params.get('src')} returned {status}")
+
+    def _request(self, method: str, path: str) -> Tuple[int, bytes]:
+        # One persistent connection; reconnect once if go2rtc closed it while idle
+        try:
+            return self._send(method, path)
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            self._close()
+            return self._send(method, path)
+
+    def _send(self, method: str, path: str) -> Tuple[int, bytes]:
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        self._conn.request(method, path)
+        response = self._conn.getresponse()
+        return response.status, response.read()
+
+    def _close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
+
+    def _notify(self, ok: bool, summary: str) -> None:
+        if self.on_synced:
+            try:
+                self.on_synced(ok, summary)
+            except Exception as e:
+                logging.error(f"Bridge sync callback failed: {e}")
+
+
+__all__ = [
+    "BridgeClient",
+    "BRIDGE_RTSP",
+    "GO2RTC_API",
+    "bridge_config_yaml",
+    "diff_streams",
+    "ensure_camera_ids",
+    "new_camera_id",
+]
@@ -0,0 +1,338 @@
+"""Camera decoding in a child process with shared-memory frame transport.
+
+The child owns the ``cv2.VideoCapture`` and writes RGB frames into a
+``multiprocessing.shared_memory`` block split into a few buffers. Each buffer
+has a sequence counter in the block header that is odd while the child is
+writing and even once the frame is complete (a seqlock), so the parent can
+copy a frame out without locking and detect torn reads. Small control
+messages travel over two one-way pipes.
+
+Because decoding lives in its own process, a wedged capture (the 15 s RTSP
+open timeout, a hung read) can simply be killed, and decoding does not
+compete with the GUI for the interpreter.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from .frames import FrameMailbox, FrameRing
+from .metrics import stats_for
+from .video import ReconnectPolicy, _open_capture, crop_roi, reconnect_status
+
+BUFFERS = 3
+HEADER_BYTES = 8 * BUFFERS  # one int64 sequence counter per buffer
+
+
+def _fit(width: int, height: int, out: Optional[tuple[int, int]]) -> tuple[int, int]:
+    if not out:
+        return width, height
+    scale = min(out[0] / width, out[1] / height)
+    if scale >= 1.0:
+        return width, height
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _capture_main(url: str, events, control) -> None:
+    """Child process entry point."""
+    shm: Optional[shared_memory.SharedMemory] = None
+    capacity = 0
+    index = 0
+    output_size: Optional[tuple[int, int]] = None
+    roi: Optional[tuple] = None
+    standby = False
+    bgr = None
+    cap = None
+    policy = ReconnectPolicy()
+    attempt = 0
+
+    try:
+        while True:
+            while control.poll():
+                msg = control.recv()
+                if msg[0] == "stop":
+                    return
+                if msg[0] == "size":
+                    output_size = msg[1]
+                elif msg[0] == "roi":
+                    roi = msg[1]
+                elif msg[0] == "standby":
+                    standby = msg[1]
+                    if standby:
+                        bgr = None
+
+            if cap is None:
+                cap = _open_capture(url)
+                if cap is not None:
+                    attempt = 0
+                    events.send(("status", "Live"))
+                    continue
+            elif standby:
+                # Hidden: keep the connection and decoder in sync, publish nothing
+                if cap.grab():
+                    continue
+                cap.release()
+                cap = None
+            else:
+                t_grab = time.monotonic()
+                ret, bgr = cap.read(bgr) if bgr is not None else cap.read()
+                # CLOCK_MONOTONIC is system-wide, so the parent can compare it
+                t_read = time.monotonic()
+                if ret:
+                    h, w = bgr.shape[:2]
+                    if shm is None or w * h * 3 > capacity:
+                        # Size buffers for the full sensor frame so resizes never reallocate
+                        old = shm
+                        capacity = w * h * 3
+                        shm = shared_memory.SharedMemory(create=True, size=HEADER_BYTES + BUFFERS * capacity)
+                        np.ndarray((BUFFERS,), dtype=np.int64, buffer=shm.buf)[:] = 0
+                        events.send(("shm", shm.name, capacity))
+                        if old is not None:
+                            # The parent keeps its own mapping until it switches over
+                            old.close()
+                            old.unlink()
+                    _write_frame(shm, capacity, index, bgr, output_size, roi, t_read, t_read - t_grab, events)
+                    index = (index + 1) % BUFFERS
+                    continue
+                bgr = None
+                cap.release()
+                cap = None
+
+            attempt += 1
+            if policy.exhausted(attempt):
+                events.send(("status", "Connection Failed"))
+                return
+            delay = policy.delay(attempt)
+            events.send(("status", reconnect_status(attempt, delay)))
+            # Sleep through the backoff, but wake at once for a stop request
+            control.poll(delay)
+    except (BrokenPipeError, EOFError, OSError):
+        pass  # Parent went away
+    finally:
+        if cap is not None:
+            cap.release()
+        if shm is not None:
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _write_frame(shm, capacity: int, index: int, bgr, output_size, roi, t_read: float, decode: float, events) -> None:
+    t_convert = time.monotonic()
+    h, w = bgr.shape[:2]
+    tw, th = _fit(w, h, output_size)
+    src, roi = crop_roi(bgr, roi)
+    ch, cw = src.shape[:2]
+    tw, th = max(1, round(cw * tw / w)), max(1, round(ch * th / h))
+    w, h = cw, ch
+    header = np.ndarray((BUFFERS,), dtype=np.int64, buffer=shm.buf)
+    view = np.ndarray((th, tw, 3), dtype=np.uint8, buffer=shm.buf, offset=HEADER_BYTES + index * capacity)
+    header[index] += 1  # odd: writing
+    if (tw, th) != (w, h):
+        src = cv2.resize(src, (tw, th), interpolation=cv2.INTER_AREA)
+    cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=view)
+    header[index] += 1  # even: complete
+    convert_ms = (time.monotonic() - t_convert) * 1000.0
+    events.send(("frame", index, int(header[index]), tw, th, t_read, convert_ms, roi, decode * 1000.0))
+
+
+class ProcessCaptureSession:
+    """Parent-side handle for a camera decoded in a child process.
+
+    Mirrors the parts of :class:`~.video.CaptureSession` the UI uses
+    (``mailbox``, ``ring``, ``set_output_size``, callbacks) so the page can
+    swap one for the other. The driver thread calls :meth:`start`, then
+    :meth:`poll` in a loop, then :meth:`stop`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ring_slots: int = 3,
+        on_frame: Optional[Callable[[], None]] = None,
+        on_status: Optional[Callable[[str], None]] = None,
+        name: Optional[str] = None,
+        stats_key: object = None,
+    ) -> None:
+        self.url = url
+        self.name = name or "Camera"
+        self.stats = stats_for(stats_key if stats_key is not None else self.name, self.name)
+        self.ring = FrameRing(ring_slots)
+        self.mailbox = FrameMailbox()
+        self.on_frame = on_frame
+        self.on_status = on_status
+        self.status = "Idle"
+        self.output_size: Optional[tuple[int, int]] = None
+        self.roi: Optional[tuple] = None
+        self.standby = False
+        self.frames_published = 0
+        self.torn_reads = 0
+        self._process = None
+        self._events = None
+        self._control = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._capacity = 0
+        # The GUI thread (resizes) and the driver thread (stop) both send
+        self._control_lock = threading.Lock()
+
+    def _send_control(self, msg: tuple) -> None:
+        with self._control_lock:
+            if self._control is None:
+                return
+            try:
+                self._control.send(msg)
+            except OSError:
+                pass
+
+    def start(self) -> None:
+        # spawn, not fork: forking a process that runs Qt threads is unsafe
+        ctx = mp.get_context("spawn")
+        events_recv, events_send = ctx.Pipe(duplex=False)
+        control_recv, control_send = ctx.Pipe(duplex=False)
+        self._process = ctx.Process(
+            target=_capture_main,
+            args=(self.url, events_send, control_recv),
+            name="camera-capture",
+            daemon=True,
+        )
+        self._process.start()
+        # Close our copies of the child's ends so EOF is detected if it dies
+        events_send.close()
+        control_recv.close()
+        self._events = events_recv
+        with self._control_lock:
+            self._control = control_send
+        if self.output_size:
+            self.set_output_size(*self.output_size)
+        if self.roi:
+            self.set_roi(self.roi)
+        if self.standby:
+            self.set_standby(True)
+
+    def set_output_size(self, width: int, height: int) -> None:
+        self.output_size = (width, height) if width > 0 and height > 0 else None
+        self._send_control(("size", self.output_size))
+
+    def set_roi(self, roi: Optional[tuple]) -> None:
+        self.roi = tuple(roi) if roi else None
+        self._send_control(("roi", self.roi))
+
+    def set_standby(self, standby: bool) -> None:
+        """Grab-only in the child, as :meth:`CaptureSession.set_standby`."""
+        self.standby = standby
+        self._send_control(("standby", standby))
+        if standby:
+            self.mailbox.clear()
+
+    def poll(self, timeout: float = 0.1) -> bool:
+        """Handle pending child messages; return ``False`` once the child is gone."""
+        if self._events is None:
+            return False
+        latest = None
+        try:
+            if not self._events.poll(timeout):
+                return self._process is not None and self._process.is_alive()
+            # Drain everything queued and only copy the newest frame
+            while self._events.poll():
+                msg = self._events.recv()
+                kind = msg[0]
+                if kind == "frame":
+                    self.stats.note_decoded(msg[5], msg[8])
+                    self.stats.note_converted(msg[6])
+                    if latest is not None:
+                        self.stats.note_dropped()
+                    latest = msg
+                elif kind == "status":
+                    self.status = msg[1]
+                    if self.on_status:
+                        self.on_status(msg[1])
+                elif kind == "shm":
+                    latest = None  # Frames announced before the switch are gone
+                    self._attach(msg[1], msg[2])
+        except (EOFError, OSError):
+            return False
+        if latest is not None:
+            self._copy_frame(*latest[1:8])
+        return True
+
+    def _attach(self, name: str, capacity: int) -> None:
+        self._detach()
+        try:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._capacity = capacity
+        except FileNotFoundError:
+            # Already replaced by a newer block; its announcement follows
+            pass
+
+    def _detach(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def _copy_frame(self, index: int, seq: int, width: int, height: int, t_read: float, convert_ms: float, roi: tuple) -> None:
+        if self._shm is None:
+            return
+        header = np.ndarray((BUFFERS,), dtype=np.int64, buffer=self._shm.buf)
+        if header[index] != seq:
+            self.torn_reads += 1
+            self.stats.note_dropped()
+            return
+        frame = self.ring.acquire(height, width)
+        if frame is None:
+            self.stats.note_dropped()
+            return
+        src = np.ndarray((height, width, 3), dtype=np.uint8, buffer=self._shm.buf,
+                         offset=HEADER_BYTES + index * self._capacity)
+        np.copyto(frame.array, src)
+        if header[index] != seq:
+            # The child lapped us while copying; drop the torn frame
+            self.torn_reads += 1
+            self.stats.note_dropped()
+            frame.release()
+            return
+        self.frames_published += 1
+        frame.roi = roi
+        frame.t_read = t_read
+        frame.t_published = time.monotonic()
+        if self.mailbox.put(frame):
+            if self.on_frame:
+                self.on_frame()
+        else:
+            self.stats.note_dropped()
+
+    def stop(self, grace: float = 0.3) -> None:
+        """Stop the child, killing it if it does not exit within ``grace`` seconds."""
+        process, self._process = self._process, None
+        self._send_control(("stop",))
+        if process is not None:
+            process.join(grace)
+            if process.is_alive():
+                logging.info(f"Killing wedged capture process for {self.name}")
+                process.kill()
+                process.join(1.0)
+        with self._control_lock:
+            for conn in (self._events, self._control):
+                if conn is not None:
+                    conn.close()
+            self._events = self._control = None
+        if self._shm is not None:
+            # A killed child cannot unlink its block; do it for it
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._detach()
+        self.mailbox.clear()
+
+
+__all__ = ["ProcessCaptureSession"]
@@ -0,0 +1,293 @@
+"""Pre/post-roll event clips from an in-memory ring of JPEG frames.
+
+OpenCV gives us decoded frames rather than compressed packets, so each
+:class:`ClipBuffer` keeps a few seconds of downscaled frames re-encoded as
+JPEG: a handful of kilobytes each, bounded by both age and total bytes.
+When a clip is triggered (motion, or the clip button) the buffer keeps
+collecting for the post-roll, then hands pre-roll plus post-roll to the
+:class:`ClipWriter` thread, which writes an MP4 off the GUI and decode
+threads. Clips live in their own tree (:data:`CLIPS_DIR` under the
+recordings folder) with their own retention policy.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .recorder import RetentionPolicy
+
+PRE_ROLL_SECONDS = 10.0
+POST_ROLL_SECONDS = 10.0
+MAX_BUFFER_MB = 16.0
+CLIP_FPS = 10.0
+# Sampling rate while the stream is otherwise only grabbed and no clip is pending
+IDLE_FPS = 1.0
+CLIP_WIDTH = 640
+JPEG_QUALITY = 70
+# Clip tree under the recordings folder; camera directories never start
+# with "_" (see camera_dirname), so the two cannot collide
+CLIPS_DIR = "_clips"
+
+
+class ClipBuffer:
+    """Rolling JPEG history for one camera, fed from its decode thread.
+
+    Exposes the same ``due(now, idle)`` / ``feed(bgr, now)`` tap interface
+    as :class:`~.motion.MotionDetector`. Frames may arrive at anything
+    between ``idle_fps`` and ``fps``; clips are written in real time either
+    way.
+    """
+
+    def __init__(
+        self,
+        key: object,
+        name: str,
+        directory: Path,
+        writer: "ClipWriter",
+        pre_roll: float = PRE_ROLL_SECONDS,
+        post_roll: float = POST_ROLL_SECONDS,
+        max_bytes: int = int(MAX_BUFFER_MB * 1024 * 1024),
+        fps: float = CLIP_FPS,
+        width: int = CLIP_WIDTH,
+        idle_fps: float = IDLE_FPS,
+    ) -> None:
+        self.key = key
+        self.name = name
+        self.directory = Path(directory)
+        self.writer = writer
+        self.pre_roll = pre_roll
+        self.post_roll = post_roll
+        self.max_bytes = max_bytes
+        self.fps = fps
+        self.width = width
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self.idle_interval = max(self.interval, 1.0 / idle_fps if idle_fps > 0 else 0.0)
+        self.bytes = 0
+        self.clips_saved = 0
+        self._frames: "deque[Tuple[float, bytes]]" = deque()
+        self._last_sample = float("-inf")
+        # Pending clip: (monotonic trigger time, monotonic end of post-roll, reason)
+        self._pending: Optional[Tuple[float, float, str]] = None
+        self._lock = threading.Lock()
+
+    def due(self, now: Optional[float] = None, idle: bool = False) -> bool:
+        """Whether to sample the next frame.
+
+        ``idle`` means the decoder would otherwise skip retrieving it
+        (standby, over the frame budget): then only ``idle_fps`` frames are
+        kept, unless a clip is collecting its post-roll.
+        """
+        now = time.monotonic() if now is None else now
+        interval = self.idle_interval if idle and self._pending is None else self.interval
+        return now - self._last_sample >= interval
+
+    def feed(self, bgr: np.ndarray, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        if now - self._last_sample < self.interval:
+            return
+        self._last_sample = now
+        h, w = bgr.shape[:2]
+        if w > self.width:
+            bgr = cv2.resize(bgr, (self.width, max(2, round(h * self.width / w) // 2 * 2)), interpolation=cv2.INTER_AREA)
+        ok, jpeg = cv2.imencode(".jpg", bgr, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+        if not ok:
+            return
+        data = jpeg.tobytes()
+        with self._lock:
+            self._frames.append((now, data))
+            self.bytes += len(data)
+            self._trim(now)
+            flush = self._pending is not None and now >= self._pending[1]
+            if flush:
+                frames, reason = self._take_pending()
+        if flush:
+            self._flush(frames, reason)
+
+    def trigger(self, reason: str = "manual") -> None:
+        """Save a clip around now; a trigger during the post-roll extends it."""
+        now = time.monotonic()
+        with self._lock:
+            if self._pending is not None:
+                start, _, first = self._pending
+                self._pending = (start, now + self.post_roll, first)
+            else:
+                self._pending = (now, now + self.post_roll, reason)
+
+    @property
+    def pending(self) -> bool:
+        return self._pending is not None
+
+    def flush_overdue(self, now: Optional[float] = None, grace: float = 1.0) -> bool:
+        """Save a pending clip whose post-roll ended ``grace`` seconds ago.
+
+        Normally :meth:`feed` saves it; this covers a stream that stopped
+        being decoded (paused, closed, evicted) mid post-roll, using the
+        frames collected so far. Returns whether a clip was saved.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._pending is None or now < self._pending[1] + grace:
+                return False
+            frames, reason = self._take_pending()
+        self._flush(frames, reason)
+        return True
+
+    def finish(self) -> None:
+        """Save any pending clip right away with the frames there are."""
+        with self._lock:
+            if self._pending is None:
+                return
+            frames, reason = self._take_pending()
+        self._flush(frames, reason)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self.bytes = 0
+            self._pending = None
+
+    def _take_pending(self) -> Tuple[List[Tuple[float, bytes]], str]:
+        start, _, reason = self._pending
+        self._pending = None
+        return [frame for frame in self._frames if frame[0] >= start - self.pre_roll], reason
+
+    def _trim(self, now: float) -> None:
+        # Keep the pre-roll of a pending clip even if it is older than usual
+        oldest = now - self.pre_roll
+        if self._pending is not None:
+            oldest = min(oldest, self._pending[0] - self.pre_roll)
+        frames = self._frames
+        while frames and (frames[0][0] < oldest or self.bytes > self.max_bytes):
+            _, data = frames.popleft()
+            self.bytes -= len(data)
+
+    def _flush(self, frames: List[Tuple[float, bytes]], reason: str) -> None:
+        if not frames:
+            return
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3] # Milliseconds
+        path = self.directory / f"{stamp}-{reason}.mp4"
+        self.clips_saved += 1
+        self.writer.submit(self.key, path, self._resample(frames), self.fps)
+
+    def _resample(self, frames: List[Tuple[float, bytes]]) -> List[bytes]:
+        # Repeat sparse (idle-rate) frames so the clip plays back in real time
+        out: List[bytes] = []
+        start = frames[0][0]
+        for n, (t, data) in enumerate(frames):
+            end = frames[n + 1][0] if n + 1 < len(frames) else t + self.interval
+            out += [data] * max(1, round((end - start) * self.fps) - len(out))
+        return out
+
+
+class ClipWriter:
+    """Single background thread that turns JPEG frame lists into MP4 files.
+
+    With ``root`` and ``retention`` the policy is applied to ``root`` after
+    every clip written.
+    """
+
+    def __init__(
+        self,
+        on_saved: Optional[Callable[[object, str], None]] = None,
+        root: Optional[Path] = None,
+        retention: Optional[RetentionPolicy] = None,
+    ) -> None:
+        # Called on the writer thread with (camera key, path) once a clip is on disk
+        self.on_saved = on_saved
+        self.root = Path(root) if root is not None else None
+        self.retention = retention
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, key: object, path: Path, frames: List[bytes], fps: float) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="clip-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((key, path, frames, fps))
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Finish queued clips, then stop the thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            key, path, frames, fps = job
+            path = self._unused(path)
+            try:
+                self._write(path, frames, fps)
+            except Exception as e:
+                logging.error(f"Failed to write clip {path}: {e}")
+                continue
+            logging.info(f"Saved clip {path} ({len(frames)} frames)")
+            self._apply_retention()
+            if self.on_saved:
+                self.on_saved(key, str(path))
+
+    def _apply_retention(self) -> None:
+        if self.retention is None or self.root is None:
+            return
+        try:
+            deleted, freed = self.retention.apply(self.root)
+        except OSError as e:
+            logging.error(f"Clip retention failed: {e}")
+            return
+        if deleted:
+            logging.info(f"Retention removed {deleted} clips ({freed / 1e6:.0f} MB)")
+
+    @staticmethod
+    def _unused(path: Path) -> Path:
+        # Never overwrite an earlier clip that ended up with the same name
+        candidate, n = path, 1
+        while candidate.exists():
+            candidate = path.with_name(f"{path.stem}-{n}{path.suffix}")
+            n += 1
+        return candidate
+
+    @staticmethod
+    def _write(path: Path, frames: List[bytes], fps: float) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        writer = None
+        size = None
+        last = img = None
+        try:
+            for data in frames:
+                if data is not last:
+                    # Repeated frames are the same object: decode once
+                    last = data
+                    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if img is None:
+                    continue
+                if writer is None:
+                    size = (img.shape[1], img.shape[0])
+                    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+                    if not writer.isOpened():
+                        raise OSError("could not open video writer")
+                elif (img.shape[1], img.shape[0]) != size:
+                    img = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+                writer.write(img)
+        finally:
+            if writer is not None:
+                writer.release()
+
+
+__all__ = ["ClipBuffer", "ClipWriter", "CLIPS_DIR", "IDLE_FPS"]
@@ -0,0 +1,146 @@
+"""Preallocated frame buffers shared between capture threads and the UI."""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+# Normalised (x, y, w, h) of the source frame a buffer covers
+FULL_ROI = (0.0, 0.0, 1.0, 1.0)
+
+
+class Frame:
+    """A leased RGB buffer from a :class:`FrameRing`.
+
+    The capture side fills ``array`` in place and hands the frame to the UI,
+    which must call :meth:`release` once it no longer paints from it.
+    """
+
+    __slots__ = ("ring", "slot", "array", "seq", "roi", "t_read", "t_published", "_released")
+
+    def __init__(self, ring: "FrameRing", slot: int, array: np.ndarray, seq: int) -> None:
+        self.ring = ring
+        self.slot = slot
+        self.array = array
+        self.seq = seq
+        # Part of the source frame in ``array`` (smaller than FULL_ROI when zoomed)
+        self.roi = FULL_ROI
+        # time.monotonic() when the decoder returned it / when it hit the mailbox
+        self.t_read = 0.0
+        self.t_published = 0.0
+        self._released = False
+
+    @property
+    def width(self) -> int:
+        return self.array.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.array.shape[0]
+
+    def release(self) -> None:
+        """Return the slot to the ring. Safe to call more than once."""
+        self.ring.release(self)
+
+
+class FrameRing:
+    """Fixed pool of RGB frame buffers reused across frames.
+
+    A slot is owned by exactly one party at a time: the producer between
+    :meth:`acquire` and the hand-off, then the consumer until it releases the
+    frame. When every slot is still owned the producer gets ``None`` and should
+    skip converting that frame instead of allocating a new one.
+    """
+
+    def __init__(self, slots: int = 3) -> None:
+        self._lock = threading.Lock()
+        self._buffers: list[np.ndarray | None] = [None] * slots
+        self._busy = [False] * slots
+        self._seq = 0
+        self.dropped = 0
+
+    def acquire(self, height: int, width: int) -> Frame | None:
+        """Lease a free slot sized ``height x width x 3``, or ``None`` if all are busy."""
+        with self._lock:
+            for slot, busy in enumerate(self._busy):
+                if busy:
+                    continue
+                buf = self._buffers[slot]
+                if buf is None or buf.shape[0] != height or buf.shape[1] != width:
+                    # Resolution changed (or first frame): reallocate this slot only.
+                    buf = np.empty((height, width, 3), dtype=np.uint8)
+                    self._buffers[slot] = buf
+                self._busy[slot] = True
+                self._seq += 1
+                return Frame(self, slot, buf, self._seq)
+            self.dropped += 1
+            return None
+
+    def release(self, frame: Frame) -> None:
+        with self._lock:
+            if frame._released:
+                return
+            frame._released = True
+            self._busy[frame.slot] = False
+
+    def trim(self) -> None:
+        """Free the buffers of idle slots; they are reallocated on the next acquire."""
+        with self._lock:
+            for slot, busy in enumerate(self._busy):
+                if not busy:
+                    self._buffers[slot] = None
+
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(buf.nbytes for buf in self._buffers if buf is not None)
+
+    def in_use(self) -> int:
+        with self._lock:
+            return sum(self._busy)
+
+
+class FrameMailbox:
+    """Single-slot hand-off between a capture thread and the UI.
+
+    Only the newest frame is kept: putting a frame while an older one is still
+    waiting releases the older one back to its ring and counts it as dropped,
+    so a stalled UI thread never builds up a backlog of stale frames.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._frame: Frame | None = None
+        self.dropped = 0
+        self.delivered = 0
+
+    def put(self, frame: Frame) -> bool:
+        """Store ``frame``; return ``True`` if the consumer needs a wake-up."""
+        with self._lock:
+            stale = self._frame
+            self._frame = frame
+            if stale is not None:
+                self.dropped += 1
+        if stale is not None:
+            stale.release()
+            return False
+        return True
+
+    def take(self) -> Frame | None:
+        """Return the newest frame (ownership passes to the caller), if any."""
+        with self._lock:
+            frame = self._frame
+            self._frame = None
+            if frame is not None:
+                self.delivered += 1
+        return frame
+
+    def clear(self) -> None:
+        with self._lock:
+            stale = self._frame
+            self._frame = None
+        if stale is not None:
+            stale.release()
+
+
+__all__ = ["FULL_ROI", "Frame", "FrameRing", "FrameMailbox"]
@@ -0,0 +1,215 @@
+"""Rolling latency/throughput statistics for the camera frame pipeline."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.request
+from collections import deque
+from typing import Dict, List, Optional
+
+GO2RTC_API = "http://127.0.0.1:1984/api"
+
+# Pipeline stages timed per frame, in order
+STAGES = ("decode", "convert", "handoff", "scale", "paint")
+
+
+class RollingHistogram:
+    """Last ``size`` samples with percentile queries."""
+
+    def __init__(self, size: int = 300) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, value: float) -> None:
+        with self._lock:
+            self._samples.append(value)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        rank = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+        return ordered[rank]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class RateMeter:
+    """Events per second over a sliding time window."""
+
+    def __init__(self, window: float = 5.0) -> None:
+        self.window = window
+        self._stamps: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def tick(self, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._stamps.append(now)
+            self._trim(now)
+
+    def rate(self) -> float:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            return len(self._stamps) / self.window
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._stamps and self._stamps[0] < cutoff:
+            self._stamps.popleft()
+
+
+class StreamStats:
+    """Per-camera pipeline timings.
+
+    Timestamps are ``time.monotonic()`` values: ``t_read`` when the decoder
+    returned the frame, then each stage duration in milliseconds. ``decode``
+    is the demux/decode call itself and ``convert`` the resize and colour
+    conversion of a published frame. The
+    glass-to-glass figure runs from ``t_read`` until the frame is queued for
+    repaint; it does not include camera encode or network time before the
+    decoder. ``scale`` is the GUI-side frame prep and ``paint`` the latest
+    ``paintEvent``, where any scaling now happens.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.decode_fps = RateMeter()
+        self.display_fps = RateMeter()
+        self.dropped = 0
+        self.stages: Dict[str, RollingHistogram] = {stage: RollingHistogram() for stage in STAGES}
+        self.glass_to_glass = RollingHistogram()
+        self._lock = threading.Lock()
+
+    def note_decoded(self, t_read: float, decode_ms: Optional[float] = None) -> None:
+        self.decode_fps.tick(t_read)
+        if decode_ms is not None:
+            self.stages["decode"].add(decode_ms)
+
+    def note_converted(self, convert_ms: float) -> None:
+        self.stages["convert"].add(convert_ms)
+
+    def note_dropped(self, count: int = 1) -> None:
+        with self._lock:
+            self.dropped += count
+
+    def note_displayed(self, t_read: float, handoff_ms: float, scale_ms: float, paint_ms: float) -> None:
+        now = time.monotonic()
+        self.display_fps.tick(now)
+        self.stages["handoff"].add(handoff_ms)
+        self.stages["scale"].add(scale_ms)
+        self.stages["paint"].add(paint_ms)
+        if t_read:
+            self.glass_to_glass.add((now - t_read) * 1000.0)
+
+    def snapshot(self) -> dict:
+        def pct(hist: RollingHistogram, p: float) -> Optional[float]:
+            value = hist.percentile(p)
+            return round(value, 1) if value is not None else None
+
+        return {
+            "name": self.name,
+            "decode_fps": round(self.decode_fps.rate(), 1),
+            "display_fps": round(self.display_fps.rate(), 1),
+            "dropped": self.dropped,
+            "glass_to_glass_ms": {"p50": pct(self.glass_to_glass, 50), "p99": pct(self.glass_to_glass, 99)},
+            "stages_ms": {stage: {"p50": pct(h, 50), "p99": pct(h, 99)} for stage, h in self.stages.items()},
+        }
+
+    def summary_lines(self) -> List[str]:
+        snap = self.snapshot()
+        g2g = snap["glass_to_glass_ms"]
+        lines = [
+            f"{snap['name']}",
+            f"decode {snap['decode_fps']:.1f} fps  display {snap['display_fps']:.1f} fps  dropped {snap['dropped']}",
+            f"glass-to-glass p50 {_fmt(g2g['p50'])}  p99 {_fmt(g2g['p99'])}",
+        ]
+        for stage, values in snap["stages_ms"].items():
+            lines.append(f"  {stage:<8} p50 {_fmt(values['p50'])}  p99 {_fmt(values['p99'])}")
+        return lines
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "--" if value is None else f"{value:.1f} ms"
+
+
+_registry: Dict[object, StreamStats] = {}
+_registry_lock = threading.Lock()
+
+
+def stats_for(key: object, name: Optional[str] = None) -> StreamStats:
+    """Return the shared stats object for a camera, creating it on first use.
+
+    ``key`` identifies the camera (its ID, so same-named cameras stay
+    apart); ``name`` is what the report shows and follows renames.
+    """
+    with _registry_lock:
+        stats = _registry.get(key)
+        if stats is None:
+            stats = _registry[key] = StreamStats(name or str(key))
+        elif name:
+            stats.name = name
+        return stats
+
+
+def all_stats() -> List[StreamStats]:
+    with _registry_lock:
+        return list(_registry.values())
+
+
+def fetch_bridge_stats(timeout: float = 1.0) -> Optional[dict]:
+    """Return go2rtc's ``/api/streams`` payload, or ``None`` if the bridge is down."""
+    try:
+        with urllib.request.urlopen(f"{GO2RTC_API}/streams", timeout=timeout) as response:
+            return json.loads(response.read().decode())
+    except (OSError, ValueError):
+        return None
+
+
+def format_report(bridge: Optional[dict] = None, process: Optional[dict] = None) -> str:
+    """Plain-text report of every camera seen this session, plus go2rtc process and stream stats."""
+    sections = ["\n".join(stats.summary_lines()) for stats in all_stats()]
+    if not sections:
+        sections.append("No camera streams have run yet.")
+
+    if process:
+        if process.get("pid"):
+            state = "healthy" if process.get("healthy") else "not responding"
+            uptime = int(process.get("uptime") or 0)
+            rss = process.get("rss")
+            memory = f"{rss / 1e6:.0f} MB" if rss else "n/a"
+            line = (f"  pid {process['pid']}  {state}  up {uptime // 3600}h{uptime // 60 % 60:02d}m{uptime % 60:02d}s  "
+                    f"restarts {process.get('restarts', 0)}  RSS {memory}")
+        else:
+            line = f"  not running  restarts {process.get('restarts', 0)}"
+        lines = ["go2rtc process", line]
+        if process.get("last_error"):
+            lines.append(f"  last restart: {process['last_error']}")
+        sections.append("\n".join(lines))
+
+    if bridge:
+        lines = ["go2rtc streams"]
+        for name, info in sorted(bridge.items()):
+            info = info or {}
+            producers = info.get("producers") or []
+            consumers = info.get("consumers") or []
+            recv = sum(p.get("bytes_recv", p.get("recv", 0)) or 0 for p in producers)
+            lines.append(f"  {name:<16} producers {len(producers)}  consumers {len(consumers)}  recv {recv / 1e6:.1f} MB")
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections)
+
+
+__all__ = [
+    "RollingHistogram",
+    "RateMeter",
+    "StreamStats",
+    "stats_for",
+    "all_stats",
+    "fetch_bridge_stats",
+    "format_report",
+]
@@ -0,0 +1,216 @@
+"""Cheap motion detection on heavily downscaled camera frames.
+
+A :class:`MotionDetector` is attached to a :class:`~.video.CaptureSession`
+and fed from the decode thread. A few times a second it strides the BGR
+frame down to roughly 160 pixels wide (a numpy view, no resize), converts
+that to grayscale with integer weights and compares it with a running
+background average. Changed pixels inside the camera's ROI rectangles are
+counted; enough of them starts a motion event, and a quiet spell ends it.
+The whole check is a handful of vectorised operations on ~15k pixels, a
+small fraction of the cost of decoding the frame it samples.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+ANALYSIS_WIDTH = 160
+CHECKS_PER_SECOND = 5.0
+# Background learning rate per check; lower adapts to lighting more slowly
+BACKGROUND_ALPHA = 0.05
+# Consecutive positive checks to start an event, quiet seconds to end one
+START_CHECKS = 2
+HOLD_SECONDS = 2.0
+
+Box = Tuple[float, float, float, float]
+
+
+class MotionEvent:
+    """A motion ``start``, ``update`` or ``stop`` on one camera."""
+
+    __slots__ = ("key", "kind", "box", "level", "timestamp")
+
+    def __init__(self, key: object, kind: str, box: Optional[Box], level: float, timestamp: float) -> None:
+        self.key = key
+        self.kind = kind
+        # Normalised (x, y, w, h) bounding box of the changed pixels
+        self.box = box
+        # Fraction of the ROI that changed
+        self.level = level
+        # time.time() of the check that produced it
+        self.timestamp = timestamp
+
+    def __repr__(self) -> str:
+        return f"MotionEvent({self.key!r}, {self.kind!r}, box={self.box}, level={self.level:.3f})"
+
+
+class MotionDetector:
+    """Running-average frame differencing for one camera.
+
+    ``sensitivity`` (0..1) sets both the per-pixel change threshold and the
+    fraction of the ROI that must change. ``roi`` is a list of normalised
+    ``(x, y, w, h)`` rectangles to watch; empty means the whole frame.
+    """
+
+    def __init__(
+        self,
+        key: object,
+        sensitivity: float = 0.5,
+        roi: Optional[Sequence[Sequence[float]]] = None,
+        on_event: Optional[Callable[[MotionEvent], None]] = None,
+        checks_per_second: float = CHECKS_PER_SECOND,
+    ) -> None:
+        self.key = key
+        self.on_event = on_event
+        self.interval = 1.0 / checks_per_second if checks_per_second > 0 else 0.0
+        self.roi = [tuple(r) for r in roi or []]
+        self.set_sensitivity(sensitivity)
+        self.active = False
+        self.box: Optional[Box] = None
+        self.level = 0.0
+        self.checks = 0
+        # CPU seconds spent in feed(), to compare with decode cost
+        self.cpu_seconds = 0.0
+        self._background: Optional[np.ndarray] = None
+        self._mask: Optional[np.ndarray] = None
+        self._next_check = 0.0
+        self._hits = 0
+        self._last_motion = 0.0
+        self._lock = threading.Lock()
+
+    def set_sensitivity(self, sensitivity: float) -> None:
+        sensitivity = min(1.0, max(0.0, sensitivity))
+        self.sensitivity = sensitivity
+        # Grey levels a pixel must differ from the background by
+        self.pixel_threshold = 10.0 + (1.0 - sensitivity) * 40.0
+        # Fraction of the watched area that must change
+        self.area_threshold = 0.001 + (1.0 - sensitivity) * 0.03
+
+    def due(self, now: Optional[float] = None, idle: bool = False) -> bool:
+        """Whether the next frame should be sampled (lets callers skip retrieving it).
+
+        Checks keep their rate when the decoder is ``idle``.
+        """
+        now = time.monotonic() if now is None else now
+        return now >= self._next_check
+
+    def feed(self, bgr: np.ndarray, now: Optional[float] = None) -> None:
+        """Analyse ``bgr`` if a check is due. Called from the decode thread."""
+        now = time.monotonic() if now is None else now
+        if not self._lock.acquire(blocking=False):
+            return  # Another driver of the same camera is mid-check
+        try:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.interval
+            t0 = time.thread_time()
+            event = self._check(bgr, now)
+            self.cpu_seconds += time.thread_time() - t0
+        finally:
+            self._lock.release()
+        if event is not None and self.on_event:
+            try:
+                self.on_event(event)
+            except Exception as e:
+                logging.error(f"Motion event handler failed: {e}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._background = None
+            self._hits = 0
+            self.active = False
+            self.box = None
+
+    def _gray(self, bgr: np.ndarray) -> np.ndarray:
+        h, w = bgr.shape[:2]
+        step = max(1, w // ANALYSIS_WIDTH)
+        small = bgr[::step, ::step]
+        # ITU-R 601 luma with integer weights (sum 256)
+        gray = small[..., 2].astype(np.uint16) * 77
+        gray += small[..., 1].astype(np.uint16) * 150
+        gray += small[..., 0].astype(np.uint16) * 29
+        return (gray >> 8).astype(np.float32)
+
+    def _roi_mask(self, shape: Tuple[int, int]) -> np.ndarray:
+        if self._mask is not None and self._mask.shape == shape:
+            return self._mask
+        h, w = shape
+        if not self.roi:
+            mask = np.ones(shape, dtype=bool)
+        else:
+            mask = np.zeros(shape, dtype=bool)
+            for x, y, rw, rh in self.roi:
+                x0, y0 = int(x * w), int(y * h)
+                x1, y1 = int(np.ceil((x + rw) * w)), int(np.ceil((y + rh) * h))
+                mask[max(0, y0):min(h, y1), max(0, x0):min(w, x1)] = True
+        self._mask = mask
+        return mask
+
+    def _check(self, bgr: np.ndarray, now: float) -> Optional[MotionEvent]:
+        gray = self._gray(bgr)
+        self.checks += 1
+        if self._background is None or self._background.shape != gray.shape:
+            self._background = gray
+            return None
+
+        mask = self._roi_mask(gray.shape)
+        changed = (np.abs(gray - self._background) > self.pixel_threshold) & mask
+        # Running average background, updated in place
+        self._background *= 1.0 - BACKGROUND_ALPHA
+        self._background += BACKGROUND_ALPHA * gray
+
+        area = int(mask.sum()) or 1
+        count = int(changed.sum())
+        self.level = count / area
+        moving = self.level >= self.area_threshold
+        stamp = time.time()
+
+        if moving:
+            self._hits += 1
+            self._last_motion = now
+            self.box = _bounding_box(changed)
+            if not self.active and self._hits >= START_CHECKS:
+                self.active = True
+                return MotionEvent(self.key, "start", self.box, self.level, stamp)
+            if self.active:
+                return MotionEvent(self.key, "update", self.box, self.level, stamp)
+            return None
+
+        self._hits = 0
+        if self.active and now - self._last_motion >= HOLD_SECONDS:
+            self.active = False
+            box, self.box = self.box, None
+            return MotionEvent(self.key, "stop", box, self.level, stamp)
+        return None
+
+
+def _bounding_box(changed: np.ndarray) -> Optional[Box]:
+    rows = np.flatnonzero(changed.any(axis=1))
+    cols = np.flatnonzero(changed.any(axis=0))
+    if not rows.size or not cols.size:
+        return None
+    h, w = changed.shape
+    y0, y1 = rows[0], rows[-1] + 1
+    x0, x1 = cols[0], cols[-1] + 1
+    return (x0 / w, y0 / h, (x1 - x0) / w, (y1 - y0) / h)
+
+
+def parse_roi(value) -> List[Box]:
+    """Validate a config ``motion_roi`` value: a list of normalised rectangles."""
+    rects: List[Box] = []
+    for item in value or []:
+        try:
+            x, y, w, h = (float(v) for v in item)
+        except (TypeError, ValueError):
+            continue
+        if w > 0 and h > 0:
+            rects.append((x, y, w, h))
+    return rects
+
+
+__all__ = ["MotionDetector", "MotionEvent", "parse_roi"]
@@ -0,0 +1,76 @@
+"""Background motion coverage for cameras nothing on screen is decoding.
+
+Motion detectors and clip buffers are frame taps: they only see frames from
+a :class:`~.video.CaptureSession` that decodes their camera. The camera page
+feeds them from the single view and the grid; every other motion-enabled
+camera (another one selected, the page hidden, or the view decoded in a
+child process) is watched here instead. Each gets a grab-only session on its
+substream in a small :class:`~.video.DecodePool`, so it costs a low
+resolution decode plus the few frames a second the taps retrieve.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .video import CaptureSession, DecodePool
+
+# (url, display name, camera ID, taps)
+WatchSpec = Tuple[str, str, object, list]
+
+
+class MotionWatch:
+    """Keeps one standby session per watched camera, keyed by camera ID.
+
+    ``on_failed(key, url)`` is called on a pool thread when a session fails
+    before decoding a single frame (e.g. a substream path that does not
+    exist), so the caller can watch another URL instead.
+    """
+
+    def __init__(self, workers: int = 1, on_failed: Optional[Callable[[object, str], None]] = None) -> None:
+        self._workers = workers
+        self.on_failed = on_failed
+        self._pool: Optional[DecodePool] = None
+        self._sessions: Dict[object, CaptureSession] = {}
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._sessions
+
+    def keys(self) -> List[object]:
+        return list(self._sessions)
+
+    def set_cameras(self, cameras: Dict[object, WatchSpec]) -> None:
+        """Watch exactly ``cameras``; sessions whose URL is unchanged are kept."""
+        for key, session in list(self._sessions.items()):
+            spec = cameras.get(key)
+            if spec is None or spec[0] != session.url:
+                del self._sessions[key]
+                self._pool.remove(session)
+        for key, (url, name, camera_id, taps) in cameras.items():
+            session = self._sessions.get(key)
+            if session is None:
+                # Separate stats entry, so the on-screen figures stay its own
+                session = CaptureSession(url, key=key, name=f"{name} (motion)",
+                                         stats_key=(camera_id, "motion") if camera_id else None)
+                session.on_status = lambda status, s=session: self._on_status(s, status)
+                session.set_standby(True)
+                if self._pool is None:
+                    self._pool = DecodePool(workers=self._workers)
+                self._sessions[key] = session
+                self._pool.add(session)
+            session.taps = list(taps)
+
+    def _on_status(self, session: CaptureSession, status: str) -> None:
+        if session.frames_decoded or not ("Failed" in status or status.startswith("Reconnecting")):
+            return
+        if self.on_failed:
+            self.on_failed(session.key, session.url)
+
+    def stop(self) -> None:
+        self.set_cameras({})
+        if self._pool is not None:
+            self._pool.stop()
+            self._pool = None
+
+
+__all__ = ["MotionWatch"]
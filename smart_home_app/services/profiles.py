@@ -0,0 +1,108 @@
+"""Main/sub stream profiles per camera, and picking one for the view size.
+
+Most cameras serve a full-resolution main stream and a low-resolution
+substream. Small tiles, standby and thumbnails only need the substream,
+which costs a fraction of the bandwidth and decode CPU; the main stream is
+worth it once the picture is shown (or zoomed) wider than the substream
+can resolve.
+
+RTSP cameras configure a path per profile (``main_path``/``sub_path``; no
+``sub_path`` means no substream). XMeye cameras always have both, as
+dvrip ``subtype`` 0 and 1. Every profile is also published on the go2rtc
+bridge under a name derived from the camera's stable ``id``.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+MAIN = "main"
+SUB = "sub"
+PROFILES = (MAIN, SUB)
+
+DEFAULT_MAIN_PATH = "/live/0/main"
+DEFAULT_SUB_PATH = "/live/0/sub"
+# Widest on-screen source span (display pixels x zoom) the substream is used for
+SUB_MAX_WIDTH = 960
+# Drop back to the substream only this far below the limit, so resizing
+# or zooming around the threshold does not flap between streams
+HYSTERESIS = 0.2
+
+
+def has_substream(cam: dict) -> bool:
+    if cam.get("protocol", "rtsp") == "xmeye":
+        return True
+    return bool(cam.get("sub_path"))
+
+
+def stream_name(cam_id: str, profile: str = MAIN) -> str:
+    """go2rtc stream name of a camera's profile (see :func:`.bridge.ensure_camera_ids`)."""
+    return f"cam_{cam_id}" if profile == MAIN else f"cam_{cam_id}_sub"
+
+
+def camera_url(cam: dict, profile: str = MAIN) -> Optional[str]:
+    """Direct URL of ``profile`` on the camera itself (falls back to main)."""
+    ip = cam.get("ip", "")
+    if not ip:
+        return None
+    if profile == SUB and not has_substream(cam):
+        profile = MAIN
+    user = cam.get("user", "")
+    pwd = cam.get("pass", "")
+    if cam.get("protocol", "rtsp") == "xmeye":
+        return f"dvrip://{user}:{pwd}@{ip}?subtype={0 if profile == MAIN else 1}"
+    port = cam.get("port", "554")
+    path = (cam.get("main_path") or DEFAULT_MAIN_PATH) if profile == MAIN else cam["sub_path"]
+    if not path.startswith("/"):
+        path = "/" + path
+    return f"rtsp://{user}:{pwd}@{ip}:{port}{path}"
+
+
+def bridge_streams(cam: dict) -> Dict[str, str]:
+    """go2rtc streams for a camera, per profile.
+
+    RTSP cameras are relayed as-is (go2rtc only connects while something
+    pulls them). XMeye cameras get the raw dvrip source plus an H.264
+    re-stream of it, raw first so it exists when the re-stream starts.
+    """
+    streams: Dict[str, str] = {}
+    if not cam.get("ip") or not cam.get("id"):
+        return streams
+    xmeye = cam.get("protocol", "rtsp") == "xmeye"
+    for profile in PROFILES:
+        if profile == SUB and not has_substream(cam):
+            continue
+        name = stream_name(cam["id"], profile)
+        if xmeye:
+            streams[f"{name}_raw"] = camera_url(cam, profile)
+            streams[name] = f"ffmpeg:rtsp://127.0.0.1:8554/{name}_raw#video=h264"
+        else:
+            streams[name] = camera_url(cam, profile)
+    return streams
+
+
+class ProfileSelector:
+    """Chooses main or sub for a view ``width`` pixels wide at ``zoom``."""
+
+    def __init__(self, sub_max_width: float = SUB_MAX_WIDTH, hysteresis: float = HYSTERESIS) -> None:
+        self.sub_max_width = sub_max_width
+        self.hysteresis = hysteresis
+
+    def choose(self, width: float, zoom: float = 1.0, current: Optional[str] = None, available: bool = True) -> str:
+        if not available or self.sub_max_width <= 0:
+            return MAIN
+        needed = width * zoom
+        if current == MAIN:
+            return SUB if needed < self.sub_max_width * (1.0 - self.hysteresis) else MAIN
+        return MAIN if needed > self.sub_max_width else SUB
+
+
+__all__ = [
+    "MAIN",
+    "SUB",
+    "ProfileSelector",
+    "bridge_streams",
+    "camera_url",
+    "has_substream",
+    "stream_name",
+]
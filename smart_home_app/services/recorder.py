@@ -0,0 +1,316 @@
+"""Continuous camera recording to time-segmented files, without re-encoding.
+
+Each recording is an ``ffmpeg`` child process that pulls the camera from the
+go2rtc bridge and copies the packets into ``<root>/<camera>_<id>/<timestamp>.mkv``
+segments (``-c copy -f segment``), so recording costs almost no CPU. A single
+supervisor thread owns every process: it starts and stops them on request,
+restarts ones that exit with backoff, and applies the retention policy.
+Callers (the GUI) only enqueue commands, so nothing here blocks them.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .bridge import BRIDGE_RTSP
+from .video import ReconnectPolicy, reconnect_status
+
+SEGMENT_SECONDS = 300
+CONTAINERS = ("mkv", "mp4")
+RETENTION_INTERVAL = 60.0
+
+
+def camera_dirname(name: str, camera_id: Optional[str] = None) -> str:
+    """Filesystem-safe directory name for a camera.
+
+    With ``camera_id`` the ID is appended, so cameras sharing a name never
+    share a directory.
+    """
+    base = re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("._") or "camera"
+    return f"{base}_{camera_dirname(camera_id)}" if camera_id else base
+
+
+class RetentionPolicy:
+    """Delete the oldest segments by age, then until under a byte budget.
+
+    Only files one level down (``<root>/<camera>/<file>``) are considered,
+    so other trees under ``root`` (e.g. clips) are left alone.
+    """
+
+    def __init__(self, max_age_days: Optional[float] = 7.0, max_bytes: Optional[int] = 20 * 1024 ** 3) -> None:
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+
+    def apply(self, root: Path, active: Tuple[Path, ...] = ()) -> Tuple[int, int]:
+        """Prune segments under ``root``; returns ``(files_deleted, bytes_freed)``.
+
+        The newest segment of every directory in ``active`` is being written
+        and is never deleted.
+        """
+        segments = []
+        for path in root.glob("*/*"):
+            if path.suffix.lstrip(".") not in CONTAINERS:
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            segments.append((st.st_mtime, st.st_size, path))
+        segments.sort()
+
+        protected = set()
+        for directory in active:
+            newest = [seg for seg in segments if seg[2].parent == directory]
+            if newest:
+                protected.add(newest[-1][2])
+
+        deleted = freed = 0
+        total = sum(size for _, size, _ in segments)
+        cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days else None
+        for mtime, size, path in segments:
+            if path in protected:
+                continue
+            too_old = cutoff is not None and mtime < cutoff
+            too_big = self.max_bytes is not None and total > self.max_bytes
+            if not (too_old or too_big):
+                # Sorted oldest first: nothing later is older, and we are under budget
+                break
+            try:
+                path.unlink()
+            except OSError as e:
+                logging.error(f"Failed to delete recording {path}: {e}")
+                continue
+            deleted += 1
+            freed += size
+            total -= size
+        return deleted, freed
+
+
+class Recording:
+    """State of one camera's recording, owned by the supervisor thread."""
+
+    def __init__(self, key: str, name: str, url: str, directory: Path) -> None:
+        self.key = key
+        self.name = name
+        self.url = url
+        self.directory = directory
+        self.process: Optional[subprocess.Popen] = None
+        self.status = "Starting"
+        self.attempt = 0
+        self.retry_at = 0.0
+        self.started_at = 0.0
+
+
+class RecordingManager:
+    """Runs and supervises one passthrough ``ffmpeg`` recorder per camera.
+
+    Recordings are keyed by camera ID, which also names the directory.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        segment_seconds: int = SEGMENT_SECONDS,
+        container: str = "mkv",
+        retention: Optional[RetentionPolicy] = None,
+        on_status: Optional[Callable[[str, str], None]] = None,
+        policy: Optional[ReconnectPolicy] = None,
+    ) -> None:
+        self.root = Path(root)
+        self.segment_seconds = max(10, int(segment_seconds))
+        self.container = container if container in CONTAINERS else "mkv"
+        self.retention = retention or RetentionPolicy()
+        # Called on the supervisor thread with (key, status)
+        self.on_status = on_status
+        self.policy = policy or ReconnectPolicy(max_attempts=None, cap=60.0)
+        self._commands: "queue.Queue[tuple]" = queue.Queue()
+        self._recordings: Dict[str, Recording] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._last_retention = 0.0
+
+    # ------------------------------------------------------------------ #
+    # Public API (any thread, never blocks)
+    # ------------------------------------------------------------------ #
+    def start(self, key: str, name: str, url: str) -> None:
+        self._ensure_thread()
+        self._commands.put(("start", key, name, url))
+
+    def stop(self, key: str) -> None:
+        self._commands.put(("stop", key))
+
+    def is_recording(self, key: str) -> bool:
+        with self._lock:
+            return key in self._recordings
+
+    def status(self, key: str) -> Optional[str]:
+        with self._lock:
+            rec = self._recordings.get(key)
+            return rec.status if rec else None
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._recordings)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop every recorder, letting ffmpeg finalise the open segments."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._commands.put(("shutdown",))
+        thread.join(timeout)
+        self._thread = None
+
+    # ------------------------------------------------------------------ #
+    # Supervisor thread
+    # ------------------------------------------------------------------ #
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                cmd = self._commands.get(timeout=1.0)
+            except queue.Empty:
+                cmd = None
+            if cmd is not None:
+                if cmd[0] == "shutdown":
+                    for key in list(self._recordings):
+                        self._stop(key)
+                    return
+                if cmd[0] == "start":
+                    self._start(*cmd[1:])
+                elif cmd[0] == "stop":
+                    self._stop(cmd[1])
+            self._supervise()
+            if time.monotonic() - self._last_retention > RETENTION_INTERVAL:
+                self._last_retention = time.monotonic()
+                self._apply_retention()
+
+    def _set_status(self, rec: Recording, status: str) -> None:
+        rec.status = status
+        if self.on_status:
+            try:
+                self.on_status(rec.key, status)
+            except Exception as e:
+                logging.error(f"Recorder status callback failed: {e}")
+
+    def _start(self, key: str, name: str, url: str) -> None:
+        if key in self._recordings:
+            return
+        rec = Recording(key, name, url, self.root / camera_dirname(name, key))
+        with self._lock:
+            self._recordings[key] = rec
+        self._launch(rec)
+
+    def _stop(self, key: str) -> None:
+        with self._lock:
+            rec = self._recordings.pop(key, None)
+        if rec is None:
+            return
+        self._terminate(rec)
+        self._set_status(rec, "Stopped")
+
+    def _launch(self, rec: Recording) -> None:
+        ffmpeg = shutil.which("ffmpeg")
+        if not ffmpeg:
+            self._set_status(rec, "ffmpeg not found")
+            self._retry_later(rec)
+            return
+        try:
+            rec.directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            self._set_status(rec, f"Error: {e}")
+            self._retry_later(rec)
+            return
+
+        pattern = str(rec.directory / f"%Y%m%d-%H%M%S.{self.container}")
+        cmd = [
+            ffmpeg, "-hide_banner", "-loglevel", "error", "-nostdin",
+            "-rtsp_transport", "tcp", "-i", rec.url,
+            "-map", "0:v", "-map", "0:a?", "-c", "copy",
+            "-f", "segment", "-segment_time", str(self.segment_seconds),
+            "-segment_format", "matroska" if self.container == "mkv" else "mp4",
+            "-reset_timestamps", "1", "-strftime", "1",
+        ]
+        if self.container == "mp4":
+            # Fragmented so a segment cut off by a crash is still playable
+            cmd += ["-segment_format_options", "movflags=+frag_keyframe+empty_moov+default_base_moof"]
+        cmd.append(pattern)
+        try:
+            rec.process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            self._set_status(rec, f"Error: {e}")
+            self._retry_later(rec)
+            return
+        rec.started_at = time.monotonic()
+        logging.info(f"Recording {rec.name} to {rec.directory} (pid {rec.process.pid})")
+        self._set_status(rec, "Recording")
+
+    def _terminate(self, rec: Recording) -> None:
+        process, rec.process = rec.process, None
+        if process is None or process.poll() is not None:
+            return
+        # SIGTERM lets ffmpeg write the trailer of the open segment
+        process.terminate()
+        try:
+            process.wait(timeout=3)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def _retry_later(self, rec: Recording) -> None:
+        rec.attempt += 1
+        delay = self.policy.delay(rec.attempt)
+        rec.retry_at = time.monotonic() + delay
+        self._set_status(rec, reconnect_status(rec.attempt, delay))
+
+    def _supervise(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            recordings = list(self._recordings.values())
+        for rec in recordings:
+            if rec.process is None:
+                if now >= rec.retry_at:
+                    self._launch(rec)
+                continue
+            code = rec.process.poll()
+            if code is None:
+                if rec.attempt and now - rec.started_at > 30:
+                    rec.attempt = 0  # Stayed up: next failure starts the backoff over
+                continue
+            logging.warning(f"Recorder for {rec.name} exited with code {code}")
+            rec.process = None
+            self._retry_later(rec)
+
+    def _apply_retention(self) -> None:
+        if not self.root.exists():
+            return
+        with self._lock:
+            active = tuple(rec.directory for rec in self._recordings.values())
+        try:
+            deleted, freed = self.retention.apply(self.root, active)
+        except OSError as e:
+            logging.error(f"Recording retention failed: {e}")
+            return
+        if deleted:
+            logging.info(f"Retention removed {deleted} recording segments ({freed / 1e6:.0f} MB)")
+
+
+__all__ = ["RecordingManager", "RetentionPolicy", "camera_dirname", "BRIDGE_RTSP"]
@@ -0,0 +1,154 @@
+"""Warm-standby cache of recently viewed camera streams.
+
+Switching cameras normally costs a full RTSP handshake plus a wait for the
+next keyframe. Instead of closing the stream being left, the camera page
+parks its :class:`~.video.CaptureSession` here: a small :class:`~.video.DecodePool`
+keeps grabbing from it (no colour conversion, no UI work), so the decoder
+stays in sync and switching back only needs one ``retrieve``.
+
+The cache is least-recently-used and bounded three ways: stream count,
+estimated memory, and CPU time spent on standby grabbing. Going over any
+limit evicts the oldest parked stream.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from typing import List, Optional
+
+from .video import CaptureSession, DecodePool
+
+DEFAULT_MAX_STREAMS = 2
+DEFAULT_MAX_MEMORY_MB = 256
+DEFAULT_MAX_CPU_PERCENT = 50.0
+
+
+class StandbyCache:
+    """LRU of open, grab-only capture sessions keyed by ``session.key``."""
+
+    def __init__(
+        self,
+        max_streams: int = DEFAULT_MAX_STREAMS,
+        max_memory_mb: float = DEFAULT_MAX_MEMORY_MB,
+        max_cpu_percent: float = DEFAULT_MAX_CPU_PERCENT,
+        workers: int = 1,
+    ) -> None:
+        self.max_streams = max(0, max_streams)
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        # Percent of one core, summed over every parked stream
+        self.max_cpu_percent = max_cpu_percent
+        self.evictions = 0
+        self._workers = workers
+        self._pool: Optional[DecodePool] = None
+        self._sessions: "OrderedDict[object, CaptureSession]" = OrderedDict()
+        self._cpu: dict[object, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_streams > 0
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def keys(self) -> List[object]:
+        """Parked keys, least recently used first."""
+        return list(self._sessions)
+
+    def park(self, session: CaptureSession) -> bool:
+        """Keep ``session`` warm in standby; returns ``False`` if it was closed instead."""
+        if not self.enabled or not session.is_open:
+            self._close(session)
+            return False
+        old = self._sessions.pop(session.key, None)
+        if old is not None and old is not session:
+            self._evict(old)
+        session.on_frame = None
+        session.on_status = None
+        session.set_standby(True)
+        if self._pool is None:
+            self._pool = DecodePool(workers=self._workers)
+        self._sessions[session.key] = session
+        self._pool.add(session)
+        self.enforce()
+        return session.key in self._sessions
+
+    def take(self, key: object) -> Optional[CaptureSession]:
+        """Remove and return the parked session for ``key``, still open, if any."""
+        session = self._sessions.pop(key, None)
+        if session is None:
+            return None
+        self._cpu.pop(key, None)
+        self._pool.detach(session)
+        if not session.is_open:
+            # Dropped while parked and not yet reconnected
+            self._close(session)
+            return None
+        session.set_standby(False)
+        return session
+
+    def memory_bytes(self) -> int:
+        return sum(session.memory_estimate() for session in self._sessions.values())
+
+    def cpu_percent(self) -> float:
+        """CPU use of the parked streams as of the last :meth:`enforce`."""
+        return sum(self._cpu.values())
+
+    def enforce(self) -> None:
+        """Evict least recently used streams until every limit is met.
+
+        Call this periodically: the CPU figure is measured between calls.
+        """
+        if self._pool is not None:
+            usage = self._pool.cpu_usage()
+            self._cpu = {key: usage.get(key, 0.0) for key in self._sessions}
+        while self._sessions:
+            if len(self._sessions) > self.max_streams:
+                reason = "count"
+            elif self.memory_bytes() > self.max_memory_bytes:
+                reason = "memory"
+            elif self.cpu_percent() > self.max_cpu_percent:
+                reason = "cpu"
+            else:
+                break
+            key, session = self._sessions.popitem(last=False)
+            self._cpu.pop(key, None)
+            logging.info(f"Evicting standby stream {session.name} ({reason} limit)")
+            self._evict(session)
+
+    def discard(self, key: object) -> None:
+        """Close the parked session for ``key``, if any."""
+        session = self._sessions.pop(key, None)
+        if session is not None:
+            self._cpu.pop(key, None)
+            self._evict(session)
+
+    def clear(self) -> None:
+        while self._sessions:
+            _, session = self._sessions.popitem(last=False)
+            self._evict(session)
+        self._cpu.clear()
+
+    def stop(self) -> None:
+        self.clear()
+        if self._pool is not None:
+            self._pool.stop()
+            self._pool = None
+
+    def _evict(self, session: CaptureSession) -> None:
+        self.evictions += 1
+        if self._pool is not None:
+            self._pool.remove(session)
+        else:
+            self._close(session)
+
+    @staticmethod
+    def _close(session: CaptureSession) -> None:
+        session.close()
+        session.mailbox.clear()
+
+
+__all__ = ["StandbyCache"]
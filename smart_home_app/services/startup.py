@@ -0,0 +1,175 @@
+"""Application startup: a phase timeline, and the go2rtc bridge bootstrap.
+
+Everything the video bridge needs before it can run (killing a stale
+go2rtc, reading the camera config, writing the seed yaml, spawning the
+process) happens in :class:`BridgeBootstrap` on a background thread, so
+the window can be shown as soon as Qt is ready. The camera page waits for
+it only when it first needs a bridged stream.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from .bridge import bridge_config_yaml
+from .profiles import bridge_streams
+from .supervisor import Go2rtcSupervisor
+
+# Own logger at INFO so the timeline is written even though the app logs errors only
+log = logging.getLogger("startup")
+log.setLevel(logging.INFO)
+
+
+class StartupTimeline:
+    """Logs each startup phase with its duration and the time since launch."""
+
+    def __init__(self) -> None:
+        self.t0 = time.monotonic()
+        self._last = self.t0
+        self._lock = threading.Lock()
+        self.phases: List[Tuple[str, float, float]] = []
+
+    def mark(self, phase: str) -> None:
+        """Record that ``phase`` just finished (thread-safe)."""
+        now = time.monotonic()
+        with self._lock:
+            took = (now - self._last) * 1000.0
+            since = (now - self.t0) * 1000.0
+            self._last = now
+            self.phases.append((phase, took, since))
+        log.info(f"[startup] {phase:<24} +{took:7.1f} ms  (t={since:7.1f} ms, {threading.current_thread().name})")
+
+
+class BridgeBootstrap:
+    """Prepares and launches go2rtc off the GUI thread."""
+
+    def __init__(
+        self,
+        binary: str,
+        config_path: str,
+        camera_config: str,
+        cwd: Optional[str] = None,
+        log_path: Optional[str] = None,
+        timeline: Optional[StartupTimeline] = None,
+    ) -> None:
+        self.binary = binary
+        self.config_path = config_path
+        self.camera_config = camera_config
+        self.cwd = cwd
+        self.log_path = log_path
+        self.timeline = timeline
+        self.supervisor: Optional[Go2rtcSupervisor] = None
+        self._done = threading.Event()
+        self._callbacks: List[Callable[[Optional[Go2rtcSupervisor]], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, name="bridge-bootstrap", daemon=True).start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def add_done_callback(self, callback: Callable[[Optional[Go2rtcSupervisor]], None]) -> None:
+        """Call ``callback(supervisor)`` once the bridge is launched (now, if it already is).
+
+        Runs on the bootstrap thread unless already done; ``supervisor`` is
+        ``None`` if go2rtc could not be started.
+        """
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        self._call(callback)
+
+    def _mark(self, phase: str) -> None:
+        if self.timeline:
+            self.timeline.mark(phase)
+
+    def _run(self) -> None:
+        try:
+            self._kill_stale()
+            self._mark("bridge: stale go2rtc")
+            self._write_config()
+            self._mark("bridge: config")
+            if os.path.exists(self.binary):
+                if os.name != 'nt':
+                    # PyInstaller 'onefile' extracts to tmp without execute permissions on macOS/Linux
+                    try:
+                        os.chmod(self.binary, 0o755)
+                    except OSError:
+                        pass
+                log.info(f"Starting go2rtc bridge from {self.binary}...")
+                supervisor = Go2rtcSupervisor(self.binary, self.config_path, cwd=self.cwd, log_path=self.log_path)
+                if supervisor.start():
+                    self.supervisor = supervisor
+            else:
+                logging.error(f"go2rtc binary NOT found at {self.binary}")
+            self._mark("bridge: spawn")
+        except Exception as e:
+            logging.error(f"go2rtc bootstrap failed: {e}")
+        finally:
+            with self._lock:
+                self._done.set()
+                callbacks, self._callbacks = self._callbacks, []
+            for callback in callbacks:
+                self._call(callback)
+
+    def _call(self, callback: Callable[[Optional[Go2rtcSupervisor]], None]) -> None:
+        try:
+            callback(self.supervisor)
+        except Exception as e:
+            logging.error(f"Bridge bootstrap callback failed: {e}")
+
+    def _kill_stale(self) -> None:
+        # Ensure no zombies from a previous run hold the ports
+        try:
+            if os.name == 'nt':
+                subprocess.run(["taskkill", "/F", "/IM", "go2rtc.exe"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                subprocess.run(["pkill", "go2rtc"], stderr=subprocess.DEVNULL)
+        except OSError:
+            pass
+        # Cleanup old local file if exists to avoid confusion
+        if self.cwd:
+            try:
+                os.remove(os.path.join(self.cwd, "go2rtc.yaml"))
+            except OSError:
+                pass
+
+    def _write_config(self) -> None:
+        # Seed go2rtc with the current cameras; the camera page keeps it in sync afterwards
+        streams = {}
+        if os.path.exists(self.camera_config):
+            try:
+                with open(self.camera_config, 'r') as f:
+                    data = json.load(f)
+                for cam in data.get("cameras", []):
+                    streams.update(bridge_streams(cam))
+            except (OSError, ValueError) as e:
+                logging.error(f"Failed to read camera config: {e}")
+        try:
+            with open(self.config_path, "w") as f:
+                f.write(bridge_config_yaml(streams))
+            log.info(f"Generated go2rtc config at {self.config_path}")
+        except OSError as e:
+            logging.error(f"Failed to generate go2rtc config: {e}")
+
+    def stop(self) -> None:
+        """Stop go2rtc (waits for a bootstrap still in progress)."""
+        self._done.wait(10)
+        if self.supervisor is not None:
+            self.supervisor.stop()
+            self.supervisor = None
+
+
+__all__ = ["BridgeBootstrap", "StartupTimeline"]
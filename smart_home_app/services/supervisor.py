@@ -0,0 +1,244 @@
+"""Runs the go2rtc bridge and keeps it healthy.
+
+:class:`Go2rtcSupervisor` starts go2rtc, then a monitor thread polls its
+HTTP API every few seconds. If the process exits, or stops answering for
+several polls in a row (hung), it is killed and started again after a
+backoff delay. Each time a fresh process answers its first health check
+``on_ready`` is called so the caller can push the current stream config,
+which may differ from the startup yaml the new process read.
+"""
+
+from __future__ import annotations
+
+import http.client
+import logging
+import os
+import subprocess
+import threading
+import time
+from typing import Callable, Optional
+
+from .bridge import GO2RTC_HOST, GO2RTC_PORT
+from .video import ReconnectPolicy
+
+HEALTH_INTERVAL = 5.0
+HEALTH_TIMEOUT = 2.0
+# Consecutive failed polls before a running process counts as hung
+HANG_CHECKS = 3
+# A process that stayed healthy this long resets the restart backoff
+STABLE_SECONDS = 60.0
+
+_active: Optional["Go2rtcSupervisor"] = None
+
+
+def process_rss(pid: int) -> Optional[int]:
+    """Resident memory of ``pid`` in bytes, or ``None`` if it cannot be read."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if os.name == "nt":
+        return None
+    try:
+        # macOS and other systems without /proc; ps reports KiB
+        out = subprocess.run(["ps", "-o", "rss=", "-p", str(pid)], capture_output=True, text=True, timeout=2)
+        return int(out.stdout.strip()) * 1024
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+
+def bridge_process_stats() -> Optional[dict]:
+    """:meth:`Go2rtcSupervisor.stats` of the running supervisor, if there is one."""
+    return _active.stats() if _active is not None else None
+
+
+class Go2rtcSupervisor:
+    """Owns the go2rtc child process: health checks, restarts, stats."""
+
+    def __init__(
+        self,
+        binary: str,
+        config_path: str,
+        cwd: Optional[str] = None,
+        log_path: Optional[str] = None,
+        on_ready: Optional[Callable[[], None]] = None,
+        host: str = GO2RTC_HOST,
+        port: int = GO2RTC_PORT,
+        interval: float = HEALTH_INTERVAL,
+        policy: Optional[ReconnectPolicy] = None,
+    ) -> None:
+        self.binary = binary
+        self.config_path = config_path
+        self.cwd = cwd
+        self.log_path = log_path
+        # Called on the monitor thread whenever a (re)started process first answers
+        self.on_ready = on_ready
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.policy = policy or ReconnectPolicy(max_attempts=None, cap=60.0)
+        self.restarts = 0
+        self.healthy = False
+        self.last_error = ""
+        self._process: Optional[subprocess.Popen] = None
+        self._log = None
+        self._started_at = 0.0
+        self._attempt = 0
+        self._running = False
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        process = self._process
+        return process.pid if process is not None and process.poll() is None else None
+
+    def uptime(self) -> float:
+        return time.monotonic() - self._started_at if self.pid else 0.0
+
+    def stats(self) -> dict:
+        pid = self.pid
+        return {
+            "pid": pid,
+            "healthy": self.healthy,
+            "uptime": self.uptime(),
+            "restarts": self.restarts,
+            "rss": process_rss(pid) if pid else None,
+            "last_error": self.last_error,
+        }
+
+    def start(self) -> bool:
+        """Launch go2rtc and begin monitoring; ``False`` if it could not be started."""
+        global _active
+        if not self._spawn():
+            return False
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="go2rtc-supervisor", daemon=True)
+        self._thread.start()
+        _active = self
+        return True
+
+    def stop(self, timeout: float = 2.0) -> None:
+        global _active
+        self._running = False
+        self._wakeup.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+        self._terminate(timeout)
+        if self._log is not None:
+            try:
+                self._log.close()
+            except OSError:
+                pass
+            self._log = None
+        if _active is self:
+            _active = None
+
+    # ------------------------------------------------------------------ #
+    # Monitor thread
+    # ------------------------------------------------------------------ #
+    def _spawn(self) -> bool:
+        try:
+            if self._log is None and self.log_path:
+                self._log = open(self.log_path, "w") # Stays open across restarts
+            self._process = subprocess.Popen(
+                [self.binary, "-c", self.config_path],
+                cwd=self.cwd,
+                stdout=self._log or subprocess.DEVNULL,
+                stderr=subprocess.STDOUT,
+            )
+        except OSError as e:
+            self.last_error = f"Failed to start: {e}"
+            logging.error(f"Failed to start go2rtc: {e}")
+            return False
+        self._started_at = time.monotonic()
+        self.healthy = False
+        logging.info(f"go2rtc started. PID: {self._process.pid}. Logs at {self.log_path}")
+        return True
+
+    def _terminate(self, timeout: float = 2.0) -> None:
+        process, self._process = self._process, None
+        if process is None or process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def _check_health(self) -> bool:
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=HEALTH_TIMEOUT)
+        try:
+            conn.request("GET", "/api")
+            response = conn.getresponse()
+            response.read()
+            return response.status < 500
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            conn.close()
+
+    def _run(self) -> None:
+        failures = 0
+        while self._running:
+            self._wakeup.wait(self.interval)
+            if not self._running:
+                break
+            process = self._process
+            if process is None:
+                # The last start attempt failed
+                if not self._spawn():
+                    self._backoff()
+                failures = 0
+                continue
+
+            code = process.poll()
+            if code is not None:
+                self._restart(f"Exited with code {code}")
+                failures = 0
+                continue
+
+            if self._check_health():
+                failures = 0
+                if not self.healthy:
+                    self.healthy = True
+                    self._ready()
+                if self._attempt and time.monotonic() - self._started_at > STABLE_SECONDS:
+                    self._attempt = 0
+                continue
+
+            failures += 1
+            self.healthy = False
+            if failures >= HANG_CHECKS:
+                self._restart(f"No API response for {failures} checks")
+                failures = 0
+
+    def _restart(self, reason: str) -> None:
+        self.last_error = reason
+        logging.warning(f"go2rtc {reason.lower()}; restarting")
+        self.healthy = False
+        self._terminate()
+        self.restarts += 1
+        self._backoff()
+        if self._running:
+            self._spawn()
+
+    def _backoff(self) -> None:
+        self._attempt += 1
+        delay = self.policy.delay(self._attempt)
+        logging.info(f"Restarting go2rtc in {delay:.0f}s")
+        # Sleep through the delay, but wake at once for stop()
+        self._wakeup.wait(delay)
+
+    def _ready(self) -> None:
+        if self.on_ready:
+            try:
+                self.on_ready()
+            except Exception as e:
+                logging.error(f"go2rtc ready callback failed: {e}")
+
+
+__all__ = ["Go2rtcSupervisor", "bridge_process_stats", "process_rss"]
@@ -0,0 +1,211 @@
+"""Camera list thumbnails: an on-disk LRU cache plus a slow background refresher.
+
+Thumbnails are small JPEGs (about 160 px wide) stored one file per camera
+key. Reading one touches its mtime, and the least recently used files are
+deleted once the cache holds more than ``max_entries`` files or
+``max_bytes`` bytes. The refresher thread first publishes whatever is
+already cached (so the list fills in right after startup without blocking
+it), then fetches a fresh snapshot of each camera from go2rtc's
+``/api/frame.jpeg`` every ``interval`` seconds, one camera at a time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import logging
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .bridge import GO2RTC_API
+
+THUMBNAIL_WIDTH = 160
+REFRESH_INTERVAL = 120.0
+
+
+def thumbnail_key(camera_id: str) -> str:
+    """Stable cache key for a camera.
+
+    Derived from the camera ID, so it survives renames and reordering and
+    channels of one DVR (same IP, often the same name) stay apart.
+    """
+    return hashlib.sha1(f"camera|{camera_id}".encode()).hexdigest()[:16]
+
+
+class ThumbnailCache:
+    """Directory of ``<key>.jpg`` files with least-recently-used eviction."""
+
+    def __init__(self, directory: Path, max_entries: int = 64, max_bytes: int = 8 * 1024 * 1024) -> None:
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.jpg"
+
+    def load(self, key: str) -> Optional[bytes]:
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            return None
+        return data
+
+    def store(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.path(key)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)  # Readers never see a half-written file
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.jpg"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort(reverse=True)  # Most recently used first
+        total = 0
+        for n, (_, size, path) in enumerate(entries):
+            total += size
+            if n >= self.max_entries or total > self.max_bytes:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+
+def shrink_jpeg(data: bytes, width: int = THUMBNAIL_WIDTH) -> Optional[bytes]:
+    """Downscale a full-size JPEG snapshot to a thumbnail."""
+    # Let libjpeg decode at 1/4 scale first; full-res decode is wasted work
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_REDUCED_COLOR_4)
+    if img is None:
+        return None
+    h, w = img.shape[:2]
+    if w > width:
+        img = cv2.resize(img, (width, max(1, round(h * width / w))), interpolation=cv2.INTER_AREA)
+    ok, jpeg = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 80])
+    return jpeg.tobytes() if ok else None
+
+
+class ThumbnailRefresher:
+    """Background thread keeping the cache fresh for a list of cameras.
+
+    ``cameras`` entries are ``(key, stream)``, ``stream`` being the go2rtc
+    stream to snapshot.
+    ``on_thumbnail(key, data)`` is called on the refresher thread.
+    """
+
+    def __init__(
+        self,
+        cache: ThumbnailCache,
+        on_thumbnail: Optional[Callable[[str, bytes], None]] = None,
+        interval: float = REFRESH_INTERVAL,
+    ) -> None:
+        self.cache = cache
+        self.on_thumbnail = on_thumbnail
+        self.interval = interval
+        self._cameras: List[Tuple[str, str]] = []
+        self._fresh_at: dict[str, float] = {}
+        self._announced: set[str] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def set_cameras(self, cameras: List[Tuple[str, str]]) -> None:
+        with self._lock:
+            self._cameras = list(cameras)
+        self._wakeup.set()
+
+    def refresh_now(self, key: str) -> None:
+        """Fetch ``key`` on the next pass (e.g. right after its camera was edited)."""
+        with self._lock:
+            self._fresh_at.pop(key, None)
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="thumbnails", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        self._wakeup.set()
+        self._thread = None
+
+    def _run(self) -> None:
+        while self._running:
+            try:
+                self._pass()
+            except Exception as e:
+                # Never let one bad pass end refreshing for the session
+                logging.error(f"Thumbnail refresh failed: {e}")
+                self._wakeup.wait(5.0)
+                self._wakeup.clear()
+
+    def _pass(self) -> None:
+        with self._lock:
+            cameras = list(self._cameras)
+        # Cached thumbnails first, so the list fills in without waiting on the network
+        for key, _ in cameras:
+            if key not in self._announced:
+                self._announced.add(key)
+                data = self.cache.load(key)
+                if data:
+                    self._emit(key, data)
+        # Then at most one network fetch per pass, oldest first
+        now = time.monotonic()
+        stale = [cam for cam in cameras if now - self._fresh_at.get(cam[0], -1e9) >= self.interval]
+        if stale:
+            stale.sort(key=lambda cam: self._fresh_at.get(cam[0], -1e9))
+            self._refresh(*stale[0])
+            wait = 1.0
+        else:
+            wait = 5.0
+        self._wakeup.wait(wait)
+        self._wakeup.clear()
+
+    def _refresh(self, key: str, stream: str) -> None:
+        self._fresh_at[key] = time.monotonic()
+        url = f"{GO2RTC_API}/frame.jpeg?{urllib.parse.urlencode({'src': stream})}"
+        try:
+            with urllib.request.urlopen(url, timeout=10) as response:
+                data = shrink_jpeg(response.read())
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            # e.g. IncompleteRead when go2rtc drops the response partway
+            logging.debug(f"Thumbnail fetch for {stream} failed: {e}")
+            return
+        if not data:
+            return
+        try:
+            self.cache.store(key, data)
+        except OSError as e:
+            logging.error(f"Failed to cache thumbnail: {e}")
+        self._emit(key, data)
+
+    def _emit(self, key: str, data: bytes) -> None:
+        if self.on_thumbnail:
+            try:
+                self.on_thumbnail(key, data)
+            except Exception as e:
+                logging.error(f"Thumbnail callback failed: {e}")
+
+
+__all__ = ["ThumbnailCache", "ThumbnailRefresher", "shrink_jpeg", "thumbnail_key"]
@@ -0,0 +1,547 @@
+"""OpenCV capture sessions and the shared decode worker pool."""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from .frames import FULL_ROI, FrameMailbox, FrameRing
+from .metrics import stats_for
+
+# Set RTSP transport and timeout GLOBALLY for the process
+# Increased to 15s to handle slow initial handshake/flaky network
+os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = "rtsp_transport;tcp|stimeout;15000000|timeout;15000000"
+
+OPEN_TIMEOUT_MS = 15000
+READ_TIMEOUT_MS = 5000
+# Context decoded around a zoomed viewport, as a fraction of its size per
+# side, so small pans are served from the frame already on screen
+ROI_MARGIN = 0.25
+# Rough count of full-size YUV surfaces FFmpeg keeps per open decoder
+DECODER_SURFACES = 4
+
+
+class ReconnectPolicy:
+    """Jittered exponential backoff for stream reconnects."""
+
+    def __init__(
+        self,
+        base: float = 1.0,
+        factor: float = 2.0,
+        cap: float = 30.0,
+        max_attempts: Optional[int] = 8,
+        jitter: float = 0.25,
+    ) -> None:
+        self.base = base
+        self.factor = factor
+        self.cap = cap
+        self.max_attempts = max_attempts
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before ``attempt`` (1-based)."""
+        delay = min(self.cap, self.base * self.factor ** max(0, attempt - 1))
+        return delay * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+    def exhausted(self, attempt: int) -> bool:
+        return self.max_attempts is not None and attempt > self.max_attempts
+
+
+def reconnect_status(attempt: int, delay: float) -> str:
+    return f"Reconnecting (attempt {attempt}, next in {max(0, delay):.0f}s)"
+
+
+def crop_roi(image: np.ndarray, roi: Optional[tuple], margin: float = ROI_MARGIN) -> tuple[np.ndarray, tuple]:
+    """Slice normalised ``roi`` plus ``margin`` out of ``image`` without copying.
+
+    Returns the view and the normalised region it actually covers.
+    """
+    if roi is None:
+        return image, FULL_ROI
+    h, w = image.shape[:2]
+    x, y, rw, rh = roi
+    px0 = max(0, int((x - rw * margin) * w))
+    py0 = max(0, int((y - rh * margin) * h))
+    px1 = min(w, max(px0 + 1, math.ceil((x + rw * (1 + margin)) * w)))
+    py1 = min(h, max(py0 + 1, math.ceil((y + rh * (1 + margin)) * h)))
+    if (px0, py0, px1, py1) == (0, 0, w, h):
+        return image, FULL_ROI
+    return image[py0:py1, px0:px1], (px0 / w, py0 / h, (px1 - px0) / w, (py1 - py0) / h)
+
+
+def _open_capture(url: str):
+    """Open a capture, returning ``None`` if it did not connect."""
+    cap = cv2.VideoCapture(url)
+    # Attempt to set properties if supported (OpenCV 4.x+)
+    try:
+        cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, OPEN_TIMEOUT_MS)
+        cap.set(cv2.CAP_PROP_READ_TIMEOUT_MSEC, READ_TIMEOUT_MS)
+    except Exception:
+        pass
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    if not cap.isOpened():
+        cap.release()
+        return None
+    return cap
+
+
+def _open_cancellable(url: str, cancel: threading.Event, poll: float = 0.1):
+    """Run a blocking open on a helper thread, giving up as soon as ``cancel`` is set.
+
+    OpenCV cannot interrupt an open in progress, so an abandoned helper
+    releases its capture whenever the open finally returns.
+    """
+    done = threading.Event()
+    lock = threading.Lock()
+    state = {"cap": None, "abandoned": False}
+
+    def worker():
+        try:
+            cap = _open_capture(url)
+        except Exception as e:
+            logging.error(f"Capture open failed: {e}")
+            cap = None
+        with lock:
+            if state["abandoned"]:
+                if cap is not None:
+                    cap.release()
+            else:
+                state["cap"] = cap
+        done.set()
+
+    threading.Thread(target=worker, name="capture-open", daemon=True).start()
+    while not done.wait(poll):
+        if cancel.is_set():
+            with lock:
+                if not done.is_set():
+                    state["abandoned"] = True
+                    return None
+    return state["cap"]
+
+
+class CaptureSession:
+    """One camera stream decoded into a :class:`FrameRing`.
+
+    The session does no threading of its own: a driver (``VideoThread`` for the
+    single view, :class:`DecodePool` for the grid) calls :meth:`open` and
+    :meth:`read` from its decode thread. Frames go to ``mailbox`` and
+    ``on_frame`` is called whenever the UI needs waking up.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        key: object = None,
+        ring_slots: int = 3,
+        on_frame: Optional[Callable[[], None]] = None,
+        on_status: Optional[Callable[[str], None]] = None,
+        name: Optional[str] = None,
+        stats_key: object = None,
+    ) -> None:
+        self.url = url
+        self.key = key if key is not None else url
+        self.name = name or f"Camera {self.key}"
+        # Shared pipeline stats are keyed by camera ID when given, else by
+        # name (never the URL, which carries credentials)
+        self.stats = stats_for(stats_key if stats_key is not None else self.name, self.name)
+        self.ring = FrameRing(ring_slots)
+        self.mailbox = FrameMailbox()
+        self.on_frame = on_frame
+        self.on_status = on_status
+        self.status = "Idle"
+        # Frame budget: 0 publishes every decoded frame
+        self.max_fps = 0.0
+        # Display-resolution mode: (w, h) box frames are downscaled to fit
+        # before colour conversion. None keeps the sensor resolution.
+        self.output_size: Optional[tuple[int, int]] = None
+        # Zoomed viewport as normalised (x, y, w, h); only that region (plus
+        # ROI_MARGIN) is resized and colour-converted. None means the whole frame.
+        self.roi: Optional[tuple] = None
+        # Standby: keep the connection and decoder warm, but only grab
+        self.standby = False
+        # Frame taps (MotionDetector, ClipBuffer): objects with due(now, idle)
+        # and feed(bgr, now), sampled on the decode thread before conversion
+        self.taps: list = []
+        self.source_size: Optional[tuple[int, int]] = None
+        self.frames_decoded = 0
+        self.frames_published = 0
+        # CPU time (thread time) spent decoding and converting this stream
+        self.cpu_seconds = 0.0
+        self._cap = None
+        self._bgr = None
+        self._scaled = None
+        self._last_publish = 0.0
+        # Serialises read() against close() when another thread tears us down
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._cap is not None
+
+    def set_status(self, status: str) -> None:
+        self.status = status
+        if self.on_status:
+            self.on_status(status)
+
+    def set_output_size(self, width: int, height: int) -> None:
+        """Decode for a ``width x height`` viewport (takes effect on the next frame)."""
+        self.output_size = (width, height) if width > 0 and height > 0 else None
+
+    def set_roi(self, roi: Optional[tuple]) -> None:
+        """Restrict conversion to a normalised viewport (takes effect on the next frame)."""
+        self.roi = tuple(roi) if roi else None
+
+    def _fit(self, width: int, height: int) -> tuple[int, int]:
+        out = self.output_size
+        if not out:
+            return width, height
+        scale = min(out[0] / width, out[1] / height)
+        if scale >= 1.0:
+            # Never upscale here; the UI does that if it has to
+            return width, height
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
+    def open(self, cancel: Optional[threading.Event] = None) -> bool:
+        """Open the capture.
+
+        Blocks up to the RTSP open timeout, or only until ``cancel`` is set
+        when one is given.
+        """
+        cap = _open_capture(self.url) if cancel is None else _open_cancellable(self.url, cancel)
+        if cap is None:
+            return False
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+        with self._lock:
+            self._cap = cap
+            self.source_size = (width, height) if width and height else None
+        return True
+
+    def set_standby(self, standby: bool) -> None:
+        """Switch between full decoding and grab-only standby.
+
+        Standby drops the conversion buffers so a parked stream costs only its
+        demuxer and decoder.
+        """
+        with self._lock:
+            self.standby = standby
+            if standby:
+                self._bgr = None
+                self._scaled = None
+        if standby:
+            self.mailbox.clear()
+            self.ring.trim()
+
+    def publish_latest(self) -> bool:
+        """Convert and publish the most recently grabbed frame right away."""
+        with self._lock:
+            if self._cap is None or self.frames_decoded == 0:
+                return False
+            ret, bgr = self._cap.retrieve()
+            if not ret:
+                return False
+            self._bgr = bgr
+            self._last_publish = time.monotonic()
+            self._publish(bgr, self._last_publish)
+            return True
+
+    def memory_estimate(self) -> int:
+        """Approximate bytes held by this session: decoder surfaces plus our buffers."""
+        total = self.ring.nbytes()
+        for buf in (self._bgr, self._scaled):
+            if buf is not None:
+                total += buf.nbytes
+        if self._cap is not None and self.source_size:
+            width, height = self.source_size
+            total += DECODER_SURFACES * width * height * 3 // 2
+        return total
+
+    def close(self) -> None:
+        with self._lock:
+            cap, self._cap = self._cap, None
+            self._bgr = None
+            self._scaled = None
+        if cap is not None:
+            cap.release()
+
+    def read(self) -> bool:
+        """Decode the next frame and publish it if the frame budget allows.
+
+        Returns ``False`` when the stream broke and needs reopening.
+        """
+        with self._lock:
+            return self._read_locked()
+
+    def _read_locked(self) -> bool:
+        if self._cap is None:
+            return False
+        t0 = time.thread_time()
+        try:
+            t_grab = time.monotonic()
+            if not self._cap.grab():
+                return False
+            self.frames_decoded += 1
+
+            now = time.monotonic()
+            self.stats.note_decoded(now, (now - t_grab) * 1000.0)
+            taps = self.taps
+            # Parked in standby: stay connected and in sync with the GOP.
+            # Over budget: keep the stream drained. Either way skip
+            # retrieve/convert unless a tap wants a sample (at its idle rate).
+            if self.standby or (self.max_fps and now - self._last_publish < 1.0 / self.max_fps):
+                due = [tap for tap in taps if tap.due(now, idle=True)]
+                if due:
+                    ret, bgr = self._cap.retrieve()
+                    if ret:
+                        for tap in due:
+                            tap.feed(bgr, now)
+                return True
+
+            ret, bgr = self._cap.retrieve(self._bgr) if self._bgr is not None else self._cap.retrieve()
+            if not ret:
+                self._bgr = None
+                return False
+            self._bgr = bgr
+            self._last_publish = now
+            for tap in taps:
+                tap.feed(bgr, now)
+            self._publish(bgr, now)
+            return True
+        finally:
+            self.cpu_seconds += time.thread_time() - t0
+
+    def _publish(self, bgr, t_read: float) -> None:
+        # Convert is timed from here: retrieve() and the taps are not part of it
+        t_convert = time.monotonic()
+        h, w = bgr.shape[:2]
+        tw, th = self._fit(w, h)
+        # Crop first (a numpy view, no copy) so only the visible region is
+        # scaled and converted; the scale stays that of the whole frame
+        src, roi = crop_roi(bgr, self.roi)
+        if roi is not FULL_ROI:
+            ch, cw = src.shape[:2]
+            tw, th = max(1, round(cw * tw / w)), max(1, round(ch * th / h))
+            w, h = cw, ch
+        frame = self.ring.acquire(th, tw)
+        if frame is None:
+            # UI still owns every slot; skip conversion rather than allocate
+            self.stats.note_dropped()
+            return
+        if (tw, th) != (w, h):
+            dst = self._scaled if self._scaled is not None and self._scaled.shape[:2] == (th, tw) else None
+            src = self._scaled = cv2.resize(src, (tw, th), dst=dst, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=frame.array)
+        frame.roi = roi
+        self.frames_published += 1
+        frame.t_read = t_read
+        frame.t_published = time.monotonic()
+        self.stats.note_converted((frame.t_published - t_convert) * 1000.0)
+        # Only wake the UI if it has nothing pending; otherwise the
+        # older frame is replaced and at most one event is queued.
+        if self.mailbox.put(frame):
+            if self.on_frame:
+                self.on_frame()
+        else:
+            self.stats.note_dropped()
+
+
+class _PoolWorker(threading.Thread):
+    """Decode thread that round-robins over the sessions assigned to it."""
+
+    def __init__(self, pool: "DecodePool", index: int) -> None:
+        super().__init__(name=f"decode-worker-{index}", daemon=True)
+        self.pool = pool
+        self.sessions: List[CaptureSession] = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.running = True
+
+    def run(self) -> None:
+        while self.running:
+            with self.lock:
+                sessions = list(self.sessions)
+            if not sessions:
+                self.wakeup.wait(0.5)
+                self.wakeup.clear()
+                continue
+
+            did_work = False
+            for session in sessions:
+                if not self.running:
+                    break
+                if not session.is_open:
+                    self.pool._schedule_open(session)
+                    continue
+                did_work = True
+                if not session.read():
+                    session.close()
+                    self.pool._retry_later(session)
+
+            if not did_work:
+                # Everything is still connecting; avoid a busy spin
+                self.wakeup.wait(0.05)
+                self.wakeup.clear()
+
+        with self.lock:
+            sessions, self.sessions = self.sessions, []
+        for session in sessions:
+            session.close()
+            session.mailbox.clear()
+
+
+class DecodePool:
+    """Bounded pool of decode threads shared by many :class:`CaptureSession`.
+
+    Each session is pinned to the least loaded worker, so N cameras cost at
+    most ``workers`` threads. A worker decodes its sessions in turn; blocking
+    opens happen on short-lived helper threads so a dead camera never stalls
+    the others sharing its worker. Grid tiles keep retrying with capped
+    backoff rather than giving up.
+    """
+
+    def __init__(self, workers: int = 2, policy: Optional[ReconnectPolicy] = None) -> None:
+        self.max_workers = max(1, workers)
+        self.policy = policy or ReconnectPolicy(max_attempts=None)
+        self._lock = threading.Lock()
+        self._workers: List[_PoolWorker] = []
+        self._owner: Dict[int, _PoolWorker] = {}
+        self._opening: set[int] = set()
+        self._retry_at: Dict[int, float] = {}
+        self._attempts: Dict[int, int] = {}
+        self._cpu_marks: Dict[object, tuple[float, float]] = {}
+
+    def add(self, session: CaptureSession) -> None:
+        with self._lock:
+            if len(self._workers) < self.max_workers:
+                worker = _PoolWorker(self, len(self._workers))
+                self._workers.append(worker)
+                worker.start()
+            else:
+                worker = min(self._workers, key=lambda w: len(w.sessions))
+            self._owner[id(session)] = worker
+        with worker.lock:
+            worker.sessions.append(session)
+        if not session.is_open:
+            session.set_status("Connecting...")
+        worker.wakeup.set()
+
+    def detach(self, session: CaptureSession) -> bool:
+        """Stop driving ``session`` but leave it open, for hand-off to another driver."""
+        with self._lock:
+            worker = self._owner.pop(id(session), None)
+            self._retry_at.pop(id(session), None)
+            self._attempts.pop(id(session), None)
+            self._cpu_marks.pop(session.key, None)
+        if worker is None:
+            return False
+        with worker.lock:
+            if session in worker.sessions:
+                worker.sessions.remove(session)
+        return True
+
+    def suspend(self, session: CaptureSession) -> None:
+        """Stop driving ``session`` and close its capture; :meth:`add` reopens it."""
+        if self.detach(session):
+            threading.Thread(target=session.close, daemon=True).start()
+
+    def remove(self, session: CaptureSession) -> None:
+        if not self.detach(session):
+            return
+        session.on_frame = None
+        session.on_status = None
+        # close() waits for a read in progress, so do it off the caller's thread
+        threading.Thread(target=self._close_removed, args=(session,), daemon=True).start()
+
+    @staticmethod
+    def _close_removed(session: CaptureSession) -> None:
+        session.close()
+        session.mailbox.clear()
+
+    def stop(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+            self._owner.clear()
+            self._retry_at.clear()
+            self._attempts.clear()
+            self._cpu_marks.clear()
+        for worker in workers:
+            worker.running = False
+            worker.wakeup.set()
+
+    def sessions(self) -> List[CaptureSession]:
+        with self._lock:
+            workers = list(self._workers)
+        result: List[CaptureSession] = []
+        for worker in workers:
+            with worker.lock:
+                result.extend(worker.sessions)
+        return result
+
+    def cpu_usage(self) -> Dict[object, float]:
+        """Return CPU use per session key, in percent of one core, since the last call."""
+        now = time.monotonic()
+        usage: Dict[object, float] = {}
+        for session in self.sessions():
+            cpu = session.cpu_seconds
+            last_cpu, last_wall = self._cpu_marks.get(session.key, (cpu, now))
+            elapsed = now - last_wall
+            usage[session.key] = 100.0 * (cpu - last_cpu) / elapsed if elapsed > 0 else 0.0
+            self._cpu_marks[session.key] = (cpu, now)
+        return usage
+
+    # ------------------------------------------------------------------ #
+    # Connection management (called from worker threads)
+    # ------------------------------------------------------------------ #
+    def _retry_later(self, session: CaptureSession) -> None:
+        key = id(session)
+        with self._lock:
+            attempt = self._attempts.get(key, 0) + 1
+            self._attempts[key] = attempt
+            delay = self.policy.delay(attempt)
+            self._retry_at[key] = time.monotonic() + delay
+        session.set_status(reconnect_status(attempt, delay))
+
+    def _schedule_open(self, session: CaptureSession) -> None:
+        key = id(session)
+        with self._lock:
+            if key in self._opening or key not in self._owner:
+                return
+            if time.monotonic() < self._retry_at.get(key, 0.0):
+                return
+            self._opening.add(key)
+        threading.Thread(target=self._open, args=(session,), daemon=True).start()
+
+    def _open(self, session: CaptureSession) -> None:
+        try:
+            ok = session.open()
+        except Exception as e:
+            logging.error(f"Failed to open stream {session.key}: {e}")
+            ok = False
+        with self._lock:
+            self._opening.discard(id(session))
+            owned = id(session) in self._owner
+            if ok:
+                self._attempts.pop(id(session), None)
+            worker = self._owner.get(id(session))
+        if not owned:
+            # Removed while we were blocked in open()
+            session.close()
+            return
+        if ok:
+            session.set_status("Live")
+        else:
+            self._retry_later(session)
+        if worker:
+            worker.wakeup.set()
+
+
+__all__ = ["CaptureSession", "DecodePool", "ReconnectPolicy", "crop_roi", "reconnect_status"]
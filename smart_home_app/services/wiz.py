@@ -1,12 +1,165 @@
-"""WiZ light helpers."""
+"""WiZ light helpers.
+
+All traffic goes through one UDP socket owned by an asyncio event loop on a
+single background thread. :class:`WiZProtocol` matches each reply to its
+request by the bulb's address and the JSON ``id``, so any number of bulbs
+can be addressed concurrently without a socket or thread per command.
+
+:class:`WiZLightClient` exposes ``async_*`` coroutines (run them on the
+client's loop with :meth:`WiZLightClient.submit`) and blocking wrappers
+with the old signatures for callers that want a plain return value. The
+blocking wrappers must not be called from the loop thread itself.
+
+:class:`PilotCoalescer` sits in front of ``setPilot`` for continuous
+controls such as slider drags: per bulb, only the newest pending update is
+kept, sends are spaced at least ``min_interval`` apart and never overlap,
+and whatever was set last is always the final thing sent.
+
+State-changing commands (``setState``, ``setPilot``) are tracked until the
+bulb acknowledges them with ``{"result": {"success": true}}``; unanswered
+ones are retransmitted under the same ``id`` with a short backoff, so a late
+ack to an earlier copy still counts. Each command yields a
+:class:`CommandResult`, and :func:`summarize` condenses a group's results.
+
+:class:`WiZPushListener` gives live state without polling: it registers
+with every known bulb (``registration``), after which the bulb pushes a
+``syncPilot`` datagram to our port 38900 whenever its state changes, from
+a wall switch or the WiZ app as well as from us. Registrations lapse, so
+they are renewed periodically.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import contextlib
 import json
+import logging
 import socket
-from typing import List, Optional
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..core.constants import WIZ_PORT, WIZ_PUSH_PORT
+
+BROADCAST_ADDR = "255.255.255.255"
+REQUEST_TIMEOUT = 1.0
+PROBE_TIMEOUT = 0.5
+# Fastest a single bulb is sent setPilot updates while a control is dragged
+PILOT_MIN_INTERVAL = 0.1
+# Push registrations are renewed this often (bulbs forget them after a while)
+REGISTER_INTERVAL = 20.0
+# Ack wait before the first retransmit (doubles each time), and retransmits per command
+ACK_TIMEOUT = 0.25
+COMMAND_RETRIES = 3
+
+
+def is_ack(reply: dict | None) -> bool:
+    result = reply.get("result") if isinstance(reply, dict) else None
+    return isinstance(result, dict) and result.get("success") is True
+
+
+class CommandResult:
+    """Outcome of one state-changing command to one bulb."""
+
+    def __init__(self, ip: str, method: str, ok: bool, attempts: int, error: str = "") -> None:
+        self.ip = ip
+        self.method = method
+        self.ok = ok
+        self.attempts = attempts
+        self.error = error
+
+    def __repr__(self) -> str:
+        state = "ok" if self.ok else f"failed: {self.error}"
+        return f"CommandResult({self.ip} {self.method} {state}, attempts={self.attempts})"
+
+
+def summarize(results: List[CommandResult]) -> str:
+    """One line for a group command, e.g. ``"3/4 lights confirmed; no reply: 10.0.0.7"``."""
+    failed = [r for r in results if not r.ok]
+    text = f"{len(results) - len(failed)}/{len(results)} lights confirmed"
+    silent = [r.ip for r in failed if r.error == "no reply"]
+    refused = [f"{r.ip} ({r.error})" for r in failed if r.error != "no reply"]
+    if silent:
+        text += "; no reply: " + ", ".join(silent)
+    if refused:
+        text += "; refused: " + ", ".join(refused)
+    return text
+
+
+class WiZProtocol(asyncio.DatagramProtocol):
+    """Request/reply matching over a shared datagram socket."""
+
+    def __init__(self) -> None:
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self._pending: Dict[Tuple[str, int], Tuple[str, asyncio.Future]] = {}
+        self._next_id = 0
+        # Called with (ip, message) for datagrams no request is waiting on
+        self.listeners: List[Callable[[str, dict], None]] = []
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc) -> None:
+        self.transport = None
+        for _, future in self._pending.values():
+            if not future.done():
+                future.set_result(None)
+        self._pending.clear()
+
+    def new_id(self) -> int:
+        self._next_id = self._next_id % 0x7FFFFFFF + 1
+        return self._next_id
+
+    def send(self, ip: str, port: int, payload: dict) -> None:
+        if self.transport is None:
+            raise OSError("WiZ socket is closed")
+        self.transport.sendto(json.dumps(payload).encode(), (ip, port))
+
+    def expect(self, ip: str, payload: dict) -> asyncio.Future:
+        """Future resolved with the reply to ``payload`` (which must carry an ``id``)."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending[(ip, payload["id"])] = (payload.get("method", ""), future)
+        return future
+
+    def forget(self, ip: str, request_id: int) -> None:
+        self._pending.pop((ip, request_id), None)
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        try:
+            message = json.loads(data.decode())
+        except (UnicodeDecodeError, ValueError):
+            return
+        if not isinstance(message, dict):
+            return
+        ip = addr[0]
+        key = self._match(ip, message)
+        if key is not None:
+            _, future = self._pending.pop(key)
+            if not future.done():
+                future.set_result(message)
+            return
+        for listener in list(self.listeners):
+            try:
+                listener(ip, message)
+            except Exception as e:
+                logging.error(f"WiZ listener failed: {e}")
+
+    def _match(self, ip: str, message: dict) -> Optional[Tuple[str, int]]:
+        request_id = message.get("id")
+        if request_id is not None:
+            key = (ip, request_id)
+            return key if key in self._pending else None
+        # Some firmware omits the id: fall back to the oldest request for that method
+        method = message.get("method")
+        for key, (pending_method, _) in self._pending.items():
+            if key[0] == ip and pending_method == method:
+                return key
+        return None
 
-from ..core.constants import WIZ_PORT
+    def error_received(self, exc) -> None:
+        logging.debug(f"WiZ socket error: {exc}")
 
 
 class WiZLightClient:
@@ -14,54 +167,458 @@ class WiZLightClient:
 
     def __init__(self, port: int = WIZ_PORT) -> None:
         self.port = port
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.protocol: Optional[WiZProtocol] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
 
-    def send_request(self, ip: str | None, payload: dict, timeout: float = 1.0) -> dict | None:
-        if not ip:
-            return None
+    # ------------------------------------------------------------------ #
+    # Event loop
+    # ------------------------------------------------------------------ #
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self.loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                self._thread = threading.Thread(target=self._run_loop, args=(loop, ready), name="wiz-udp", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self.loop = loop
+            return self.loop
 
+    def _run_loop(self, loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._open(loop))
+        except OSError as e:
+            logging.error(f"WiZ socket could not be opened: {e}")
+        ready.set()
+        loop.run_forever()
+        loop.close()
+
+    async def _open(self, loop: asyncio.AbstractEventLoop) -> None:
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(timeout)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.bind(("0.0.0.0", 0))
+        _, self.protocol = await loop.create_datagram_endpoint(WiZProtocol, sock=sock)
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        """Schedule ``coro`` on the client's loop from any thread; never blocks."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _run(self, coro: Awaitable, timeout: float):
         try:
-            sock.sendto(json.dumps(payload).encode(), (ip, self.port))
-            data, _ = sock.recvfrom(4096)
-            return json.loads(data.decode())
-        except OSError:
+            return self.submit(coro).result(timeout + 1.0)
+        except (concurrent.futures.TimeoutError, OSError):
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self.loop = self.loop, None
+        if loop is None:
+            return
+
+        def shutdown() -> None:
+            if self.protocol and self.protocol.transport:
+                self.protocol.transport.close()
+            loop.stop()
+
+        loop.call_soon_threadsafe(shutdown)
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+
+    # ------------------------------------------------------------------ #
+    # Coroutines (run on the client's loop)
+    # ------------------------------------------------------------------ #
+    async def async_request(self, ip: str | None, payload: dict, timeout: float = REQUEST_TIMEOUT) -> dict | None:
+        """Send ``payload`` to one bulb and return its reply, or ``None`` on timeout."""
+        if not ip or self.protocol is None:
+            return None
+        payload = dict(payload, id=self.protocol.new_id())
+        future = self.protocol.expect(ip, payload)
+        try:
+            self.protocol.send(ip, self.port, payload)
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.TimeoutError, OSError):
             return None
         finally:
-            sock.close()
+            self.protocol.forget(ip, payload["id"])
 
-    def scan(self, broadcast_timeout: float = 1.5) -> list[str]:
+    async def async_command(
+        self,
+        ip: str,
+        method: str,
+        params: dict,
+        retries: int = COMMAND_RETRIES,
+        timeout: float = ACK_TIMEOUT,
+        superseded: Optional[Callable[[], bool]] = None,
+    ) -> CommandResult:
+        """Send a state change and retransmit until the bulb acknowledges it.
+
+        Stops early (unconfirmed) once ``superseded()`` is true, e.g. when a
+        newer value for the same bulb is already queued.
+        """
+        if self.protocol is None:
+            return CommandResult(ip, method, False, 0, "socket closed")
+        payload = {"id": self.protocol.new_id(), "method": method, "params": params}
+        future = self.protocol.expect(ip, payload)
+        attempts = 0
+        try:
+            for attempt in range(retries + 1):
+                if attempt and superseded is not None and superseded():
+                    return CommandResult(ip, method, False, attempts, "superseded")
+                attempts += 1
+                self.protocol.send(ip, self.port, payload)
+                try:
+                    reply = await asyncio.wait_for(asyncio.shield(future), timeout * (2 ** attempt))
+                except asyncio.TimeoutError:
+                    continue
+                if is_ack(reply):
+                    return CommandResult(ip, method, True, attempts)
+                # The bulb answered but refused; sending it again will not help
+                error = reply.get("error", {}) if isinstance(reply, dict) else {}
+                message = error.get("message") if isinstance(error, dict) else None
+                return CommandResult(ip, method, False, attempts, message or "rejected")
+        except OSError as e:
+            return CommandResult(ip, method, False, attempts, str(e))
+        finally:
+            self.protocol.forget(ip, payload["id"])
+            future.cancel()
+        return CommandResult(ip, method, False, attempts, "no reply")
+
+    async def async_group(self, ips: List[str], method: str, params: dict) -> List[CommandResult]:
+        """:meth:`async_command` to every bulb at once; results in ``ips`` order."""
+        return list(await asyncio.gather(*(self.async_command(ip, method, params) for ip in ips)))
+
+    async def async_scan(self, broadcast_timeout: float = 1.5) -> list[str]:
         """Broadcast for WiZ lights and return the list of IPs found."""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        sock.settimeout(broadcast_timeout)
         found: list[str] = []
+        if self.protocol is None:
+            return found
+
+        def collect(ip: str, message: dict) -> None:
+            if message.get("method") == "getPilot" and ip not in found:
+                found.append(ip)
+
+        self.protocol.listeners.append(collect)
+        try:
+            self.protocol.send(BROADCAST_ADDR, self.port, {"id": self.protocol.new_id(), "method": "getPilot", "params": {}})
+            await asyncio.sleep(broadcast_timeout)
+        except OSError as e:
+            logging.warning(f"WiZ broadcast failed: {e}")
+        finally:
+            self.protocol.listeners.remove(collect)
+        return found
+
+    async def async_probe(self, ips: List[str], timeout: float = PROBE_TIMEOUT) -> list[str]:
+        """Unicast ``getPilot`` to every IP at once; those that answer within ``timeout``.
+
+        One shared deadline, so the cost does not grow with the number of IPs.
+        """
+        if not ips or self.protocol is None:
+            return []
+        waiting: Dict[asyncio.Future, Tuple[str, int]] = {}
         try:
-            msg = json.dumps({"method": "getPilot", "params": {}}).encode()
-            sock.sendto(msg, ("255.255.255.255", self.port))
-            while True:
+            for ip in dict.fromkeys(ips):
+                payload = {"id": self.protocol.new_id(), "method": "getPilot", "params": {}}
+                waiting[self.protocol.expect(ip, payload)] = (ip, payload["id"])
                 try:
-                    data, addr = sock.recvfrom(1024)
-                    if addr[0] not in found:
-                        found.append(addr[0])
+                    self.protocol.send(ip, self.port, payload)
                 except OSError:
-                    break
+                    pass # e.g. unroutable address; it just won't answer
+            done, _ = await asyncio.wait(waiting, timeout=timeout)
+            return [waiting[f][0] for f in waiting if f in done and f.result() is not None]
         finally:
-            sock.close()
-        return found
+            for future, (ip, request_id) in waiting.items():
+                self.protocol.forget(ip, request_id)
+                future.cancel()
+
+    async def async_get_state(self, ip: str) -> dict | None:
+        return await self.async_request(ip, {"method": "getPilot", "params": {}})
+
+    async def async_set_power(self, ip: str, state: bool) -> CommandResult:
+        return await self.async_command(ip, "setState", {"state": state})
+
+    async def async_set_pilot(self, ip: str, temp: int, dimming: int) -> CommandResult:
+        return await self.async_command(ip, "setPilot", {"temp": temp, "dimming": dimming})
+
+    # ------------------------------------------------------------------ #
+    # Blocking facade (any thread except the loop's)
+    # ------------------------------------------------------------------ #
+    def send_request(self, ip: str | None, payload: dict, timeout: float = REQUEST_TIMEOUT) -> dict | None:
+        if not ip:
+            return None
+        return self._run(self.async_request(ip, payload, timeout), timeout)
+
+    def scan(self, broadcast_timeout: float = 1.5) -> list[str]:
+        return self._run(self.async_scan(broadcast_timeout), broadcast_timeout) or []
+
+    def probe(self, ips: List[str], timeout: float = PROBE_TIMEOUT) -> list[str]:
+        return self._run(self.async_probe(ips, timeout), timeout) or []
 
     def get_state(self, ip: str) -> dict | None:
-        return self.send_request(ip, {"method": "getPilot", "params": {}})
+        return self._run(self.async_get_state(ip), REQUEST_TIMEOUT)
+
+    def set_power(self, ip: str, state: bool) -> bool:
+        """Whether the bulb acknowledged the change (after retransmits)."""
+        result = self._run(self.async_set_power(ip, state), ACK_TIMEOUT * 2 ** (COMMAND_RETRIES + 1))
+        return bool(result and result.ok)
+
+    def set_pilot(self, ip: str, temp: int, dimming: int) -> bool:
+        result = self._run(self.async_set_pilot(ip, temp, dimming), ACK_TIMEOUT * 2 ** (COMMAND_RETRIES + 1))
+        return bool(result and result.ok)
 
-    def set_power(self, ip: str, state: bool) -> None:
-        self.send_request(ip, {"id": 1, "method": "setState", "params": {"state": state}})
 
-    def set_pilot(self, ip: str, temp: int, dimming: int) -> None:
-        self.send_request(
-            ip,
-            {"id": 1, "method": "setPilot", "params": {"temp": temp, "dimming": dimming}},
-        )
+def local_ip_for(ip: str) -> Optional[str]:
+    """Address of the interface that routes to ``ip`` (no packet is sent)."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.connect((ip, WIZ_PORT))
+        return sock.getsockname()[0]
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+
+class _PushProtocol(asyncio.DatagramProtocol):
+    def __init__(self, listener: "WiZPushListener") -> None:
+        self.listener = listener
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        try:
+            message = json.loads(data.decode())
+        except (UnicodeDecodeError, ValueError):
+            return
+        if isinstance(message, dict) and message.get("method") == "syncPilot":
+            # Acknowledge so the bulb does not resend, then hand the state on
+            if self.transport is not None:
+                reply = {"method": "syncPilot", "result": {"mac": self.listener.mac}}
+                self.transport.sendto(json.dumps(reply).encode(), addr)
+            self.listener._pushed(addr[0], message.get("params") or {})
+
 
+class WiZPushListener:
+    """Receives ``syncPilot`` state pushes from registered bulbs.
+
+    ``on_state(ip, params)`` is called on the client's loop with the bulb's
+    pilot (``state``, ``dimming``, ``temp`` or ``sceneId``, ...). Call
+    :meth:`set_lights` whenever the set of known bulbs changes.
+    """
+
+    def __init__(
+        self,
+        client: WiZLightClient,
+        on_state: Optional[Callable[[str, dict], None]] = None,
+        port: int = WIZ_PUSH_PORT,
+        interval: float = REGISTER_INTERVAL,
+    ) -> None:
+        self.client = client
+        self.on_state = on_state
+        self.port = port
+        self.interval = interval
+        # Identifies us to the bulbs; any stable 12-hex-digit value will do
+        self.mac = f"{uuid.getnode():012x}"
+        self.registered: Dict[str, bool] = {}
+        self._ips: List[str] = []
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def set_lights(self, ips: List[str]) -> None:
+        """Register with ``ips`` (and stop renewing any others); starts the listener."""
+        ips = list(ips)
+        self.client._ensure_loop().call_soon_threadsafe(self._set_lights, ips)
+
+    def stop(self) -> None:
+        loop = self.client.loop
+        if loop is not None and loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(self._stop(), loop).result(1.0)
+            except concurrent.futures.TimeoutError:
+                pass
+
+    # ------------------------------------------------------------------ #
+    # Event loop side
+    # ------------------------------------------------------------------ #
+    def _set_lights(self, ips: List[str]) -> None:
+        self._ips = ips
+        self.registered = {ip: self.registered.get(ip, False) for ip in ips}
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        else:
+            self._wakeup.set() # Register new bulbs now rather than at the next renewal
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _PushProtocol(self), local_addr=("0.0.0.0", self.port)
+            )
+        except OSError as e:
+            # Another WiZ app on this machine may own the port
+            logging.error(f"WiZ push listener could not bind UDP {self.port}: {e}")
+            self._task = None
+            return
+        while True:
+            await self._register_all()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _register_all(self) -> None:
+        ips = list(self._ips)
+        results = await asyncio.gather(*(self._register(ip) for ip in ips))
+        for ip, ok in zip(ips, results):
+            if ip in self.registered:
+                self.registered[ip] = ok
+
+    async def _register(self, ip: str) -> bool:
+        phone_ip = local_ip_for(ip)
+        if not phone_ip:
+            return False
+        params = {"phoneIp": phone_ip, "phoneMac": self.mac, "register": True}
+        result = await self.client.async_command(ip, "registration", params, retries=1)
+        return result.ok
+
+    def _pushed(self, ip: str, params: dict) -> None:
+        if ip not in self.registered:
+            # Not one of ours (another household's bulb or a stale registration)
+            logging.debug(f"WiZ push from unknown host {ip} ignored")
+            return
+        self.registered[ip] = True
+        if self.on_state:
+            try:
+                self.on_state(ip, params)
+            except Exception as e:
+                logging.error(f"WiZ push callback failed: {e}")
+
+    async def _stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            transport.close()
+
+
+class PilotCoalescer:
+    """Latest-wins, rate-capped ``setPilot`` queue per bulb.
+
+    :meth:`update` may be called from any thread as often as a control
+    emits values. Each bulb has at most one send in flight; an update that
+    arrives meanwhile replaces any older pending one (counted in
+    ``coalesced``) and goes out once the previous send has finished and
+    ``min_interval`` has passed. A send is retransmitted until acked unless
+    a newer update replaces it, so the last value is delivered reliably.
+    """
+
+    def __init__(
+        self,
+        client: WiZLightClient,
+        min_interval: float = PILOT_MIN_INTERVAL,
+        on_result: Optional[Callable[[CommandResult], None]] = None,
+    ) -> None:
+        self.client = client
+        self.min_interval = min_interval
+        # Called on the client's loop with each send's outcome (superseded sends excluded)
+        self.on_result = on_result
+        self.sent = 0
+        self.coalesced = 0
+        self._pending: Dict[str, dict] = {}
+        self._senders: Dict[str, asyncio.Task] = {}
+        self._last_sent: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def update(self, ip: str, params: dict) -> None:
+        """Make ``params`` the next ``setPilot`` for ``ip``, replacing any not yet sent."""
+        with self._lock:
+            if ip in self._pending:
+                self.coalesced += 1
+            self._pending[ip] = dict(params)
+        self.client._ensure_loop().call_soon_threadsafe(self._wake, ip)
+
+    def is_busy(self, ip: str) -> bool:
+        """Whether an update for ``ip`` is queued or still being delivered."""
+        with self._lock:
+            if ip in self._pending:
+                return True
+        task = self._senders.get(ip)
+        return task is not None and not task.done()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"sent": self.sent, "coalesced": self.coalesced, "pending": len(self._pending)}
+
+    def stop(self) -> None:
+        """Drop queued updates and cancel sends in flight; call before ``client.close()``."""
+        with self._lock:
+            self._pending.clear()
+        loop = self.client.loop
+        if loop is not None and loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(self._stop(), loop).result(1.0)
+            except concurrent.futures.TimeoutError:
+                pass
+
+    async def _stop(self) -> None:
+        tasks = list(self._senders.values())
+        self._senders.clear()
+        for task in tasks:
+            task.cancel()
+        # Let each send unwind (and release its pending reply) before the loop stops
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _wake(self, ip: str) -> None:
+        # On the loop: start the bulb's sender unless one is already draining its queue
+        task = self._senders.get(ip)
+        if task is None or task.done():
+            self._senders[ip] = asyncio.get_running_loop().create_task(self._drain(ip))
+
+    async def _drain(self, ip: str) -> None:
+        burst = 0
+        while True:
+            wait = self._last_sent.get(ip, 0.0) + self.min_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            with self._lock:
+                params = self._pending.pop(ip, None)
+            if params is None:
+                break
+            self._last_sent[ip] = time.monotonic()
+            burst += 1
+            # Waiting for the ack keeps a bulb's updates from overtaking each other
+            result = await self.client.async_command(ip, "setPilot", params, superseded=lambda: ip in self._pending)
+            with self._lock:
+                self.sent += 1
+            if self.on_result and result.error != "superseded":
+                try:
+                    self.on_result(result)
+                except Exception as e:
+                    logging.error(f"WiZ result callback failed: {e}")
+        self._senders.pop(ip, None)
+        if burst > 1:
+            stats = self.stats()
+            logging.info(f"WiZ {ip}: burst of {burst} setPilot sent ({stats['coalesced']} coalesced in total)")
 
-__all__ = ["WiZLightClient"]
 
+__all__ = [
+    "CommandResult",
+    "PilotCoalescer",
+    "WiZLightClient",
+    "WiZProtocol",
+    "WiZPushListener",
+    "is_ack",
+    "local_ip_for",
+    "summarize",
+]
@@ -242,12 +242,8 @@ class SmartHomeApp(QMainWindow):
                 }}
             """)
 
-            if stack_index == 3:
-                # self.cam_tab.start_stream_if_ready()
-                pass
-            else:
-                pass 
-                # self.cam_tab.stop_stream() # Keep stream running for instant switch (User Request)
+            # Keep stream running for instant switch (User Request), but only grab frames while hidden
+            self.cam_tab.set_page_visible(stack_index == 3 or self.cam_tab.is_fullscreen)
                 
         except Exception as e:
             logging.error(f"Error switching tab: {e}")
@@ -2,51 +2,143 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea, QFrame, 
     QDialog, QSplitter, QListWidget, QLineEdit, QFormLayout, QDialogButtonBox, 
-    QSizePolicy, QMessageBox, QGraphicsOpacityEffect, QComboBox, QProgressBar
+    QSizePolicy, QMessageBox, QGraphicsOpacityEffect, QComboBox, QProgressBar, QGridLayout,
+    QCheckBox, QSlider
 )
 
-from PyQt6.QtCore import Qt, pyqtSignal, QThread, pyqtSlot, QSize, QEvent, QPropertyAnimation, QEasingCurve, QTimer
-from PyQt6.QtGui import QImage, QPixmap, QKeySequence, QFont, QFontMetrics, QShortcut
-import cv2
+from PyQt6.QtCore import Qt, pyqtSignal, QThread, pyqtSlot, QSize, QRect, QRectF, QEvent, QPropertyAnimation, QEasingCurve, QTimer, QIODevice
+from PyQt6.QtGui import QImage, QPixmap, QPainter, QPen, QColor, QKeySequence, QFont, QFontMetrics, QShortcut
 import numpy as np
 import time
 import json
+import threading
 import os
 import qtawesome as qta
 import copy
+import logging
+from collections import deque
 from ..theme import THEME_DARK
 from ..widgets import DeviceCard, AnimatedButton, LoadingOverlay
-from ...core.constants import ICSEE_CONFIG
-import urllib.request
-import urllib.parse
+from ...core.constants import ICSEE_CONFIG, RECORDINGS_DIR, THUMBNAIL_DIR
+from ...services.frames import FULL_ROI
+from ...services.video import CaptureSession, DecodePool, ReconnectPolicy, reconnect_status
+from ...services.capture_process import ProcessCaptureSession
+from ...services.clips import ClipWriter, ClipBuffer, CLIPS_DIR, PRE_ROLL_SECONDS, POST_ROLL_SECONDS, MAX_BUFFER_MB
+from ...services.motion import MotionDetector, parse_roi
+from ...services.recorder import RecordingManager, RetentionPolicy, camera_dirname, BRIDGE_RTSP, SEGMENT_SECONDS
+from ...services.thumbnails import ThumbnailCache, ThumbnailRefresher, thumbnail_key, REFRESH_INTERVAL
+from ...services.profiles import MAIN, SUB, SUB_MAX_WIDTH, DEFAULT_MAIN_PATH, DEFAULT_SUB_PATH, ProfileSelector, bridge_streams, camera_url, has_substream, stream_name
+from ...services.bridge import BridgeClient, ensure_camera_ids, new_camera_id
+from ...services.motion_watch import MotionWatch
+from ...services.standby import StandbyCache, DEFAULT_MAX_STREAMS, DEFAULT_MAX_MEMORY_MB, DEFAULT_MAX_CPU_PERCENT
+from ...services.audio import AudioStream, SAMPLE_RATE, CHANNELS
+
+try:
+    from PyQt6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices
+except ImportError:  # pragma: no cover - QtMultimedia is optional; cameras stay silent
+    QAudioFormat = QAudioSink = QMediaDevices = None
+
+# Grid view: frame budget per tile and size of the shared decode pool
+GRID_MAX_FPS = 30.0
+GRID_MIN_FPS = 5.0
+GRID_MAX_TILES = 9
+GRID_DECODE_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+
+# Capture modes (config key "camera_decode_mode")
+DECODE_MODE_DISPLAY = "display"
+DECODE_MODE_FULL = "full"
+
+class VideoSurface(QWidget):
+    """Video display with Zoom/Pan support.
+
+    Paints the current frame straight from its ring buffer with
+    QPainter.drawImage into a cached target rect: no QPixmap conversion and
+    no relayout per frame, and only the video rect is repainted.
+    """
+    # Pixel size the decoder should deliver: widget size scaled by the zoom
+    # factor, so the zoomed crop still lands at roughly 1:1 on screen
+    viewport_changed = pyqtSignal(int, int)
+    # Visible part of the source as normalised (x, y, w, h), None when not
+    # zoomed; the capture side only converts that region
+    roi_changed = pyqtSignal(object)
 
-class VideoLabel(QLabel):
-    """Custom Label for Video Display with Zoom/Pan support"""
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.setStyleSheet("background-color: black;")
+        # We fill every pixel ourselves; skip Qt's background erase
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, True)
         
         self.zoom_level = 1.0
-        self.pan_x = 0
-        self.pan_y = 0
+        # View centre offset from the frame centre, as a fraction of the frame
+        self.pan_x = 0.0
+        self.pan_y = 0.0
         self.last_frame = None
+        self.last_roi = FULL_ROI # Part of the source that last_frame covers
         self.last_mouse_pos = None
-        
-    def reset_zoom(self):
-        self.zoom_level = 1.0
-        self.pan_x = 0
-        self.pan_y = 0
+        self._frame = None # Leased ring buffer backing last_frame
+        self._source = QRect() # Part of last_frame on screen
+        self._target = QRect() # Where it is drawn; only recomputed when geometry changes
+        self._geometry_key = None
+        self._message = ""
+        self._message_size = 16
+        self._overlay_box = None # Motion bounding box, normalised to the source frame
+        # Stage timings for pipeline stats: frame prep in update_image(), and
+        # the most recent paintEvent
+        self.last_scale_ms = 0.0
+        self.last_paint_ms = 0.0
+        
+    def decode_size(self):
+        return int(self.width() * self.zoom_level), int(self.height() * self.zoom_level)
+
+    def view_rect(self):
+        """Normalised (x, y, w, h) of the source currently on screen"""
+        size = 1.0 / self.zoom_level
+        return (0.5 + self.pan_x - size / 2, 0.5 + self.pan_y - size / 2, size, size)
+
+    def _emit_viewport(self):
+        self.viewport_changed.emit(*self.decode_size())
+        self._emit_roi()
+
+    def _emit_roi(self):
+        self.roi_changed.emit(self.view_rect() if self.zoom_level > 1.0 else None)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._emit_viewport()
+        self._redraw()
+
+    def _redraw(self):
         if self.last_frame:
             self.update_image(self.last_frame)
 
+    def _clamp_pan(self):
+        limit = 0.5 - 0.5 / self.zoom_level
+        self.pan_x = max(-limit, min(limit, self.pan_x))
+        self.pan_y = max(-limit, min(limit, self.pan_y))
+
+    def _pan_by(self, dx, dy):
+        # dx/dy in widget pixels; one widget width spans 1/zoom of the frame
+        if self.width() <= 0 or self.height() <= 0:
+            return
+        self.pan_x += dx / (self.width() * self.zoom_level)
+        self.pan_y += dy / (self.height() * self.zoom_level)
+        self._clamp_pan()
+        self._emit_roi()
+        self._redraw()
+
+    def reset_zoom(self):
+        self.zoom_level = 1.0
+        self.pan_x = 0.0
+        self.pan_y = 0.0
+        self._emit_viewport()
+        self._redraw()
+
     def zoom_in(self, focus_point=None):
         old_zoom = self.zoom_level
         self.zoom_level = min(5.0, self.zoom_level + 0.5)
         self._adjust_pan_for_zoom(old_zoom, self.zoom_level, focus_point)
-        if self.last_frame:
-            self.update_image(self.last_frame)
+        self._emit_viewport()
+        self._redraw()
 
     def zoom_out(self, focus_point=None):
         old_zoom = self.zoom_level
@@ -54,70 +146,132 @@ class VideoLabel(QLabel):
         self._adjust_pan_for_zoom(old_zoom, self.zoom_level, focus_point)
         
         if self.zoom_level == 1.0:
-            self.pan_x = 0
-            self.pan_y = 0
-            
-        if self.last_frame:
-            self.update_image(self.last_frame)
+            self.pan_x = 0.0
+            self.pan_y = 0.0
+        self._emit_viewport()
+        self._redraw()
 
     def _adjust_pan_for_zoom(self, old_zoom, new_zoom, focus_point):
-        if not focus_point or not self.last_frame:
+        if focus_point and self.last_frame and self.width() > 0 and self.height() > 0:
+            # Keep the source point under the cursor where it is
+            rel_x = (focus_point.x() - self.width() / 2) / self.width()
+            rel_y = (focus_point.y() - self.height() / 2) / self.height()
+            self.pan_x += rel_x * (1.0 / old_zoom - 1.0 / new_zoom)
+            self.pan_y += rel_y * (1.0 / old_zoom - 1.0 / new_zoom)
+        self._clamp_pan()
+
+    def show_frame(self, frame):
+        # Wrap the ring buffer without copying; we keep the lease until the
+        # next frame replaces it so the capture thread never overwrites it.
+        h, w = frame.height, frame.width
+        qt_img = QImage(frame.array.data, w, h, 3 * w, QImage.Format.Format_RGB888)
+        previous = self._frame
+        self._frame = frame
+        self.last_roi = frame.roi
+        self.update_image(qt_img)
+        if previous is not None:
+            previous.release()
+
+    def release_frame(self):
+        if self._frame is not None:
+            self._frame.release()
+            self._frame = None
+        self.last_frame = None
+        self.last_roi = FULL_ROI
+        self._geometry_key = None
+        self._overlay_box = None
+        self.update()
+
+    def set_overlay_box(self, box):
+        """Outline a normalised (x, y, w, h) region of the source, e.g. motion; None clears"""
+        if box == self._overlay_box:
             return
-
-        lbl_w = self.width()
-        lbl_h = self.height()
-        
-        rel_x = focus_point.x() - lbl_w / 2
-        rel_y = focus_point.y() - lbl_h / 2
-        
-        zoom_factor = new_zoom / old_zoom
-        
-        if zoom_factor > 1:
-            self.pan_x += int(rel_x * (zoom_factor - 1) / new_zoom)
-            self.pan_y += int(rel_y * (zoom_factor - 1) / new_zoom)
+        self._overlay_box = box
+        self.update()
+
+    def _overlay_rect(self):
+        # Source-normalised box -> widget pixels, through the ROI and zoom crop
+        w, h = self.last_frame.width(), self.last_frame.height()
+        rx, ry, rw, rh = self.last_roi
+        sx = rx + self._source.x() / w * rw
+        sy = ry + self._source.y() / h * rh
+        sw = self._source.width() / w * rw
+        sh = self._source.height() / h * rh
+        bx, by, bw, bh = self._overlay_box
+        t = self._target
+        return QRectF(t.x() + (bx - sx) / sw * t.width(), t.y() + (by - sy) / sh * t.height(),
+                      bw / sw * t.width(), bh / sh * t.height()).intersected(QRectF(t))
+
+    def set_message(self, text, font_size=16):
+        """Drop the current frame and show centred grey text instead"""
+        self.release_frame()
+        self._message = text
+        self._message_size = font_size
+        self.update()
 
     @pyqtSlot(QImage)
     def update_image(self, qt_img):
         if qt_img.isNull():
             return
+        t0 = time.perf_counter()
         self.last_frame = qt_img
-        
-        if self.zoom_level > 1.0:
-            w = qt_img.width()
-            h = qt_img.height()
-            
-            view_w = int(w / self.zoom_level)
-            view_h = int(h / self.zoom_level)
-            
-            max_pan_x = (w - view_w) // 2
-            max_pan_y = (h - view_h) // 2
-            self.pan_x = max(-max_pan_x, min(max_pan_x, self.pan_x))
-            self.pan_y = max(-max_pan_y, min(max_pan_y, self.pan_y))
-            
-            center_x = w // 2 + self.pan_x
-            center_y = h // 2 + self.pan_y
-            
-            x = center_x - (view_w // 2)
-            y = center_y - (view_h // 2)
-            
-            x = max(0, min(w - view_w, x))
-            y = max(0, min(h - view_h, y))
-            
-            qt_img = qt_img.copy(x, y, view_w, view_h)
-
-        scaled_img = qt_img.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        self.setPixmap(QPixmap.fromImage(scaled_img))
+        self._message = ""
+        
+        w = qt_img.width()
+        h = qt_img.height()
+        key = (w, h, self.width(), self.height(), self.zoom_level, self.pan_x, self.pan_y, self.last_roi)
+        if key != self._geometry_key:
+            self._geometry_key = key
+            old_target = self._target
+            x, y, view_w, view_h = 0, 0, w, h
+            if self.zoom_level > 1.0:
+                # The frame may already be cropped to the viewport plus a
+                # margin; map the view into its pixels and draw only that
+                rx, ry, rw, rh = self.last_roi
+                vx, vy, vw, vh = self.view_rect()
+                view_w = max(1, min(w, int(vw / rw * w)))
+                view_h = max(1, min(h, int(vh / rh * h)))
+                x = max(0, min(w - view_w, int((vx - rx) / rw * w)))
+                y = max(0, min(h - view_h, int((vy - ry) / rh * h)))
+            self._source = QRect(x, y, view_w, view_h)
+            fitted = QSize(view_w, view_h).scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatio)
+            self._target = QRect(0, 0, fitted.width(), fitted.height())
+            self._target.moveCenter(self.rect().center())
+            if self._target != old_target:
+                # Letterbox bars moved; repaint everything once
+                self.update()
+        self.update(self._target)
+        self.last_scale_ms = (time.perf_counter() - t0) * 1000.0
+
+    def paintEvent(self, event):
+        t0 = time.perf_counter()
+        painter = QPainter(self)
+        if self.last_frame is not None and not self._target.isEmpty():
+            if not self._target.contains(event.rect()):
+                painter.fillRect(event.rect(), Qt.GlobalColor.black)
+            if self._target.size() != self._source.size():
+                painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+            painter.drawImage(self._target, self.last_frame, self._source)
+            if self._overlay_box:
+                painter.setPen(QPen(QColor(255, 69, 58), 2))
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+                painter.drawRect(self._overlay_rect())
+        else:
+            painter.fillRect(event.rect(), Qt.GlobalColor.black)
+            if self._message:
+                font = painter.font()
+                font.setPixelSize(self._message_size)
+                painter.setFont(font)
+                painter.setPen(QColor("gray"))
+                painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self._message)
+        painter.end()
+        self.last_paint_ms = (time.perf_counter() - t0) * 1000.0
 
     def wheelEvent(self, event):
         if self.zoom_level > 1.0:
             delta = event.angleDelta()
-            speed = 1.0 / self.zoom_level
             # Inverted pan
-            self.pan_x -= int(delta.x() * speed)
-            self.pan_y -= int(delta.y() * speed)
-            
-            if self.last_frame:
-                self.update_image(self.last_frame)
+            self._pan_by(-delta.x(), -delta.y())
         
     def event(self, event):
         if event.type() == QEvent.Type.NativeGesture:
@@ -131,10 +285,10 @@ class VideoLabel(QLabel):
                 self._adjust_pan_for_zoom(old_zoom, self.zoom_level, cursor_pos)
 
                 if self.zoom_level == 1.0:
-                    self.pan_x = 0
-                    self.pan_y = 0
-                if self.last_frame:
-                    self.update_image(self.last_frame)
+                    self.pan_x = 0.0
+                    self.pan_y = 0.0
+                self._emit_viewport()
+                self._redraw()
                 return True
         return super().event(event)
         
@@ -147,13 +301,8 @@ class VideoLabel(QLabel):
         if self.last_mouse_pos and self.zoom_level > 1.0:
             delta = event.pos() - self.last_mouse_pos
             self.last_mouse_pos = event.pos()
-            
-            speed = 1.0 / self.zoom_level
-            self.pan_x -= int(delta.x() * speed * 2)
-            self.pan_y -= int(delta.y() * speed * 2)
-            
-            if self.last_frame:
-                self.update_image(self.last_frame)
+            # Drag the image with the cursor
+            self._pan_by(-delta.x(), -delta.y())
         super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event):
@@ -208,67 +357,253 @@ class VideoFullScreenWindow(QWidget):
             self.request_exit.emit()
 
 
-# Set RTSP transport and timeout GLOBALLY for the process
-# Increased to 15s to handle slow initial handshake/flaky network
-os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = "rtsp_transport;tcp|stimeout;15000000|timeout;15000000"
-
 class VideoThread(QThread):
-    change_pixmap_signal = pyqtSignal(QImage)
+    frame_ready = pyqtSignal() # Newest frame is waiting in self.mailbox
     status_signal = pyqtSignal(str)
     
-    def __init__(self, url):
+    def __init__(self, url, ring_slots=3, name=None, session=None, camera_id=None):
         super().__init__()
         self.url = url
         self._run_flag = True
+        self._keep_open = False # Set by detach(): leave the capture open for standby
+        # One slot on screen, one waiting in the mailbox, one being decoded into
+        if session is None:
+            session = CaptureSession(url, ring_slots=ring_slots, name=name, stats_key=camera_id)
+        # A session resumed from standby is already connected
+        session.on_frame = self.frame_ready.emit
+        session.on_status = None
+        self.session = session
+        # Latest-frame-wins hand-off: the UI pulls when it gets to it
+        self.mailbox = self.session.mailbox
+        self.policy = ReconnectPolicy()
+        self._cancel = threading.Event()
 
     def run(self):
-        cap = cv2.VideoCapture(self.url)
-        # Attempt to set property if supported (OpenCV 4.x+)
-        try:
-            cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 15000)
-        except: pass
-        
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        session = self.session
+        attempt = 0
+        while self._run_flag:
+            # Cancellable: stop() abandons a hung open instead of waiting it out
+            resumed = session.is_open
+            if resumed or session.open(cancel=self._cancel):
+                attempt = 0
+                self.status_signal.emit("Live")
+                if resumed:
+                    session.publish_latest() # Show the last grabbed frame without waiting for the next
+                while self._run_flag and session.read():
+                    pass
+                if not self._run_flag:
+                    break
+                session.close() # CRITICAL: Release broken capture before recreating
+            if not self._run_flag:
+                break
+
+            attempt += 1
+            if self.policy.exhausted(attempt):
+                self.status_signal.emit("Connection Failed")
+                break
+            # Count down in whole seconds so the status shows time to next try
+            remaining = self.policy.delay(attempt)
+            while remaining > 0 and self._run_flag:
+                self.status_signal.emit(reconnect_status(attempt, remaining))
+                step = min(1.0, remaining)
+                if self._cancel.wait(step):
+                    break
+                remaining -= step
+
+        if not self._keep_open:
+            session.close()
+        self.mailbox.clear()
+
+    def detach(self):
+        """Keep the session open when the thread stops; returns it (None if not connected)"""
+        self._keep_open = True
+        return self.session if self.session.is_open else None
 
-        if not cap.isOpened():
-            self.status_signal.emit("Connection Failed")
-            return
+    def stop(self):
+        self._run_flag = False
+        self._cancel.set()
+        self.quit()
+        # A read can still be blocked on the socket; callers park the thread instead of waiting
+        self.wait(200)
 
-        self.status_signal.emit("Live")
-        
+
+def record_display(stats, video, frame):
+    """Show a frame on a VideoSurface and record its GUI-side stage timings."""
+    t_read = frame.t_read
+    handoff_ms = (time.monotonic() - frame.t_published) * 1000.0
+    video.show_frame(frame)
+    stats.note_displayed(t_read, handoff_ms, video.last_scale_ms, video.last_paint_ms)
+
+
+class ProcessVideoThread(QThread):
+    """VideoThread variant that decodes in a child process.
+
+    This thread only relays frames out of shared memory, so stop() never
+    blocks on OpenCV: a wedged child is killed instead of waited on.
+    """
+    frame_ready = pyqtSignal()
+    status_signal = pyqtSignal(str)
+
+    def __init__(self, url, ring_slots=3, name=None, camera_id=None):
+        super().__init__()
+        self.url = url
+        self._run_flag = True
+        self.session = ProcessCaptureSession(url, ring_slots=ring_slots,
+                                             on_frame=self.frame_ready.emit,
+                                             on_status=self.status_signal.emit,
+                                             name=name, stats_key=camera_id)
+        self.mailbox = self.session.mailbox
+
+    def run(self):
+        self.session.start()
         while self._run_flag:
-            ret, frame = cap.read()
-            if ret:
-                rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                h, w, ch = rgb_image.shape
-                bytes_per_line = ch * w
-                convert_to_Qt_format = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888).copy() # CRITICAL: Copy data to prevent Segfault
-                self.change_pixmap_signal.emit(convert_to_Qt_format)
-            else:
-                self.status_signal.emit("Reconnecting...")
-                # Reduce CPU spin and allow backend to reset
-                time.sleep(2)
-                
-                # Active Reconnect Logic
+            if not self.session.poll(0.1):
                 if self._run_flag:
-                    cap.release() # CRITICAL: Release broken capture before recreating
-                    cap = cv2.VideoCapture(self.url)
-                    try:
-                        cap.set(cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, 15000)
-                    except: pass
-                    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-                    
-                    if cap.isOpened():
-                        self.status_signal.emit("Live")
-                    else:
-                        self.status_signal.emit("Connection Failed")
-        
-        cap.release()
+                    self.status_signal.emit("Connection Failed")
+                break
+        self.session.stop()
 
     def stop(self):
         self._run_flag = False
-        self.quit()
-        self.wait(5000) # Wait up to 5s for thread to finish (matches stimeout)
+        self.wait(200) # poll() returns within 100ms; callers park the thread if it is still killing the child
+
+
+class JitterBufferDevice(QIODevice):
+    """Read-only QIODevice the audio sink pulls PCM from (see services.audio.JitterBuffer)"""
+    def __init__(self, buffer, parent=None):
+        super().__init__(parent)
+        self.buffer = buffer
+        self.open(QIODevice.OpenModeFlag.ReadOnly)
+
+    def readData(self, maxlen):
+        return self.buffer.pull(maxlen)
+
+    def writeData(self, data):
+        return 0
+
+    def bytesAvailable(self):
+        # Always readable: the buffer pads with silence while it refills
+        return self.buffer.frame_bytes * 1024 + super().bytesAvailable()
+
+    def isSequential(self):
+        return True
+
+
+class CameraAudio:
+    """One camera's audio: ffmpeg decode from the bridge into a sink on the default output"""
+    DEVICE_BUFFER_MS = 40 # Kept small; the jitter buffer holds the real cushion
+
+    def __init__(self, url, on_status=None, parent=None):
+        self.url = url
+        self.stream = AudioStream(url, on_status=on_status)
+        fmt = QAudioFormat()
+        fmt.setSampleRate(SAMPLE_RATE)
+        fmt.setChannelCount(CHANNELS)
+        fmt.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+        self.sink = QAudioSink(QMediaDevices.defaultAudioOutput(), fmt, parent)
+        self.sink.setBufferSize(SAMPLE_RATE * CHANNELS * 2 * self.DEVICE_BUFFER_MS // 1000)
+        self.device = JitterBufferDevice(self.stream.buffer, parent)
+
+    def start(self):
+        self.stream.start()
+        self.sink.start(self.device)
+
+    def set_video_delay(self, ms):
+        # Audio waits as long as a frame takes to reach the screen; the device buffer counts too
+        self.stream.buffer.set_video_delay(ms - self.DEVICE_BUFFER_MS)
+
+    def stop(self):
+        self.sink.stop()
+        self.stream.stop()
+        self.device.close()
+
+
+class CameraTile(QWidget):
+    """Grid cell for one camera, decoded by the shared DecodePool"""
+    frame_ready = pyqtSignal()
+    status_changed = pyqtSignal(str)
+    activated = pyqtSignal(int)
+
+    def __init__(self, index, name, url, parent=None, decode_at_display=True, camera_id=None):
+        super().__init__(parent)
+        self.index = index
+        self.name = name
+        self.status = "Connecting..."
+        self.cpu_percent = None
+        self.motion = False
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.video = VideoSurface()
+        layout.addWidget(self.video)
+
+        # Name / status / CPU badge floating over the video
+        self.lbl_info = QLabel(self)
+        self.lbl_info.setStyleSheet("background-color: rgba(0, 0, 0, 0.55); color: white; font-size: 11px; padding: 3px 6px; border-radius: 4px;")
+        self.lbl_info.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+
+        # Callbacks fire on a pool worker thread; the signals hop to the GUI thread
+        self.session = CaptureSession(url, key=index, on_frame=self.frame_ready.emit, on_status=self.status_changed.emit,
+                                      name=name, stats_key=camera_id)
+        self.frame_ready.connect(self.on_frame_ready)
+        self.status_changed.connect(self.on_status)
+        if decode_at_display:
+            self.video.viewport_changed.connect(self.session.set_output_size)
+        self.video.roi_changed.connect(self.session.set_roi)
+        self._update_info()
+
+    def on_frame_ready(self):
+        frame = self.session.mailbox.take()
+        if frame is not None:
+            record_display(self.session.stats, self.video, frame)
+
+    def on_status(self, status):
+        self.status = status
+        if "Failed" in status:
+            self.video.set_message("Connection Failed", 12)
+        self._update_info()
+
+    def set_cpu(self, percent):
+        self.cpu_percent = percent
+        self._update_info()
+
+    def set_motion(self, box):
+        self.motion = box is not None
+        self.video.set_overlay_box(box)
+        self._update_info()
+
+    def _update_info(self):
+        text = self.name
+        if self.status != "Live":
+            text += f"  ·  {self.status}"
+        elif self.cpu_percent is not None:
+            text += f"  ·  {self.cpu_percent:.0f}% CPU"
+        if self.motion:
+            text += "  ·  Motion"
+        self.lbl_info.setText(text)
+        self.lbl_info.adjustSize()
+
+    def update_frame_budget(self):
+        # Small tiles get fewer frames; scaled by linear size relative to the grid
+        grid = self.parentWidget()
+        if not grid or grid.width() <= 0 or grid.height() <= 0:
+            return
+        ratio = (self.width() * self.height()) / (grid.width() * grid.height())
+        fps = GRID_MAX_FPS * (max(ratio, 0.0) ** 0.5)
+        self.session.max_fps = max(GRID_MIN_FPS, min(GRID_MAX_FPS, fps))
+
+    def resizeEvent(self, event):
+        self.lbl_info.move(8, 8)
+        self.lbl_info.raise_()
+        self.update_frame_budget()
+        super().resizeEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        self.activated.emit(self.index)
+        super().mouseDoubleClickEvent(event)
+
+    def release(self):
+        self.video.release_frame()
 
 
 class SettingsDialog(QDialog):
@@ -323,15 +658,36 @@ class SettingsDialog(QDialog):
         self.pass_input = QLineEdit()
         self.pass_input.setEchoMode(QLineEdit.EchoMode.Password)
         
-        for w in [self.name_input, self.ip_input, self.port_input, self.user_input, self.pass_input]:
+        # Stream paths (RTSP only); leave Sub empty if the camera has no substream
+        self.main_path_input = QLineEdit()
+        self.main_path_input.setPlaceholderText(DEFAULT_MAIN_PATH)
+        self.sub_path_input = QLineEdit()
+        self.sub_path_input.setPlaceholderText("None")
+        
+        for w in [self.name_input, self.ip_input, self.port_input, self.user_input, self.pass_input, self.main_path_input, self.sub_path_input]:
             w.textChanged.connect(self.save_current_edit)
 
+        # Motion detection (ROI rectangles are set as "motion_roi" in the config file)
+        self.motion_input = QCheckBox("Detect motion")
+        self.motion_input.toggled.connect(self.save_current_edit)
+        self.sensitivity_input = QSlider(Qt.Orientation.Horizontal)
+        self.sensitivity_input.setRange(0, 100)
+        self.sensitivity_input.valueChanged.connect(self.save_current_edit)
+        # Event clips: keep a pre-roll in memory (always on with motion detection)
+        self.clips_input = QCheckBox("Save clips")
+        self.clips_input.toggled.connect(self.save_current_edit)
+
         self.form_layout.addRow("Name:", self.name_input)
         self.form_layout.addRow("Protocol:", self.protocol_input)
         self.form_layout.addRow("IP Address:", self.ip_input)
         self.form_layout.addRow("Port (RTSP):", self.port_input)
         self.form_layout.addRow("Username:", self.user_input)
         self.form_layout.addRow("Password:", self.pass_input)
+        self.form_layout.addRow("Main Stream:", self.main_path_input)
+        self.form_layout.addRow("Sub Stream:", self.sub_path_input)
+        self.form_layout.addRow("Motion:", self.motion_input)
+        self.form_layout.addRow("Sensitivity:", self.sensitivity_input)
+        self.form_layout.addRow("Clips:", self.clips_input)
         
         right_layout.addLayout(self.form_layout)
         right_layout.addStretch()
@@ -380,14 +736,26 @@ class SettingsDialog(QDialog):
             
         self.current_index = index
         cam = self.cameras[index]
+        # Read first: each setText below saves the form back into cam
+        motion = bool(cam.get("motion", False))
+        sensitivity = int(float(cam.get("motion_sensitivity", 0.5)) * 100)
+        clips = bool(cam.get("clips", False))
+        proto = cam.get("protocol", "rtsp")
+        main_path = cam.get("main_path", "")
+        sub_path = cam.get("sub_path", "")
         
         self.name_input.setText(cam.get("name", ""))
         self.ip_input.setText(cam.get("ip", ""))
         self.port_input.setText(cam.get("port", "554"))
         self.user_input.setText(cam.get("user", ""))
         self.pass_input.setText(cam.get("pass", ""))
+        self.main_path_input.setText(main_path)
+        self.sub_path_input.setText(sub_path)
+        
+        self.motion_input.setChecked(motion)
+        self.sensitivity_input.setValue(sensitivity)
+        self.clips_input.setChecked(clips)
         
-        proto = cam.get("protocol", "rtsp")
         self.protocol_input.setCurrentIndex(1 if proto == "xmeye" else 0)
         self.update_form_visibility()
 
@@ -398,30 +766,37 @@ class SettingsDialog(QDialog):
     def update_form_visibility(self):
         is_xmeye = self.protocol_input.currentIndex() == 1
         
-        # Hide Port for XMeye
-        self.port_input.setVisible(not is_xmeye)
-        lbl_port = self.form_layout.labelForField(self.port_input)
-        if lbl_port: lbl_port.setVisible(not is_xmeye)
+        # Hide Port and stream paths for XMeye (dvrip has fixed main/sub channels)
+        for w in [self.port_input, self.main_path_input, self.sub_path_input]:
+            w.setVisible(not is_xmeye)
+            lbl = self.form_layout.labelForField(w)
+            if lbl: lbl.setVisible(not is_xmeye)
 
     def save_current_edit(self):
         if self.current_index < 0 or self.current_index >= len(self.cameras):
             return
             
-        self.cameras[self.current_index] = {
+        # Update in place so settings not shown here (recording, motion ROI) survive
+        self.cameras[self.current_index].update({
             "name": self.name_input.text(),
             "ip": self.ip_input.text(),
             "port": self.port_input.text(),
             "protocol": "xmeye" if self.protocol_input.currentIndex() == 1 else "rtsp",
             "user": self.user_input.text(),
-            "pass": self.pass_input.text()
-        }
+            "pass": self.pass_input.text(),
+            "main_path": self.main_path_input.text().strip(),
+            "sub_path": self.sub_path_input.text().strip(),
+            "motion": self.motion_input.isChecked(),
+            "motion_sensitivity": self.sensitivity_input.value() / 100.0,
+            "clips": self.clips_input.isChecked(),
+        })
         
         item = self.list_cams.item(self.current_index)
         if item:
             item.setText(self.name_input.text() or "Unnamed Camera")
 
     def add_camera(self):
-        new_cam = {"name": "New Camera", "ip": "", "port": "554", "protocol": "rtsp", "user": "admin", "pass": ""}
+        new_cam = {"id": new_camera_id(), "name": "New Camera", "ip": "", "port": "554", "protocol": "rtsp", "user": "admin", "pass": "", "main_path": DEFAULT_MAIN_PATH, "sub_path": DEFAULT_SUB_PATH}
         self.cameras.append(new_cam)
         self.current_index = len(self.cameras) - 1
         self.refresh_list()
@@ -441,19 +816,105 @@ class SettingsDialog(QDialog):
 
 class CameraPage(QWidget):
     loading_signal = pyqtSignal(int)
+    recording_status = pyqtSignal(str, str) # (recording key, status) from the recorder thread
+    motion_event = pyqtSignal(object) # MotionEvent from a decode thread
+    motion_watch_failed = pyqtSignal(object, str) # (camera ID, url) from a motion watch thread
+    clip_saved = pyqtSignal(object, str) # (camera ID, path) from the clip writer thread
+    thumbnail_ready = pyqtSignal(str, bytes) # (thumbnail key, JPEG) from the thumbnail thread
+    audio_status = pyqtSignal(str) # From the audio decoder thread
     
     def __init__(self):
         super().__init__()
         self.theme = THEME_DARK # CRITICAL: Initialize theme first
         self.video_thread = None # Renamed from self.thread to avoid QObject conflict
+        self._retired_threads = [] # Stopped threads still unwinding a blocking read/open
         self.is_fullscreen = False
         self.cameras = []
         self.current_cam_index = 0
         self.is_paused = True # Default to paused (No Autoplay)
         self.device_cards = {} # ip -> card
+        self._card_widgets = {} # index -> ((id, name, ip), card, container), reused across refreshes
+        self._add_container = None
+        self._thumbnail_pixmaps = {} # thumbnail key -> QPixmap
+        self.is_grid = False
+        self.page_visible = True # False while another tab is shown: streams only grab
+        self._resume_on_show = False # Bridged single view was closed while hidden
+        self.decode_pool = None # Shared by all grid tiles, created on first use
+        self.grid_tiles = []
         
         self.load_settings()
         
+        # Recently viewed cameras stay connected (grab-only) for instant switching
+        self.standby = StandbyCache(self.standby_max_streams, self.standby_max_memory_mb, self.standby_max_cpu)
+        self._standby_timer = QTimer(self)
+        self._standby_timer.timeout.connect(self.standby.enforce)
+        self._standby_timer.start(5000)
+        
+        # Main or sub stream by view size; a switch plays the old stream until the new one has a frame
+        self.profile_selector = ProfileSelector(self.substream_max_width)
+        self.stream_profile = None # Profile of self.video_thread
+        self._pending_thread = None # Replacement stream still connecting
+        self._pending_profile = None
+        self._failed_urls = set() # Profiles that would not connect; not retried this session
+        self._profile_timer = QTimer(self)
+        self._profile_timer.setSingleShot(True)
+        self._profile_timer.setInterval(500) # Let resizes and zoom steps settle first
+        self._profile_timer.timeout.connect(self._update_profile)
+        
+        # Passthrough recorders run in ffmpeg children, independent of what is on screen
+        self.recorder = RecordingManager(
+            self.recording_dir,
+            segment_seconds=self.recording_segment_seconds,
+            container=self.recording_container,
+            retention=RetentionPolicy(self.recording_retention_days, int(self.recording_max_gb * 1024 ** 3)),
+            on_status=self.recording_status.emit,
+        )
+        self._recording_specs = {} # key -> (name, url) currently requested
+        
+        # Motion detectors per camera ID, sampled by whichever session decodes that camera
+        self.motion_detectors = {}
+        self.motion_log = deque(maxlen=100)
+        self.motion_event.connect(self.on_motion_event)
+        # Cameras with motion enabled that nothing on screen decodes are watched on their substream
+        self.motion_watch = MotionWatch(on_failed=self.motion_watch_failed.emit)
+        self.motion_watch_failed.connect(self.on_motion_watch_failed)
+        self._motion_watch_timer = QTimer(self)
+        self._motion_watch_timer.setSingleShot(True) # Coalesces stop_stream() + start_stream()
+        self._motion_watch_timer.setInterval(0)
+        self._motion_watch_timer.timeout.connect(self.sync_motion_watch)
+        
+        # Pre/post-roll clips (JPEG ring per camera, written by one background thread)
+        self.clip_writer = ClipWriter(
+            on_saved=self.clip_saved.emit,
+            root=os.path.join(self.recording_dir, CLIPS_DIR),
+            retention=RetentionPolicy(self.clip_retention_days, int(self.clip_max_gb * 1024 ** 3)),
+        )
+        self.clip_buffers = {} # Camera ID -> ClipBuffer
+        self.clip_saved.connect(self.on_clip_saved)
+        # Saves clips whose camera stopped being decoded before the post-roll ended
+        self._clip_timer = QTimer(self)
+        self._clip_timer.timeout.connect(self.flush_overdue_clips)
+        self._clip_timer.start(1000)
+        
+        # go2rtc stream config, diffed against the running bridge off the GUI thread
+        self.bridge = BridgeClient()
+        self.update_bridge_config()
+        self._bridge_bootstrap = None # Set by attach_bridge(); go2rtc may still be starting
+        self._bridge_wait_timer = QTimer(self)
+        self._bridge_wait_timer.setSingleShot(True)
+        self._bridge_wait_timer.setInterval(200)
+        self._bridge_wait_timer.timeout.connect(self.start_stream)
+        
+        # Camera list thumbnails: cached on disk, refreshed slowly from go2rtc snapshots
+        self.thumbnails = ThumbnailRefresher(ThumbnailCache(THUMBNAIL_DIR), on_thumbnail=self.thumbnail_ready.emit, interval=self.thumbnail_refresh_seconds)
+        self.thumbnail_ready.connect(self.on_thumbnail_ready)
+        
+        # Camera audio (single view only): decoded beside the video, held back to match its latency
+        self.audio = None
+        self.audio_status.connect(self.on_audio_status)
+        self._audio_sync_timer = QTimer(self)
+        self._audio_sync_timer.timeout.connect(self._sync_audio_delay)
+        
         # Main Layout (Single View)
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
@@ -465,10 +926,34 @@ class CameraPage(QWidget):
         self.video_layout.setContentsMargins(0, 0, 0, 0)
         self.video_layout.setSpacing(0)
         
-        # Video Label
-        self.lbl_video = VideoLabel()
+        # Video Surface
+        self.lbl_video = VideoSurface()
+        self.lbl_video.viewport_changed.connect(lambda *_: self._profile_timer.start())
         self.video_layout.addWidget(self.lbl_video, 1)
         
+        # Grid View (multi-camera, hidden until toggled)
+        self.grid_view = QWidget()
+        self.grid_view.setStyleSheet("background-color: black;")
+        self.grid_layout = QGridLayout(self.grid_view)
+        self.grid_layout.setContentsMargins(0, 0, 0, 0)
+        self.grid_layout.setSpacing(2)
+        self.grid_view.hide()
+        self.video_layout.addWidget(self.grid_view, 1)
+        
+        self._grid_cpu_timer = QTimer(self)
+        self._grid_cpu_timer.timeout.connect(self._refresh_grid_cpu)
+        
+        # Pipeline debug overlay (Ctrl+Shift+D)
+        self.lbl_debug = QLabel(self.lbl_video)
+        self.lbl_debug.setStyleSheet("background-color: rgba(0, 0, 0, 0.6); color: #30D158; font-family: 'Menlo', 'Consolas', monospace; font-size: 11px; padding: 6px; border-radius: 6px;")
+        self.lbl_debug.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self.lbl_debug.move(10, 10)
+        self.lbl_debug.hide()
+        self._debug_timer = QTimer(self)
+        self._debug_timer.timeout.connect(self._refresh_debug_overlay)
+        self.shortcut_debug = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.shortcut_debug.activated.connect(self.toggle_debug_overlay)
+        
         # Loading Overlay (on top of video)
         self.loading_overlay = LoadingOverlay(self.video_container)
         
@@ -480,6 +965,8 @@ class CameraPage(QWidget):
         self.anim_video = QPropertyAnimation(self.video_opacity, b"opacity")
         self.anim_video.setDuration(1000)
         self.anim_video.setEasingCurve(QEasingCurve.Type.OutCubic)
+        # The effect renders the surface offscreen on every paint; only keep it on while fading
+        self.anim_video.finished.connect(lambda: self.video_opacity.setEnabled(False))
         
         self.layout.addWidget(self.video_container, 1) # Expand
 
@@ -562,6 +1049,34 @@ class CameraPage(QWidget):
         scroll.setWidget(self.cam_list_container)
         controls_layout.addWidget(scroll, 1) # Expand
         
+        # Record Toggle (current camera)
+        self.btn_record = AnimatedButton(icon_name="fa5s.circle", size=(40, 40), radius=20, checked_color=self.theme['red'])
+        self.btn_record.setCheckable(True)
+        self.btn_record.setToolTip("Record")
+        self.btn_record.clicked.connect(self.toggle_recording)
+        controls_layout.addWidget(self.btn_record)
+        self.recording_status.connect(self.on_recording_status)
+
+        # Clip (save the last few seconds plus post-roll)
+        self.btn_clip = AnimatedButton(icon_name="fa5s.film", size=(40, 40), radius=20)
+        self.btn_clip.setToolTip("Save Clip")
+        self.btn_clip.clicked.connect(self.save_clip)
+        controls_layout.addWidget(self.btn_clip)
+
+        # Audio Toggle (current camera, off by default)
+        self.btn_audio = AnimatedButton(icon_name="fa5s.volume-mute", size=(40, 40), radius=20)
+        self.btn_audio.setCheckable(True)
+        self.btn_audio.clicked.connect(self.toggle_audio)
+        controls_layout.addWidget(self.btn_audio)
+        self._update_audio_button()
+
+        # Grid Toggle
+        self.btn_grid = AnimatedButton(icon_name="fa5s.th-large", size=(40, 40), radius=20)
+        self.btn_grid.setCheckable(True)
+        self.btn_grid.setToolTip("Grid View")
+        self.btn_grid.clicked.connect(self.toggle_grid)
+        controls_layout.addWidget(self.btn_grid)
+
         # Zoom Controls
         self.btn_zoom_out = AnimatedButton(icon_name="fa5s.search-minus", size=(40, 40), radius=20)
         self.btn_zoom_out.clicked.connect(self.zoom_out)
@@ -578,6 +1093,11 @@ class CameraPage(QWidget):
         self.layout.addWidget(self.controls)
         
         self.refresh_camera_list()
+        self.sync_recordings() # Resume cameras that were recording last session
+        self.sync_motion()
+        self.sync_clips()
+        self.sync_thumbnails()
+        self.thumbnails.start()
         
         # Entry Animation
         self.controls_opacity = QGraphicsOpacityEffect(self.controls)
@@ -593,6 +1113,11 @@ class CameraPage(QWidget):
         self.theme = theme
         self.controls.setStyleSheet(f"background-color: {theme['card']}; border-top: none;")
         self.btn_play.set_theme(theme)
+        self.btn_grid.set_theme(theme)
+        self.btn_record.set_theme(theme)
+        self.btn_clip.set_theme(theme)
+        self.btn_audio.set_theme(theme)
+        self._update_audio_button()
         self.btn_zoom_out.set_theme(theme)
         self.btn_zoom_in.set_theme(theme)
         self.btn_fullscreen.set_theme(theme)
@@ -602,6 +1127,23 @@ class CameraPage(QWidget):
 
     def load_settings(self):
         self.cameras = []
+        self.decode_mode = DECODE_MODE_DISPLAY
+        self.process_isolation = False
+        self.standby_max_streams = DEFAULT_MAX_STREAMS
+        self.standby_max_memory_mb = DEFAULT_MAX_MEMORY_MB
+        self.standby_max_cpu = DEFAULT_MAX_CPU_PERCENT
+        self.recording_dir = RECORDINGS_DIR
+        self.recording_segment_seconds = SEGMENT_SECONDS
+        self.recording_container = "mkv"
+        self.recording_retention_days = 7.0
+        self.recording_max_gb = 20.0
+        self.clip_pre_roll = PRE_ROLL_SECONDS
+        self.clip_post_roll = POST_ROLL_SECONDS
+        self.clip_buffer_mb = MAX_BUFFER_MB
+        self.clip_retention_days = 7.0
+        self.clip_max_gb = 2.0
+        self.thumbnail_refresh_seconds = REFRESH_INTERVAL
+        self.substream_max_width = SUB_MAX_WIDTH
         if os.path.exists(ICSEE_CONFIG):
             try:
                 with open(ICSEE_CONFIG, "r") as f:
@@ -609,7 +1151,33 @@ class CameraPage(QWidget):
                     if "cameras" in data:
                         self.cameras = data["cameras"]
                         self.current_cam_index = data.get("last_selected_index", 0)
+                    # "display" decodes at the on-screen size, "full" at sensor resolution
+                    self.decode_mode = data.get("camera_decode_mode", DECODE_MODE_DISPLAY)
+                    # Decode the single view in a child process (killable if it hangs)
+                    self.process_isolation = bool(data.get("camera_process_isolation", False))
+                    # Warm-standby limits: 0 streams disables the cache
+                    self.standby_max_streams = int(data.get("camera_standby_streams", DEFAULT_MAX_STREAMS))
+                    self.standby_max_memory_mb = float(data.get("camera_standby_memory_mb", DEFAULT_MAX_MEMORY_MB))
+                    self.standby_max_cpu = float(data.get("camera_standby_cpu_percent", DEFAULT_MAX_CPU_PERCENT))
+                    # Recording: segment length, container (mkv/mp4) and retention
+                    self.recording_dir = os.path.expanduser(data.get("recording_dir", str(RECORDINGS_DIR)))
+                    self.recording_segment_seconds = int(data.get("recording_segment_seconds", SEGMENT_SECONDS))
+                    self.recording_container = data.get("recording_format", "mkv")
+                    self.recording_retention_days = float(data.get("recording_retention_days", 7))
+                    self.recording_max_gb = float(data.get("recording_max_gb", 20))
+                    # Event clips: seconds kept before/after a trigger, and the per-camera memory cap
+                    self.clip_pre_roll = float(data.get("clip_pre_roll_seconds", PRE_ROLL_SECONDS))
+                    self.clip_post_roll = float(data.get("clip_post_roll_seconds", POST_ROLL_SECONDS))
+                    self.clip_buffer_mb = float(data.get("clip_buffer_mb", MAX_BUFFER_MB))
+                    self.clip_retention_days = float(data.get("clip_retention_days", 7))
+                    self.clip_max_gb = float(data.get("clip_max_gb", 2))
+                    self.thumbnail_refresh_seconds = float(data.get("thumbnail_refresh_seconds", REFRESH_INTERVAL))
+                    self.substream_max_width = int(data.get("substream_max_width", SUB_MAX_WIDTH))
             except: pass
+        
+        # Bridge stream names come from a per-camera ID, so they survive reordering
+        if ensure_camera_ids(self.cameras):
+            self.save_settings()
             
         # Ensure at least one camera or empty list
         if not self.cameras:
@@ -633,11 +1201,13 @@ class CameraPage(QWidget):
         except: pass
 
     def refresh_camera_list(self):
-        # Clear list
+        # Keep the cards of unchanged cameras; rebuilding them all re-renders every icon and thumbnail
+        old = self._card_widgets
+        self._card_widgets = {}
         for i in reversed(range(self.cam_list_layout.count())): 
             widget = self.cam_list_layout.itemAt(i).widget()
             if widget:
-                widget.setParent(None)
+                self.cam_list_layout.removeWidget(widget)
         self.device_cards.clear()
         
         for i, cam in enumerate(self.cameras):
@@ -646,6 +1216,15 @@ class CameraPage(QWidget):
             
             card_id = str(i) 
             
+            reused = old.pop(card_id, None)
+            if reused and reused[0] == (cam.get("id"), name, ip):
+                self._card_widgets[card_id] = reused
+                self.device_cards[card_id] = reused[1]
+                self.cam_list_layout.addWidget(reused[2])
+                continue
+            if reused:
+                reused[2].setParent(None)
+            
             # Container for Button + Label
             container = QWidget()
             container.setFixedWidth(60)
@@ -659,6 +1238,7 @@ class CameraPage(QWidget):
                               on_delete=lambda _, idx=i: self.delete_camera(idx),
                               size=(50, 50),
                               bg_color=self.theme['input'])
+            card.set_thumbnail(self._thumbnail_pixmaps.get(thumbnail_key(cam.get("id"))))
             
             card.clicked.connect(lambda checked, idx=i: self.on_camera_selected(idx))
             c_layout.addWidget(card, 0, Qt.AlignmentFlag.AlignCenter)
@@ -676,6 +1256,13 @@ class CameraPage(QWidget):
             c_layout.addWidget(lbl, 0, Qt.AlignmentFlag.AlignCenter)
             
             self.cam_list_layout.addWidget(container)
+            self._card_widgets[card_id] = ((cam.get("id"), name, ip), card, container)
+        
+        # Cameras that were removed
+        for _, _, container in old.values():
+            container.setParent(None)
+        if self._add_container:
+            self._add_container.setParent(None)
             
         # Add "Add Camera" button
         container_add = QWidget()
@@ -710,6 +1297,7 @@ class CameraPage(QWidget):
         add_layout.addWidget(lbl_add, 0, Qt.AlignmentFlag.AlignCenter)
         
         self.cam_list_layout.addWidget(container_add)
+        self._add_container = container_add
 
         # Highlight current
         if self.current_cam_index < len(self.cameras):
@@ -733,14 +1321,17 @@ class CameraPage(QWidget):
         for i, card in self.device_cards.items():
             card.setChecked(int(i) == index)
             card.update_style()
+        self._update_record_button()
+        self._update_audio_button()
+        self._update_clip_button()
             
         if start_stream:
             self.save_settings()
-            self.stop_stream()
+            self.stop_stream(park=True)
             self.start_stream()
 
     def add_camera(self):
-        new_cam = {"name": "New Camera", "ip": "", "port": "554", "protocol": "rtsp", "user": "admin", "pass": ""}
+        new_cam = {"id": new_camera_id(), "name": "New Camera", "ip": "", "port": "554", "protocol": "rtsp", "user": "admin", "pass": "", "main_path": DEFAULT_MAIN_PATH, "sub_path": DEFAULT_SUB_PATH}
         self.cameras.append(new_cam)
         self.save_settings()
         self.refresh_camera_list()
@@ -753,10 +1344,16 @@ class CameraPage(QWidget):
         dlg.list_cams.setCurrentRow(index)
         if dlg.exec():
             self.cameras = dlg.get_cameras()
+            ensure_camera_ids(self.cameras)
             self.save_settings()
             self.update_bridge_config() # Push changes to go2rtc
             self.refresh_camera_list()
             self.stop_stream()
+            self.standby.clear() # Bridge streams may now point at other cameras
+            self.sync_recordings()
+            self.sync_motion()
+            self.sync_clips()
+            self.sync_thumbnails()
             self.start_stream()
 
     def delete_camera(self, index):
@@ -769,14 +1366,19 @@ class CameraPage(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             # Stop stream FIRST to prevent threading issues/crashes
             self.stop_stream()
+            self.standby.clear() # Drop the deleted camera's parked streams
             
             self.cameras.pop(index)
             if self.current_cam_index >= len(self.cameras):
                 self.current_cam_index = max(0, len(self.cameras) - 1)
             
             self.save_settings()
-            self.update_bridge_config() # Push changes (update indices) to go2rtc
+            self.update_bridge_config() # Removes the deleted camera's streams from go2rtc
             self.refresh_camera_list()
+            self.sync_recordings()
+            self.sync_motion()
+            self.sync_clips()
+            self.sync_thumbnails()
             
             if self.cameras:
                 self.start_stream()
@@ -785,61 +1387,43 @@ class CameraPage(QWidget):
     def show_settings(self):
         self.edit_camera(self.current_cam_index) # Just edit current one or open list
 
+    def attach_bridge(self, bootstrap):
+        """Use the go2rtc bootstrap started in the background by run_app"""
+        self._bridge_bootstrap = bootstrap
+        bootstrap.add_done_callback(self._on_bridge_launched)
+
+    def _on_bridge_launched(self, supervisor):
+        # Bootstrap thread. A (re)started go2rtc only knows the startup yaml, so push the live config each time
+        if supervisor is not None:
+            supervisor.on_ready = self.bridge.resync
+        self.bridge.resync()
+
     def update_bridge_config(self):
-        """Push configuration updates to go2rtc API for hot-reloading"""
-        try:
-            for i, cam in enumerate(self.cameras):
-                if cam.get("protocol") == "xmeye":
-                    user = cam.get("user", "admin")
-                    pwd = cam.get("pass", "")
-                    ip = cam.get("ip", "")
-                    if ip:
-                        # 1. Source Stream (raw dvrip)
-                        src_raw = f"dvrip://{user}:{pwd}@{ip}"
-                        name_raw = f"cam_{i}_raw"
-                        self._push_stream_to_bridge(name_raw, src_raw)
-                        
-                        # 2. Transcoded Stream (ffmpeg)
-                        src_ffmpeg = f"ffmpeg:rtsp://127.0.0.1:8554/{name_raw}#video=h264"
-                        name_ffmpeg = f"cam_{i}"
-                        self._push_stream_to_bridge(name_ffmpeg, src_ffmpeg)
-
-        except Exception as e:
-            print(f"Failed to update bridge config: {e}")
-
-    def _push_stream_to_bridge(self, name, src):
-        try:
-            # enable API in main.py first!
-            base_url = "http://127.0.0.1:1984/api/streams"
-            params = urllib.parse.urlencode({"src": src, "name": name})
-            url = f"{base_url}?{params}"
-            
-            req = urllib.request.Request(url, method="PUT")
-            with urllib.request.urlopen(req) as response:
-                pass # Success
-        except: 
-            pass # Bridge might not be running or API disabled
+        """Sync go2rtc's streams with the camera list (diffed and applied in the background)"""
+        streams = {}
+        for cam in self.cameras:
+            streams.update(bridge_streams(cam))
+        self.bridge.sync(streams)
 
     def get_current_rtsp_url(self):
-        if not self.cameras or self.current_cam_index >= len(self.cameras):
+        return self.get_rtsp_url(self.current_cam_index)
+
+    def get_rtsp_url(self, index, profile=MAIN):
+        if not self.cameras or index < 0 or index >= len(self.cameras):
             return None
         
-        cam = self.cameras[self.current_cam_index]
-        ip = cam.get("ip", "")
-        if not ip:
+        cam = self.cameras[index]
+        if not cam.get("ip", ""):
             return None
-            
-        user = cam.get("user", "")
-        pwd = cam.get("pass", "")
-        port = cam.get("port", "554")
-        
+        if profile == SUB and not has_substream(cam):
+            profile = MAIN
         
         proto = cam.get("protocol", "rtsp")
         if proto == "xmeye":
-            # Use go2rtc bridge (stream name matches index in config)
-            return f"rtsp://127.0.0.1:8554/cam_{self.current_cam_index}"
+            # Use go2rtc bridge (stream name from the camera ID)
+            return f"{BRIDGE_RTSP}/{stream_name(cam['id'], profile)}"
             
-        return f"rtsp://{user}:{pwd}@{ip}:{port}/live/0/main"
+        return camera_url(cam, profile)
 
     def start_stream_if_ready(self):
         if self.video_thread is None or not self.video_thread.isRunning():
@@ -849,14 +1433,22 @@ class CameraPage(QWidget):
         if not self.cameras or self.video_thread and self.video_thread.isRunning():
             return
 
-        url = self.get_current_rtsp_url()
+        profile = self._choose_profile()
+        url = self.get_rtsp_url(self.current_cam_index, profile)
         if not url:
-            self.lbl_video.setText("No Camera Configured\nPlease set IP in Settings")
+            self.lbl_video.set_message("No Camera Configured\nPlease set IP in Settings")
             self.lbl_cam_status.setText("No Config")
             self.lbl_cam_status.setStyleSheet(f"color: {self.theme['text_sec']};")
             self.btn_play.setIcon(qta.icon("fa5s.play", color="white"))
             return
 
+        if url.startswith(BRIDGE_RTSP) and self._bridge_bootstrap and not self._bridge_bootstrap.done:
+            # Bridged camera, but go2rtc is still being launched: check again shortly
+            self.lbl_cam_status.setText("Starting video bridge...")
+            self.loading_overlay.show_loading()
+            self._bridge_wait_timer.start()
+            return
+
         # Start Progress Animation
         self.loading_signal.emit(0)
         
@@ -870,15 +1462,25 @@ class CameraPage(QWidget):
         self.loading_overlay.show_loading()
         self.lbl_cam_status.setText("Connecting...")
 
-        self.video_thread = VideoThread(url)
-        self.video_thread.change_pixmap_signal.connect(self.update_image) # Connect to wrapper
-        self.video_thread.status_signal.connect(self.update_status)
+        self.video_thread = self._make_thread(url)
+        self.stream_profile = profile
+        self._connect_thread(self.video_thread)
         self.video_thread.start()
         self.btn_play.setIcon(qta.icon("fa5s.pause", color=self.theme['text']))
+        self.sync_audio()
+        self._motion_watch_timer.start()
     
-    def update_image(self, qt_img):
+    def update_image(self):
+        # Pull the newest frame; anything older was already dropped by the mailbox
+        if not self.video_thread:
+            return
+        frame = self.video_thread.mailbox.take()
+        if frame is None:
+            return
+
         # Wrapper to handle UI updates when frame arrives
         # Check if we were connecting (progress value exists and is not 0)
+        stats = self.video_thread.session.stats
         if hasattr(self, '_progress_val') and self._progress_val > 0:
              if hasattr(self, '_progress_timer'): self._progress_timer.stop()
              self._progress_val = 0 # Reset internal flag
@@ -889,7 +1491,7 @@ class CameraPage(QWidget):
              # Keep at 100% for 500ms so user SEES it done, then hide
              QTimer.singleShot(500, lambda: self.loading_signal.emit(0))
             
-        self.lbl_video.update_image(qt_img)
+        record_display(stats, self.lbl_video, frame)
 
     def _animate_progress(self):
         # Connect animation (stops at 80% until real connection happens)
@@ -902,16 +1504,15 @@ class CameraPage(QWidget):
 
     @pyqtSlot(str)
     def update_status(self, status):
+        if self._substream_failed(status):
+            return
         self.lbl_cam_status.setText(status)
         if "Failed" in status or "Error" in status:
             self.loading_overlay.hide_loading()
             if hasattr(self, '_progress_timer'): self._progress_timer.stop()
             self.loading_signal.emit(0) # Hide progress bar immediately on failure
-        elif status == "Reconnecting...":
+        elif status.startswith("Reconnecting"):
             self.loading_overlay.show_loading()
-            # Maybe restart progress? 
-            # self.loading_signal.emit(10)
-            pass
         
         if status == "Live":
             self.lbl_cam_status.setText("🔴 Live")
@@ -920,6 +1521,7 @@ class CameraPage(QWidget):
             # Hide loading, fade in video
             self.loading_overlay.hide_loading()
             if self.video_opacity.opacity() < 1.0:
+                self.video_opacity.setEnabled(True)
                 self.anim_video.stop()
                 self.anim_video.setStartValue(self.video_opacity.opacity())
                 self.anim_video.setEndValue(1.0)
@@ -929,9 +1531,9 @@ class CameraPage(QWidget):
             self.loading_overlay.hide_loading()
             self.lbl_cam_status.setStyleSheet(f"color: {self.theme['red']};")
             self.btn_play.setIcon(qta.icon("fa5s.exclamation-triangle", color="white"))
-            self.lbl_video.setText("Connection Failed\nVerify IP or Protocol")
+            self.lbl_video.set_message("Connection Failed\nVerify IP or Protocol")
             
-        elif status == "Connecting..." or status == "Buffering...":
+        elif status == "Connecting..." or status == "Buffering..." or status.startswith("Reconnecting"):
             self.lbl_cam_status.setStyleSheet(f"color: {self.theme['accent']};")
             self.loading_overlay.show_loading()
             
@@ -940,22 +1542,37 @@ class CameraPage(QWidget):
             self.lbl_cam_status.setStyleSheet(f"color: {self.theme['text_sec']};")
 
 
-    def stop_stream(self):
+    def _substream_failed(self, status):
+        # A substream that never produced a frame (e.g. a wrong sub path):
+        # mark it failed and come back up on the main stream instead
+        thread = self.video_thread
+        if thread is None or self.stream_profile != SUB:
+            return False
+        if not ("Failed" in status or status.startswith("Reconnecting")):
+            return False
+        session = thread.session
+        if getattr(session, "frames_decoded", session.frames_published):
+            return False
+        name = self.cameras[self.current_cam_index].get("name", "Unnamed")
+        logging.warning(f"{SUB} stream of {name} unavailable, falling back to {MAIN}")
+        self._failed_urls.add(thread.url)
+        self.stop_stream()
+        self.start_stream()
+        return True
+
+    def stop_stream(self, park=False):
+        self._resume_on_show = False
+        self.stop_grid()
+        self._bridge_wait_timer.stop()
+        self._profile_timer.stop()
+        self._cancel_pending()
         if self.video_thread:
-            try:
-                self.video_thread.change_pixmap_signal.disconnect()
-            except: pass
-            self.video_thread.stop()
-            self.video_thread.wait() # Ensure thread finishes
+            self._release_thread(self.video_thread, park=park)
             self.video_thread = None
-        
-        black_pixmap = QPixmap(self.lbl_video.size())
-        black_pixmap.fill(Qt.GlobalColor.black)
-        self.lbl_video.setPixmap(black_pixmap)
-        self.lbl_video.repaint()
-        
-        self.lbl_video.setText("Paused")
-        self.lbl_video.setStyleSheet("background-color: black; color: gray; font-size: 16px;")
+            self.stream_profile = None
+        self.sync_audio()
+        self._motion_watch_timer.start()
+        self.lbl_video.set_message("Paused")
         self.btn_play.setIcon(qta.icon("fa5s.play", color="white"))
         self.lbl_cam_status.setText("Paused")
         self.lbl_cam_status.setStyleSheet(f"color: {self.theme['text_sec']};")
@@ -966,9 +1583,198 @@ class CameraPage(QWidget):
         self.loading_signal.emit(0)
         
         # Reset opacity for next fade in
+        self.video_opacity.setEnabled(True)
         self.video_opacity.setOpacity(0.0)
         self.loading_overlay.hide_loading()
 
+    def set_page_visible(self, visible):
+        """Background mode for while another tab is shown.
+
+        Bridged streams are closed (go2rtc keeps the camera connection warm, so
+        reopening is quick); direct ones stay connected but only grab. Taps are
+        suspended, the motion watch covers motion-enabled cameras meanwhile, and
+        the surfaces keep their last frame.
+        """
+        if visible == self.page_visible:
+            return
+        self.page_visible = visible
+        if not visible:
+            self._profile_timer.stop()
+            self._cancel_pending()
+            for key in self.standby.keys():
+                if str(key).startswith(BRIDGE_RTSP):
+                    self.standby.discard(key)
+            if self.video_thread and self.video_thread.url.startswith(BRIDGE_RTSP):
+                self._release_thread(self.video_thread)
+                self.video_thread = None
+                self.stream_profile = None
+                self._resume_on_show = True
+        for tile in self.grid_tiles:
+            if tile.session.url.startswith(BRIDGE_RTSP):
+                if visible:
+                    self.decode_pool.add(tile.session)
+                else:
+                    self.decode_pool.suspend(tile.session)
+        sessions = [tile.session for tile in self.grid_tiles]
+        if self.video_thread:
+            sessions.append(self.video_thread.session)
+        for session in sessions:
+            session.set_standby(not visible)
+            if not visible:
+                session.taps = []
+        if visible:
+            self._reattach_taps()
+            if self._resume_on_show:
+                self._resume_on_show = False
+                if self.video_thread is None and not self.is_grid:
+                    self.start_stream()
+            self._profile_timer.start() # The view may have been resized meanwhile
+        self.sync_audio()
+        self._motion_watch_timer.start()
+
+    def _make_thread(self, url):
+        cam = self.cameras[self.current_cam_index]
+        name = cam.get("name", "Unnamed")
+        if self.process_isolation:
+            return ProcessVideoThread(url, name=name, camera_id=cam.get("id"))
+        return VideoThread(url, name=name, session=self.standby.take(url), camera_id=cam.get("id"))
+
+    def _connect_thread(self, thread):
+        # Make thread the one on screen
+        if isinstance(thread, VideoThread):
+            self._attach_taps(thread.session, self.current_cam_index)
+        thread.frame_ready.connect(self.update_image) # Connect to wrapper
+        thread.status_signal.connect(self.update_status)
+        if self.decode_mode == DECODE_MODE_DISPLAY:
+            thread.session.set_output_size(*self.lbl_video.decode_size())
+            self.lbl_video.viewport_changed.connect(thread.session.set_output_size)
+        thread.session.set_roi(self.lbl_video.view_rect() if self.lbl_video.zoom_level > 1.0 else None)
+        self.lbl_video.roi_changed.connect(thread.session.set_roi)
+        if not self.page_visible:
+            thread.session.set_standby(True)
+
+    def _release_thread(self, thread, park=False):
+        session = None
+        if park and isinstance(thread, VideoThread):
+            session = thread.detach()
+            if session is not None:
+                session.taps = [] # Its replacement or the motion watch feeds the detectors now
+        try:
+            thread.frame_ready.disconnect()
+        except: pass
+        try:
+            thread.status_signal.disconnect()
+        except: pass
+        try:
+            self.lbl_video.viewport_changed.disconnect(thread.session.set_output_size)
+        except: pass
+        try:
+            self.lbl_video.roi_changed.disconnect(thread.session.set_roi)
+        except: pass
+        self._retire_thread(thread)
+        if session is not None:
+            self.standby.park(session)
+
+    def _choose_profile(self, current=None):
+        index = self.current_cam_index
+        if not self.cameras or index >= len(self.cameras):
+            return MAIN
+        available = has_substream(self.cameras[index]) and self.get_rtsp_url(index, SUB) not in self._failed_urls
+        return self.profile_selector.choose(self.lbl_video.width(), self.lbl_video.zoom_level, current, available)
+
+    def _update_profile(self):
+        # Make-before-break: bring the other profile up alongside the current one
+        if self.video_thread is None or self.is_grid or not self.page_visible:
+            return
+        profile = self._choose_profile(self.stream_profile)
+        if profile == self._pending_profile:
+            return
+        self._cancel_pending()
+        if profile == self.stream_profile:
+            return
+        url = self.get_rtsp_url(self.current_cam_index, profile)
+        if not url or url in self._failed_urls:
+            return
+        thread = self._make_thread(url)
+        if self.decode_mode == DECODE_MODE_DISPLAY:
+            thread.session.set_output_size(*self.lbl_video.decode_size())
+        thread.session.set_roi(self.lbl_video.view_rect() if self.lbl_video.zoom_level > 1.0 else None)
+        thread.frame_ready.connect(self._promote_pending)
+        thread.status_signal.connect(self._on_pending_status)
+        self._pending_thread = thread
+        self._pending_profile = profile
+        thread.start()
+
+    def _promote_pending(self):
+        # First frame of the new profile: swap it in and retire the old stream to standby
+        thread = self._pending_thread
+        if thread is None:
+            return
+        try:
+            thread.frame_ready.disconnect(self._promote_pending)
+        except: pass
+        try:
+            thread.status_signal.disconnect(self._on_pending_status)
+        except: pass
+        profile = self._pending_profile
+        self._pending_thread = None
+        self._pending_profile = None
+        if self.video_thread:
+            self._release_thread(self.video_thread, park=True)
+        self.video_thread = thread
+        self.stream_profile = profile
+        self._connect_thread(thread)
+        self.update_image()
+        self.sync_audio() # Follow the stream go2rtc is already pulling
+
+    @pyqtSlot(str)
+    def _on_pending_status(self, status):
+        # The replacement never connected: keep the current stream and stop trying this one
+        if "Failed" in status or status.startswith("Reconnecting"):
+            thread = self._pending_thread
+            if thread is not None:
+                name = self.cameras[self.current_cam_index].get("name", "Unnamed")
+                logging.warning(f"{self._pending_profile} stream of {name} unavailable, staying on {self.stream_profile}")
+                self._failed_urls.add(thread.url)
+            self._cancel_pending()
+
+    def _cancel_pending(self):
+        thread = self._pending_thread
+        if thread is None:
+            return
+        self._pending_thread = None
+        self._pending_profile = None
+        self._release_thread(thread, park=True)
+
+    def _retire_thread(self, thread):
+        # Don't block the GUI on a capture stuck in a socket read; keep a
+        # reference until it exits so Qt doesn't destroy a running QThread
+        thread.stop()
+        if thread.isRunning():
+            self._retired_threads.append(thread)
+            thread.finished.connect(lambda t=thread: self._retired_threads.remove(t) if t in self._retired_threads else None)
+
+    def shutdown(self):
+        """Stop every stream and wait for capture threads before the app exits"""
+        self.stop_stream()
+        self._standby_timer.stop()
+        self.standby.stop()
+        self.recorder.shutdown()
+        self._motion_watch_timer.stop()
+        self.motion_watch.stop()
+        self._clip_timer.stop()
+        for buf in self.clip_buffers.values():
+            buf.finish() # Keep clips still collecting their post-roll
+        self.clip_writer.stop()
+        self.thumbnails.stop()
+        self.bridge.stop()
+        if self.decode_pool:
+            self.decode_pool.stop()
+            self.decode_pool = None
+        for thread in list(self._retired_threads):
+            thread.wait(5000)
+        self._retired_threads = []
+
     def toggle_play_pause(self):
         # Debounce: Prevent spamming (wait 1s between toggles)
         current_time = time.time()
@@ -984,9 +1790,7 @@ class CameraPage(QWidget):
             self.btn_play.setToolTip("Resume Stream")
             self.lbl_cam_status.setText("Paused")
             # Clear video
-            self.lbl_video.clear()
-            self.lbl_video.setText("Paused")
-            self.lbl_video.setStyleSheet("background-color: black; color: gray; font-size: 16px;")
+            self.lbl_video.set_message("Paused")
         else:
             self.start_stream()
             self.btn_play.setIcon(qta.icon("fa5s.pause", color=self.theme['text'])) # White Pause (Neutral)
@@ -995,6 +1799,433 @@ class CameraPage(QWidget):
     def toggle_stream(self):
         self.toggle_play_pause()
 
+    def toggle_debug_overlay(self):
+        if self.lbl_debug.isVisible():
+            self._debug_timer.stop()
+            self.lbl_debug.hide()
+        else:
+            self._refresh_debug_overlay()
+            self.lbl_debug.show()
+            self.lbl_debug.raise_()
+            self._debug_timer.start(500)
+
+    def _refresh_debug_overlay(self):
+        # Grid tiles are covered by the Settings page report
+        if self.video_thread:
+            lines = self.video_thread.session.stats.summary_lines()
+            if self.audio:
+                audio = self.audio.stream.buffer.stats()
+                lines.append(f"audio    buf {audio['buffered_ms']:.0f}/{audio['target_ms']:.0f} ms  underruns {audio['underruns']}")
+            text = "\n".join(lines)
+        else:
+            text = "No stream"
+        self.lbl_debug.setText(text)
+        self.lbl_debug.adjustSize()
+
+    def _recording_key(self, index):
+        # By ID: cameras may share a name
+        return self.cameras[index].get("id")
+
+    def _recording_spec(self, index):
+        # Record from the go2rtc bridge so the camera only serves one connection
+        cam = self.cameras[index]
+        if not cam.get("ip") or not cam.get("id"):
+            return None
+        url = f"{BRIDGE_RTSP}/{stream_name(cam['id'])}"
+        return (cam.get("name", "Unnamed"), url)
+
+    def sync_recordings(self):
+        """Start/stop recorders to match each camera's saved "record" flag"""
+        wanted = {}
+        for i, cam in enumerate(self.cameras):
+            if cam.get("record"):
+                spec = self._recording_spec(i)
+                if spec:
+                    wanted[self._recording_key(i)] = spec
+        for key, spec in list(self._recording_specs.items()):
+            if wanted.get(key) != spec:
+                self.recorder.stop(key)
+                del self._recording_specs[key]
+        for key, spec in wanted.items():
+            if key not in self._recording_specs:
+                self.recorder.start(key, *spec)
+                self._recording_specs[key] = spec
+        self._update_record_button()
+
+    def toggle_recording(self):
+        if not self.cameras or self.current_cam_index >= len(self.cameras):
+            self.btn_record.setChecked(False)
+            self.btn_record.update_color_from_state()
+            return
+        cam = self.cameras[self.current_cam_index]
+        cam["record"] = not cam.get("record", False)
+        self.save_settings()
+        self.sync_recordings()
+
+    def _update_record_button(self):
+        if not hasattr(self, 'btn_record'):
+            return
+        recording = False
+        tooltip = "Record"
+        if self.cameras and self.current_cam_index < len(self.cameras):
+            recording = bool(self.cameras[self.current_cam_index].get("record"))
+            if recording:
+                status = self.recorder.status(self._recording_key(self.current_cam_index))
+                tooltip = f"Recording: {status or 'Starting'}"
+        self.btn_record.setChecked(recording)
+        self.btn_record.update_color_from_state()
+        self.btn_record.setToolTip(tooltip)
+
+    @pyqtSlot(str, str)
+    def on_recording_status(self, key, status):
+        if self.cameras and self.current_cam_index < len(self.cameras) and key == self._recording_key(self.current_cam_index):
+            self._update_record_button()
+
+    def _audio_url(self, index):
+        # Audio comes from the bridge stream the video already uses, so go2rtc shares the camera connection
+        cam = self.cameras[index]
+        if not cam.get("ip") or not cam.get("id"):
+            return None
+        name = stream_name(cam["id"], self.stream_profile or MAIN)
+        if cam.get("protocol", "rtsp") == "xmeye":
+            name += "_raw" # The H.264 re-stream is video only
+        return f"{BRIDGE_RTSP}/{name}"
+
+    def sync_audio(self):
+        """Play the current camera's audio while its single view is on screen and unmuted"""
+        url = None
+        if (QAudioSink is not None and self.video_thread and not self.is_grid and self.page_visible
+                and self.cameras and self.current_cam_index < len(self.cameras)
+                and self.cameras[self.current_cam_index].get("audio")):
+            url = self._audio_url(self.current_cam_index)
+        if self.audio and self.audio.url != url:
+            self._audio_sync_timer.stop()
+            self.audio.stop()
+            self.audio = None
+        if url and self.audio is None:
+            try:
+                self.audio = CameraAudio(url, on_status=self.audio_status.emit, parent=self)
+                self.audio.start()
+            except Exception as e:
+                logging.error(f"Audio output failed: {e}")
+                self.audio = None
+                return
+            self._sync_audio_delay()
+            self._audio_sync_timer.start(500)
+        self._update_audio_button()
+
+    def _sync_audio_delay(self):
+        if not self.audio or not self.video_thread:
+            return
+        latency = self.video_thread.session.stats.glass_to_glass.percentile(50)
+        if latency is not None:
+            self.audio.set_video_delay(latency)
+
+    def toggle_audio(self):
+        if QAudioSink is None or not self.cameras or self.current_cam_index >= len(self.cameras):
+            self._update_audio_button()
+            return
+        cam = self.cameras[self.current_cam_index]
+        cam["audio"] = not cam.get("audio", False)
+        self.save_settings()
+        self.sync_audio()
+
+    @pyqtSlot(str)
+    def on_audio_status(self, status):
+        self._update_audio_button()
+
+    def _update_audio_button(self):
+        if not hasattr(self, 'btn_audio'):
+            return
+        enabled = False
+        tooltip = "Audio"
+        if QAudioSink is None:
+            tooltip = "Audio unavailable (QtMultimedia not installed)"
+        elif self.cameras and self.current_cam_index < len(self.cameras):
+            enabled = bool(self.cameras[self.current_cam_index].get("audio"))
+            if enabled and self.audio:
+                tooltip = f"Audio: {self.audio.stream.status or 'Starting'}"
+        self.btn_audio.setEnabled(QAudioSink is not None)
+        self.btn_audio.setChecked(enabled)
+        self.btn_audio.update_color_from_state()
+        self.btn_audio.setIcon(qta.icon("fa5s.volume-up" if enabled else "fa5s.volume-mute", color=self.theme['text']))
+        self.btn_audio.setToolTip(tooltip)
+
+    def _camera_index(self, cam_id):
+        # List position of a camera ID (None if it was deleted); positions shift, IDs don't
+        for i, cam in enumerate(self.cameras):
+            if cam.get("id") == cam_id:
+                return i
+        return None
+
+    def _camera_id(self, index):
+        return self.cameras[index].get("id") if 0 <= index < len(self.cameras) else None
+
+    def sync_motion(self):
+        """(Re)build motion detectors from each camera's "motion" settings"""
+        detectors = {}
+        for cam in self.cameras:
+            cam_id = cam.get("id")
+            if not cam.get("motion") or not cam_id:
+                continue
+            sensitivity = float(cam.get("motion_sensitivity", 0.5))
+            roi = parse_roi(cam.get("motion_roi"))
+            old = self.motion_detectors.get(cam_id)
+            if old and old.sensitivity == sensitivity and old.roi == roi:
+                detectors[cam_id] = old
+            else:
+                detectors[cam_id] = MotionDetector(cam_id, sensitivity, roi, on_event=self.motion_event.emit)
+        self.motion_detectors = detectors
+        for card in self.device_cards.values():
+            card.set_badge(None)
+        self._reattach_taps()
+
+    def sync_clips(self):
+        """Pre-roll buffers for cameras with clips or motion enabled; unchanged ones are kept"""
+        buffers = {}
+        for cam in self.cameras:
+            cam_id = cam.get("id")
+            if not (cam.get("clips") or cam.get("motion")) or not cam_id:
+                continue
+            name = cam.get("name", "Unnamed")
+            directory = os.path.join(self.recording_dir, CLIPS_DIR, camera_dirname(name, cam_id))
+            old = self.clip_buffers.get(cam_id)
+            if old and old.name == name and str(old.directory) == directory:
+                buffers[cam_id] = old
+            else:
+                buffers[cam_id] = ClipBuffer(
+                    cam_id, name, directory, self.clip_writer,
+                    pre_roll=self.clip_pre_roll, post_roll=self.clip_post_roll,
+                    max_bytes=int(self.clip_buffer_mb * 1024 * 1024),
+                )
+        for cam_id, buf in self.clip_buffers.items():
+            if buffers.get(cam_id) is not buf:
+                buf.finish() # Save a pending clip rather than drop it
+                buf.clear()
+        self.clip_buffers = buffers
+        self._reattach_taps()
+        self._update_clip_button()
+
+    def _attach_taps(self, session, index):
+        if not self.page_visible:
+            session.taps = [] # Suspended while hidden; the motion watch samples instead
+            return
+        cam_id = self._camera_id(index)
+        session.taps = [tap for tap in (self.motion_detectors.get(cam_id), self.clip_buffers.get(cam_id)) if tap]
+
+    def _reattach_taps(self):
+        # Point whatever is decoding right now at the current detectors/buffers
+        if isinstance(self.video_thread, VideoThread):
+            self._attach_taps(self.video_thread.session, self.current_cam_index)
+        for tile in self.grid_tiles:
+            self._attach_taps(tile.session, tile.index)
+        self.sync_motion_watch()
+
+    def sync_motion_watch(self):
+        """Watch every motion-enabled camera the visible page is not already decoding"""
+        covered = set()
+        if self.page_visible: # Hidden sessions have their taps suspended
+            if isinstance(self.video_thread, VideoThread):
+                covered.add(self.current_cam_index) # Process isolation has no taps
+            covered.update(tile.index for tile in self.grid_tiles)
+        cameras = {}
+        for cam_id, detector in self.motion_detectors.items():
+            i = self._camera_index(cam_id)
+            if i is None or i in covered:
+                continue
+            url = self.get_rtsp_url(i, SUB)
+            if url in self._failed_urls:
+                url = self.get_rtsp_url(i, MAIN)
+            if not url:
+                continue
+            taps = [tap for tap in (detector, self.clip_buffers.get(cam_id)) if tap]
+            cameras[cam_id] = (url, self.cameras[i].get("name", "Unnamed"), cam_id, taps)
+        self.motion_watch.set_cameras(cameras)
+
+    @pyqtSlot(object, str)
+    def on_motion_watch_failed(self, cam_id, url):
+        index = self._camera_index(cam_id)
+        if index is None or url == self.get_rtsp_url(index, MAIN):
+            return # Nothing else to try; the pool keeps retrying
+        if url.startswith(BRIDGE_RTSP) and self._bridge_bootstrap and not self._bridge_bootstrap.done:
+            return # go2rtc is still starting, not a bad stream
+        self._failed_urls.add(url)
+        self._motion_watch_timer.start()
+
+    def flush_overdue_clips(self):
+        for buf in self.clip_buffers.values():
+            buf.flush_overdue()
+
+    def _update_clip_button(self):
+        if not hasattr(self, 'btn_clip'):
+            return
+        enabled = self._camera_id(self.current_cam_index) in self.clip_buffers
+        self.btn_clip.setEnabled(enabled)
+        self.btn_clip.setToolTip("Save Clip" if enabled else "Clips are off for this camera (enable them in camera settings)")
+
+    def save_clip(self):
+        buf = self.clip_buffers.get(self._camera_id(self.current_cam_index))
+        if buf is None:
+            return
+        buf.trigger("manual")
+        self._flash_status(f"Saving clip ({buf.post_roll:.0f}s)...")
+
+    @pyqtSlot(object, str)
+    def on_clip_saved(self, key, path):
+        name = os.path.basename(path)
+        if key is not None and key == self._camera_id(self.current_cam_index):
+            self._flash_status(f"Clip saved: {name}")
+
+    def _flash_status(self, text):
+        # Temporarily replace the status text; put it back unless the stream status changed meanwhile
+        previous = self.lbl_cam_status.text()
+        self.lbl_cam_status.setText(text)
+        QTimer.singleShot(3000, lambda: self.lbl_cam_status.text() == text and self.lbl_cam_status.setText(previous))
+
+    def sync_thumbnails(self):
+        """Point the thumbnail refresher at the current camera list"""
+        cams = []
+        for i, cam in enumerate(self.cameras):
+            url = self.get_rtsp_url(i, SUB)
+            if not url:
+                continue
+            name = stream_name(cam["id"], SUB if has_substream(cam) else MAIN)
+            cams.append((thumbnail_key(cam["id"]), name))
+        self.thumbnails.set_cameras(cams)
+
+    @pyqtSlot(str, bytes)
+    def on_thumbnail_ready(self, key, data):
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data):
+            return
+        self._thumbnail_pixmaps[key] = pixmap
+        for i, cam in enumerate(self.cameras):
+            if thumbnail_key(cam.get("id")) == key:
+                card = self.device_cards.get(str(i))
+                if card:
+                    card.set_thumbnail(pixmap)
+
+    @pyqtSlot(object)
+    def on_motion_event(self, event):
+        # event.key is the camera ID; map it to today's list position for the UI
+        index = self._camera_index(event.key)
+        if index is None or self.motion_detectors.get(event.key) is None:
+            return # Camera deleted or detector replaced; late event from the old one
+        box = event.box if event.kind != "stop" else None
+        card = self.device_cards.get(str(index))
+        if card:
+            card.set_badge(self.theme['red'] if box else None)
+        if event.kind in ("start", "update"):
+            buf = self.clip_buffers.get(event.key)
+            if buf and (event.kind == "start" or buf.pending):
+                buf.trigger("motion") # Updates stretch the post-roll while motion lasts
+        if event.kind != "update":
+            self.motion_log.append(event)
+            name = self.cameras[index].get("name", "Unnamed")
+            logging.info(f"Motion {event.kind} on {name} (level {event.level:.3f})")
+        if not self.is_grid and index == self.current_cam_index and self.video_thread:
+            self.lbl_video.set_overlay_box(box)
+        for tile in self.grid_tiles:
+            if tile.index == index:
+                tile.set_motion(box)
+
+    def toggle_grid(self):
+        if self.is_grid:
+            self.stop_stream()
+            self.is_paused = True
+        else:
+            self.start_grid()
+        self.btn_grid.setChecked(self.is_grid)
+        self.btn_grid.update_color_from_state()
+
+    def start_grid(self):
+        if self.is_grid:
+            return
+        targets = []
+        for i in range(len(self.cameras)):
+            url = self.get_rtsp_url(i, SUB) # Tiles are at most half the view
+            if url in self._failed_urls:
+                url = self.get_rtsp_url(i, MAIN)
+            if url:
+                targets.append((i, self.cameras[i].get("name", "Unnamed"), url))
+        targets = targets[:GRID_MAX_TILES]
+        if not targets:
+            return
+
+        self.stop_stream()
+        self.is_grid = True
+        self.is_paused = False
+        if self.decode_pool is None:
+            self.decode_pool = DecodePool(workers=GRID_DECODE_WORKERS)
+
+        cols = 2 if len(targets) <= 4 else 3
+        for n, (index, name, url) in enumerate(targets):
+            tile = CameraTile(index, name, url, self.grid_view, decode_at_display=self.decode_mode == DECODE_MODE_DISPLAY,
+                              camera_id=self.cameras[index].get("id"))
+            tile.activated.connect(self.on_tile_activated)
+            tile.status_changed.connect(lambda status, t=tile: self.on_tile_status(t, status))
+            self._attach_taps(tile.session, index)
+            if not self.page_visible:
+                tile.session.set_standby(True)
+            self.grid_layout.addWidget(tile, n // cols, n % cols)
+            self.grid_tiles.append(tile)
+            self.decode_pool.add(tile.session)
+        self._motion_watch_timer.start()
+
+        self.lbl_video.hide()
+        self.grid_view.show()
+        self.btn_play.setIcon(qta.icon("fa5s.pause", color=self.theme['text']))
+        self.lbl_cam_status.setText(f"Grid ({len(targets)})")
+        self.lbl_cam_status.setStyleSheet(f"color: {self.theme['text_sec']}; font-weight: 500;")
+        self._grid_cpu_timer.start(2000)
+
+    def stop_grid(self):
+        if not self.is_grid:
+            return
+        self.is_grid = False
+        self._grid_cpu_timer.stop()
+        for tile in self.grid_tiles:
+            self.decode_pool.remove(tile.session)
+            tile.release()
+            tile.setParent(None)
+            tile.deleteLater()
+        self.grid_tiles = []
+        self.grid_view.hide()
+        self.lbl_video.show()
+        self.btn_grid.setChecked(False)
+        self.btn_grid.update_color_from_state()
+
+    def on_tile_status(self, tile, status):
+        # Same fallback as the single view: a substream with no frame yet
+        # that fails is swapped for the main stream, in place
+        if tile not in self.grid_tiles or tile.session.frames_decoded:
+            return
+        if not ("Failed" in status or status.startswith("Reconnecting")):
+            return
+        main = self.get_rtsp_url(tile.index, MAIN)
+        if not main or tile.session.url == main:
+            return
+        logging.warning(f"{SUB} stream of {tile.name} unavailable, falling back to {MAIN}")
+        self._failed_urls.add(tile.session.url)
+        # Re-adding resets the pool's backoff, so MAIN is tried right away
+        self.decode_pool.detach(tile.session)
+        tile.session.url = main
+        self.decode_pool.add(tile.session)
+
+    def on_tile_activated(self, index):
+        # Double-click a tile to open that camera in the single view
+        self.stop_grid()
+        self.is_paused = False
+        self.on_camera_selected(index)
+
+    def _refresh_grid_cpu(self):
+        if not self.decode_pool:
+            return
+        usage = self.decode_pool.cpu_usage()
+        for tile in self.grid_tiles:
+            if tile.index in usage:
+                tile.set_cpu(usage[tile.index])
+
     def zoom_in(self):
         self.lbl_video.zoom_in()
 
@@ -1,6 +1,7 @@
 
 import os
 import logging
+import threading
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
     QFrame, QScrollArea, QMessageBox, QTextEdit
@@ -9,7 +10,10 @@ from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import QFont
 import qtawesome as qta
 from ..theme import THEME_DARK
+from ..signals import WorkerSignals
 from ...core.constants import ICSEE_CONFIG, XIAOMI_CONFIG, LOG_FILE
+from ...services.metrics import fetch_bridge_stats, format_report
+from ...services.supervisor import bridge_process_stats
 
 class SettingsPage(QWidget):
     def __init__(self):
@@ -83,6 +87,12 @@ class SettingsPage(QWidget):
         
         self.container_layout.addWidget(logs_btn_container)
         
+        # Section: Video pipeline stats (fps, drops, per-stage latency)
+        self.add_section_header("Video Diagnostics")
+        self.stats_viewer = self.add_text_viewer("Camera Pipeline", "Refreshed when this page opens", height=180)
+        self.stats_signals = WorkerSignals()
+        self.stats_signals.result.connect(self.stats_viewer.setText)
+        
         # About Section
         self.add_section_header("About")
         
@@ -118,6 +128,19 @@ class SettingsPage(QWidget):
         self.container_layout.addWidget(lbl)
 
     def add_file_viewer(self, title, path, height=120):
+        content = "File not found."
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    content = f.read()
+            except Exception as e:
+                content = f"Error reading file: {e}"
+        
+        viewer = self.add_text_viewer(title, path, height)
+        viewer.setText(content)
+        return viewer
+
+    def add_text_viewer(self, title, subtitle, height=120):
         container = QWidget()
         layout = QVBoxLayout(container)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -129,7 +152,7 @@ class SettingsPage(QWidget):
         lbl_title.setStyleSheet(f"color: {self.theme['text']}; font-weight: 600;")
         header_layout.addWidget(lbl_title)
         
-        lbl_path = QLabel(path)
+        lbl_path = QLabel(subtitle)
         lbl_path.setStyleSheet(f"color: {self.theme['text_sec']}; font-size: 11px;")
         header_layout.addWidget(lbl_path, 0, Qt.AlignmentFlag.AlignRight)
         
@@ -151,15 +174,6 @@ class SettingsPage(QWidget):
             }}
         """)
         
-        content = "File not found."
-        if os.path.exists(path):
-            try:
-                with open(path, "r") as f:
-                    content = f.read()
-            except Exception as e:
-                content = f"Error reading file: {e}"
-        
-        viewer.setText(content)
         layout.addWidget(viewer)
         
         self.container_layout.addWidget(container)
@@ -226,6 +240,20 @@ class SettingsPage(QWidget):
             }}
         """)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_stats()
+
+    def refresh_stats(self):
+        # go2rtc stats come over HTTP, so build the report off the GUI thread
+        threading.Thread(target=self._stats_thread, daemon=True).start()
+
+    def _stats_thread(self):
+        try:
+            self.stats_signals.result.emit(format_report(fetch_bridge_stats(), bridge_process_stats()))
+        except Exception as e:
+            logging.error(f"Failed to build video stats: {e}")
+
     def clear_logs(self):
         try:
             if os.path.exists(LOG_FILE):
@@ -241,6 +269,8 @@ class SettingsPage(QWidget):
             QMessageBox.warning(self, "Error", f"Failed to clear logs: {str(e)}")
 
     def refresh_logs(self):
+        self.refresh_stats()
+        
         # Refresh App Log
         content = "File not found."
         if os.path.exists(LOG_FILE):
@@ -3,12 +3,13 @@ from PyQt6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QPushButt
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QPropertyAnimation, pyqtProperty
 from PyQt6.QtGui import QColor, QFont, QTransform
 import qtawesome as qta
+import asyncio
 import json
+import logging
 import os
-import threading
 from ..theme import THEME_DARK
 from ..widgets import CardWidget, GlowingIcon, GradientSlider, DeviceCard
-from ...services.wiz import WiZLightClient
+from ...services.wiz import WiZLightClient, PilotCoalescer, WiZPushListener, summarize
 from ...core.constants import DEFAULT_TEMP, DEFAULT_DIMMING
 
 ICSEE_CONFIG = os.path.join(os.path.expanduser("~"), ".home_control_config.json")
@@ -16,10 +17,15 @@ ICSEE_CONFIG = os.path.join(os.path.expanduser("~"), ".home_control_config.json"
 class WiZTab(QWidget):
     scan_finished = pyqtSignal(list)
     sync_finished = pyqtSignal(dict)
+    command_result = pyqtSignal(object) # CommandResult from the WiZ event loop
+    group_finished = pyqtSignal(str, object) # (command label, [CommandResult])
+    state_pushed = pyqtSignal(str, dict) # (ip, pilot) from a bulb's syncPilot push
 
     def __init__(self):
         super().__init__()
         self.client = WiZLightClient()
+        self.pilot = PilotCoalescer(self.client, on_result=self.command_result.emit) # Slider drags: newest value per bulb, rate-capped
+        self.push = WiZPushListener(self.client, on_state=self.state_pushed.emit) # Live state from wall switches, the WiZ app, ...
         self.wiz_state = False
         self.wiz_ip = None
         self.is_syncing = False
@@ -30,6 +36,9 @@ class WiZTab(QWidget):
 
         self.scan_finished.connect(self._update_scan_results)
         self.sync_finished.connect(self._apply_data)
+        self.command_result.connect(self.on_command_result)
+        self.group_finished.connect(self.on_group_finished)
+        self.state_pushed.connect(self.on_state_pushed)
 
         # Main Layout (Split View)
         layout = QHBoxLayout(self)
@@ -46,6 +55,7 @@ class WiZTab(QWidget):
         # Header
         self.lbl_status = QLabel("Select a light")
         self.lbl_status.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.lbl_status.setWordWrap(True) # Group command summaries can run long
         left_layout.addWidget(self.lbl_status)
 
         # Power Button
@@ -71,6 +81,7 @@ class WiZTab(QWidget):
         self.sl_temp.setRange(2700, 6500)
         self.sl_temp.setValue(DEFAULT_TEMP)
         self.sl_temp.valueChanged.connect(self.update_labels)
+        self.sl_temp.valueChanged.connect(self.on_slider_changed)
         self.sl_temp.sliderReleased.connect(self.send_pilot)
         controls_layout.addWidget(self.sl_temp)
 
@@ -85,6 +96,7 @@ class WiZTab(QWidget):
         self.sl_dim.setRange(10, 100)
         self.sl_dim.setValue(DEFAULT_DIMMING)
         self.sl_dim.valueChanged.connect(self.update_labels)
+        self.sl_dim.valueChanged.connect(self.on_slider_changed)
         self.sl_dim.sliderReleased.connect(self.send_pilot)
         controls_layout.addWidget(self.sl_dim)
 
@@ -290,15 +302,12 @@ class WiZTab(QWidget):
         # Use Scene 14 (Night Light) as requested
         if not self.wiz_ip: return
         
-        # Payload based on user request: sceneId 14 ("Night light")
-        payload = {"id": 1, "method": "setPilot", "params": {"sceneId": 14, "dimming": 10}}
+        # Params based on user request: sceneId 14 ("Night light")
+        params = {"sceneId": 14, "dimming": 10}
         
-        if self.wiz_ip == "ALL":
-             targets = [ip for ip in self.device_cards.keys() if ip != "ALL"]
-             for ip in targets:
-                 threading.Thread(target=self.client.send_request, args=(ip, payload), daemon=True).start()
-        else:
-            threading.Thread(target=self.client.send_request, args=(self.wiz_ip, payload), daemon=True).start()
+        # Through the coalescer, so a drag still in flight cannot land after the scene
+        for ip in self._targets():
+            self.pilot.update(ip, params)
             
         # Update UI to reflect this special state
         self.sl_temp.blockSignals(True)
@@ -317,23 +326,25 @@ class WiZTab(QWidget):
         self.btn_scan.setEnabled(False)
         # Pass known IPs for active probing to improve reliability
         known_ips = list(self.wiz_names.keys())
-        threading.Thread(target=self._scan_thread, args=(known_ips,), daemon=True).start()
+        self.client.submit(self._scan(known_ips))
 
-    def _scan_thread(self, known_ips):
-        # 1. Broadcast Scan
-        found = self.client.scan(broadcast_timeout=2.0)
-        
-        # 2. Active Probe for known missing devices (Reliability Fix)
-        # Often UDP broadcast packets are dropped, so we unicast check known ones.
-        missing = [ip for ip in known_ips if ip not in found]
-        for ip in missing:
-            try:
-                # Short timeout for probe
-                if self.client.send_request(ip, {"method": "getPilot", "params": {}}, timeout=0.5):
-                    found.append(ip)
-            except: pass
-            
-        self.scan_finished.emit(found)
+    async def _scan(self, known_ips):
+        # Runs on the WiZ client's event loop
+        found = []
+        try:
+            # Broadcast scan, plus a unicast probe of every known IP at the same time
+            # (Reliability Fix: often UDP broadcast packets are dropped). Both share
+            # the socket, so the scan takes as long as the broadcast window, however
+            # many bulbs are known.
+            broadcast, probed = await asyncio.gather(
+                self.client.async_scan(broadcast_timeout=2.0),
+                self.client.async_probe(known_ips, timeout=0.5),
+            )
+            found = broadcast + [ip for ip in probed if ip not in broadcast]
+        except Exception as e:
+            logging.error(f"WiZ scan failed: {e}")
+        finally:
+            self.scan_finished.emit(found)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -404,6 +415,7 @@ class WiZTab(QWidget):
         # This addresses user request to show offline devices
         all_known = set(self.wiz_names.keys()) | found_set
         self.current_ips = sorted(list(all_known))
+        self.push.set_lights(self.current_ips) # Offline ones register once they come back
         
         # Add "All Lights" Card
         if self.current_ips:
@@ -452,10 +464,12 @@ class WiZTab(QWidget):
         if not self.wiz_ip or self.wiz_ip == "ALL": return
         self.is_syncing = True
         self.lbl_status.setText(f"Syncing {self.wiz_ip}...")
-        threading.Thread(target=self._sync_thread, daemon=True).start()
+        future = self.client.submit(self.client.async_get_state(self.wiz_ip))
+        future.add_done_callback(self._on_state)
 
-    def _sync_thread(self):
-        res = self.client.get_state(self.wiz_ip)
+    def _on_state(self, future):
+        # Called on the WiZ client's event loop; hop to the GUI thread via the signal
+        res = None if future.cancelled() or future.exception() else future.result()
         if res and "result" in res:
             self.sync_finished.emit(res["result"])
 
@@ -472,21 +486,52 @@ class WiZTab(QWidget):
         
         # Update card status
         if self.wiz_ip in self.device_cards:
+            self.device_cards[self.wiz_ip].set_degraded(False)
             self.device_cards[self.wiz_ip].set_status(True)
 
+    def on_state_pushed(self, ip, data):
+        # A bulb reported a state change (ours, a wall switch or another app)
+        card = self.device_cards.get(ip)
+        if card:
+            card.set_degraded(False)
+            card.set_status(True)
+        if ip != self.wiz_ip or self.is_syncing:
+            return
+        # Our own updates echo back while a drag is in flight; don't snap the sliders to them
+        if self.sl_temp.isSliderDown() or self.sl_dim.isSliderDown() or self.pilot.is_busy(ip):
+            return
+        if "state" in data and data["state"] != self.wiz_state:
+            self.wiz_state = data["state"]
+            self.update_power_ui()
+        if "temp" in data:
+            self.sl_temp.animate_to_value(data["temp"])
+        if "dimming" in data:
+            self.sl_dim.animate_to_value(data["dimming"])
+        self.update_labels()
+
     def toggle_power(self):
         if not self.wiz_ip: return
         
         self.wiz_state = not self.wiz_state
         self.update_power_ui()
         
-        if self.wiz_ip == "ALL":
-             # Group Control
-             targets = [ip for ip in self.device_cards.keys() if ip != "ALL"]
-             for ip in targets:
-                 threading.Thread(target=self.client.set_power, args=(ip, self.wiz_state), daemon=True).start()
-        else:
-            threading.Thread(target=self.client.set_power, args=(self.wiz_ip, self.wiz_state), daemon=True).start()
+        # Every bulb at once, each retransmitted until it acks; summarized when all are done
+        future = self.client.submit(self.client.async_group(self._targets(), "setState", {"state": self.wiz_state}))
+        label = "Power on" if self.wiz_state else "Power off"
+        future.add_done_callback(lambda f: self.group_finished.emit(label, [] if f.cancelled() or f.exception() else f.result()))
+
+    def on_command_result(self, result):
+        card = self.device_cards.get(result.ip)
+        if card:
+            card.set_degraded(not result.ok, result.error)
+        if not result.ok and result.ip == self.wiz_ip:
+            self.lbl_status.setText(f"No response from {result.ip}" if result.error == "no reply" else f"{result.ip}: {result.error}")
+
+    def on_group_finished(self, label, results):
+        for result in results:
+            self.on_command_result(result)
+        if len(results) > 1:
+            self.lbl_status.setText(f"{label}: {summarize(results)}")
 
     def update_power_ui(self):
         # Warm white glow for light bulb
@@ -498,11 +543,23 @@ class WiZTab(QWidget):
 
     def send_pilot(self):
         if self.is_syncing or not self.wiz_ip: return
-        payload = (self.sl_temp.value(), self.sl_dim.value())
-        
+        params = {"temp": self.sl_temp.value(), "dimming": self.sl_dim.value()}
+        for ip in self._targets():
+            self.pilot.update(ip, params)
+
+    def on_slider_changed(self):
+        # Live updates while the user drags (not for animations or programmatic moves)
+        if self.sl_temp.isSliderDown() or self.sl_dim.isSliderDown():
+            self.send_pilot()
+
+    def shutdown(self):
+        """Stop the push listener and pending slider sends, close the WiZ socket and stop its event loop"""
+        self.push.stop()
+        self.pilot.stop()
+        self.client.close()
+
+    def _targets(self):
+        # Bulbs addressed by the current selection ("ALL" = every known bulb)
         if self.wiz_ip == "ALL":
-             targets = [ip for ip in self.device_cards.keys() if ip != "ALL"]
-             for ip in targets:
-                 threading.Thread(target=self.client.set_pilot, args=(ip, *payload), daemon=True).start()
-        else:
-            threading.Thread(target=self.client.set_pilot, args=(self.wiz_ip, *payload), daemon=True).start()
+            return [ip for ip in self.device_cards.keys() if ip != "ALL"]
+        return [self.wiz_ip] if self.wiz_ip else []
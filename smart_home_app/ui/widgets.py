@@ -151,6 +151,14 @@ class AirQualityRing(QWidget):
         painter.setPen(QColor(self.theme["text_sec"]))
         painter.drawText(rect.adjusted(0, 60, 0, 0), Qt.AlignmentFlag.AlignCenter, "PM2.5")
 
+_ICON_CACHE = {}
+
+def _cached_icon(name, color):
+    icon = _ICON_CACHE.get((name, color))
+    if icon is None:
+        icon = _ICON_CACHE[(name, color)] = qta.icon(name, color=color)
+    return icon
+
 class DeviceCard(QPushButton):
     def __init__(self, name, icon_name, ip, parent=None, on_rename=None, on_delete=None, size=(140, 140), bg_color=None):
         super().__init__(parent)
@@ -171,6 +179,11 @@ class DeviceCard(QPushButton):
         self.on_delete = on_delete
         self.bg_color = bg_color
         self.icon_name = icon_name
+        self.badge_color = None
+        self.thumbnail = None
+        self._icon_key = None
+        self.online = None
+        self.degraded = False
         
         if self.is_small:
             self.setIcon(qta.icon(icon_name, color=self.theme['text']))
@@ -229,6 +242,46 @@ class DeviceCard(QPushButton):
 
         self.update_style()
 
+    def set_badge(self, color=None):
+        # Small dot in the top-right corner (e.g. motion on a camera); None hides it
+        if color == self.badge_color:
+            return
+        self.badge_color = color
+        self.update()
+
+    def set_thumbnail(self, pixmap=None):
+        # Camera snapshot painted in place of the icon (small cards only); None restores the icon
+        self.thumbnail = pixmap if pixmap and not pixmap.isNull() else None
+        if self.is_small:
+            self.update_style()
+        self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.thumbnail is not None and self.is_small:
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            inset = 3 if self.isChecked() else 0 # Leave the accent ring visible
+            rect = self.rect().adjusted(inset, inset, -inset, -inset)
+            path = QPainterPath()
+            path.addEllipse(rect.x(), rect.y(), rect.width(), rect.height())
+            painter.setClipPath(path)
+            # Centre-crop to fill the circle
+            src = self.thumbnail.rect()
+            side = min(src.width(), src.height())
+            src = QRect(src.x() + (src.width() - side) // 2, src.y() + (src.height() - side) // 2, side, side)
+            painter.drawPixmap(rect, self.thumbnail, src)
+            painter.end()
+        if self.badge_color:
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(self.badge_color))
+            size = 10 if self.is_small else 12
+            painter.drawEllipse(self.width() - size - 4, 4, size, size)
+            painter.end()
+
     @pyqtProperty(QColor)
     def bg_color_prop(self):
         return QColor(self._current_bg)
@@ -280,6 +333,9 @@ class DeviceCard(QPushButton):
         self.update_style()
 
     def set_status(self, online):
+        self.online = online
+        if self.degraded:
+            return # "No response" stays until a command gets through again
         if self.status_lbl:
             if online is None:
                 self.status_lbl.setText("")
@@ -287,6 +343,22 @@ class DeviceCard(QPushButton):
                 self.status_lbl.setText("Online" if online else "Offline")
                 self.status_lbl.setStyleSheet(f"color: {self.theme['green'] if online else self.theme['text_sec']}; font-size: 11px; background: transparent;")
 
+    def set_degraded(self, degraded, reason=None):
+        # Device stopped acknowledging commands: orange dot and status until one succeeds
+        if degraded == self.degraded:
+            return
+        self.degraded = degraded
+        self.set_badge(self.theme['orange'] if degraded else None)
+        if degraded:
+            self._base_tooltip = self.toolTip()
+            if self.status_lbl:
+                self.status_lbl.setText("No response")
+                self.status_lbl.setStyleSheet(f"color: {self.theme['orange']}; font-size: 11px; background: transparent;")
+            self.setToolTip(f"{self.name} ({self.ip}): {reason or 'not responding'}")
+        else:
+            self.setToolTip(getattr(self, '_base_tooltip', ""))
+            self.set_status(True) # It just answered
+
     def update_style(self):
         t = self.theme
         bg = self._current_bg
@@ -299,7 +371,13 @@ class DeviceCard(QPushButton):
             icon_color = "white"
         
         if self.is_small:
-            self.setIcon(qta.icon(self.icon_name, color=icon_color))
+            # Cached: qta renders a fresh icon on every call, and this runs on every hover frame
+            key = (self.icon_name, icon_color)
+            if self.thumbnail is not None:
+                key = None
+            if key != self._icon_key:
+                self._icon_key = key
+                self.setIcon(_cached_icon(*key) if key else QIcon())
         
         radius = 12
         border_val = f"1px solid {border}"
@@ -0,0 +1,52 @@
+from smart_home_app.services.audio import STEP_MS, JitterBuffer
+
+
+def _pcm(ms, value=1):
+    # 16 kHz mono s16le: 32 bytes per millisecond
+    return bytes([value]) * (32 * ms)
+
+
+def test_silence_until_the_target_depth_is_buffered():
+    buf = JitterBuffer(target_ms=80)
+    buf.push(_pcm(40))
+    assert buf.pull(640) == bytes(640)
+    buf.push(_pcm(40))
+    assert buf.pull(640) == _pcm(20)
+    assert buf.buffered_ms == 60
+
+
+def test_underrun_deepens_the_buffer():
+    buf = JitterBuffer(target_ms=80)
+    buf.push(_pcm(80))
+    buf.pull(32 * 80)
+    assert buf.pull(640) == bytes(640)
+    assert buf.underruns == 1
+    assert buf.target_ms == 80 + STEP_MS
+    # Rebuffers to the new depth before playing again
+    buf.push(_pcm(80))
+    assert buf.pull(640) == bytes(640)
+    buf.push(_pcm(20))
+    assert buf.pull(640) == _pcm(20)
+
+
+def test_burst_is_trimmed_from_the_oldest_end():
+    buf = JitterBuffer(target_ms=80)
+    buf.push(_pcm(100, value=1))
+    buf.push(_pcm(100, value=2))
+    assert buf.buffered_ms == 80
+    assert buf.dropped_ms == 120
+    assert buf.pull(640) == _pcm(20, value=2)
+
+
+def test_never_plays_ahead_of_the_video():
+    buf = JitterBuffer(target_ms=80)
+    buf.set_video_delay(200)
+    buf.push(_pcm(100))
+    assert buf.pull(640) == bytes(640)
+    assert buf.stats()["target_ms"] == 200
+
+
+def test_pull_keeps_sample_alignment():
+    buf = JitterBuffer(target_ms=40, min_ms=40)
+    buf.push(_pcm(40))
+    assert len(buf.pull(641)) == 640
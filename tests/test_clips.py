@@ -0,0 +1,119 @@
+from pathlib import Path
+
+import numpy as np
+
+from smart_home_app.services.clips import ClipBuffer, ClipWriter
+
+
+class _Writer:
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, key, path, frames, fps):
+        self.jobs.append((key, path, frames, fps))
+
+
+def _buffer(tmp_path, **kwargs):
+    writer = _Writer()
+    # 8 fps, so frame times are exact in binary floating point
+    options = dict(pre_roll=2.0, post_roll=1.0, fps=8.0, idle_fps=1.0)
+    options.update(kwargs)
+    return ClipBuffer("a1b2c3d4", "Gate", tmp_path, writer, **options), writer
+
+
+def _frame():
+    return np.zeros((48, 64, 3), dtype=np.uint8)
+
+
+def test_idle_sampling_is_slower_unless_a_clip_is_pending(tmp_path):
+    clips, _ = _buffer(tmp_path)
+    clips.feed(_frame(), 100.0)
+    assert clips.due(100.125)
+    assert not clips.due(100.125, idle=True)
+    assert clips.due(101.0, idle=True)
+    clips.trigger()
+    assert clips.due(100.125, idle=True) # Post-roll is collected at full rate
+
+
+def test_history_is_trimmed_by_age_and_bytes(tmp_path):
+    clips, _ = _buffer(tmp_path)
+    for n in range(50):
+        clips.feed(_frame(), n * 0.125)
+    assert len(clips._frames) == 17 # Two seconds plus the newest frame
+    assert clips._frames[0][0] == 49 * 0.125 - clips.pre_roll
+    size = clips.bytes
+
+    small, _ = _buffer(tmp_path, max_bytes=size // 4)
+    for n in range(50):
+        small.feed(_frame(), n * 0.125)
+    assert 0 < small.bytes <= size // 4
+
+
+def test_resample_repeats_sparse_frames_for_real_time_playback(tmp_path):
+    clips, _ = _buffer(tmp_path)
+    out = clips._resample([(0.0, b"a"), (1.0, b"b"), (1.125, b"c")])
+    assert out == [b"a"] * 8 + [b"b"] + [b"c"]
+
+
+def test_clip_is_keyed_by_camera_id_and_includes_pre_roll(tmp_path):
+    clips, writer = _buffer(tmp_path)
+    for n in range(17):
+        clips.feed(_frame(), 1000.0 + n * 0.125)
+    clips._pending = (1002.0, 1003.0, "motion") # trigger() at t=1002
+    for n in range(17, 30):
+        clips.feed(_frame(), 1000.0 + n * 0.125)
+    assert len(writer.jobs) == 1
+    key, path, frames, fps = writer.jobs[0]
+    assert key == "a1b2c3d4"
+    assert path.parent == tmp_path
+    assert path.name.endswith("-motion.mp4")
+    # Two seconds of pre-roll, one of post-roll and the frame that ended it
+    assert len(frames) == 25
+    assert not clips.pending
+
+
+def test_overdue_clip_is_saved_when_frames_stop(tmp_path):
+    clips, writer = _buffer(tmp_path)
+    clips.feed(_frame(), 500.0)
+    clips._pending = (500.0, 501.0, "manual")
+    assert not clips.flush_overdue(501.5, grace=1.0)
+    assert clips.flush_overdue(502.0, grace=1.0)
+    assert len(writer.jobs) == 1
+    assert not clips.flush_overdue(600.0)
+
+
+def test_finish_saves_a_pending_clip_right_away(tmp_path):
+    clips, writer = _buffer(tmp_path)
+    clips.feed(_frame(), 500.0)
+    clips.finish() # Nothing pending
+    assert writer.jobs == []
+    clips._pending = (500.0, 501.0, "manual")
+    clips.finish()
+    assert len(writer.jobs) == 1
+
+
+def test_writer_never_reuses_a_clip_name(tmp_path):
+    path = tmp_path / "20250101-120000-000-motion.mp4"
+    assert ClipWriter._unused(path) == path
+    path.touch()
+    second = ClipWriter._unused(path)
+    assert second.name == "20250101-120000-000-motion-1.mp4"
+    second.touch()
+    assert ClipWriter._unused(path).name == "20250101-120000-000-motion-2.mp4"
+
+
+def test_writer_saves_an_mp4_and_reports_the_camera(tmp_path):
+    saved = []
+    clips, _ = _buffer(tmp_path)
+    writer = ClipWriter(on_saved=lambda key, path: saved.append((key, path)))
+    clips.writer = writer
+    clips.feed(_frame(), 10.0)
+    clips.feed(_frame(), 10.125)
+    clips._pending = (10.0, 10.125, "manual")
+    clips.finish()
+    writer.stop()
+    assert len(saved) == 1
+    key, path = saved[0]
+    assert key == "a1b2c3d4"
+    assert Path(path).suffix == ".mp4"
+    assert Path(path).stat().st_size > 0
@@ -0,0 +1,71 @@
+from smart_home_app.services.frames import FrameMailbox, FrameRing
+
+
+def test_ring_reuses_released_slot():
+    ring = FrameRing(slots=2)
+    first = ring.acquire(4, 6)
+    buf = first.array
+    first.release()
+    again = ring.acquire(4, 6)
+    assert again.array is buf
+    assert again.seq == first.seq + 1
+
+
+def test_ring_drops_when_every_slot_is_busy():
+    ring = FrameRing(slots=2)
+    held = [ring.acquire(4, 6), ring.acquire(4, 6)]
+    assert ring.acquire(4, 6) is None
+    assert ring.dropped == 1
+    assert ring.in_use() == 2
+    held[0].release()
+    assert ring.acquire(4, 6) is not None
+
+
+def test_ring_reallocates_on_resolution_change():
+    ring = FrameRing(slots=1)
+    frame = ring.acquire(4, 6)
+    frame.release()
+    frame = ring.acquire(8, 10)
+    assert (frame.height, frame.width) == (8, 10)
+    assert frame.array.shape == (8, 10, 3)
+
+
+def test_release_twice_does_not_free_a_reused_slot():
+    ring = FrameRing(slots=1)
+    frame = ring.acquire(4, 6)
+    frame.release()
+    current = ring.acquire(4, 6)
+    frame.release() # Stale handle
+    assert ring.in_use() == 1
+    current.release()
+    assert ring.in_use() == 0
+
+
+def test_trim_frees_idle_buffers_only():
+    ring = FrameRing(slots=2)
+    held = ring.acquire(4, 6)
+    ring.acquire(4, 6).release()
+    ring.trim()
+    assert ring.nbytes() == held.array.nbytes
+
+
+def test_mailbox_keeps_only_the_newest_frame():
+    ring = FrameRing(slots=3)
+    box = FrameMailbox()
+    first, second = ring.acquire(4, 6), ring.acquire(4, 6)
+    assert box.put(first) is True # Empty mailbox: wake the consumer
+    assert box.put(second) is False # Already woken
+    assert box.dropped == 1
+    assert ring.in_use() == 1 # The stale frame went back to the ring
+    assert box.take() is second
+    assert box.take() is None
+    assert box.delivered == 1
+
+
+def test_mailbox_clear_releases_the_waiting_frame():
+    ring = FrameRing(slots=1)
+    box = FrameMailbox()
+    box.put(ring.acquire(4, 6))
+    box.clear()
+    assert ring.in_use() == 0
+    assert box.take() is None
@@ -0,0 +1,39 @@
+from smart_home_app.services.metrics import RateMeter, RollingHistogram, stats_for
+
+
+def test_stats_are_keyed_by_camera_id_not_name():
+    a = stats_for("test-metrics-a", "Front door")
+    b = stats_for("test-metrics-b", "Front door")
+    assert a is not b
+    assert stats_for("test-metrics-a") is a
+
+
+def test_stats_name_follows_renames():
+    stats = stats_for("test-metrics-rename", "Garage")
+    assert stats_for("test-metrics-rename", "Driveway") is stats
+    assert stats.name == "Driveway"
+
+
+def test_decode_time_is_its_own_stage():
+    stats = stats_for("test-metrics-decode", "Porch")
+    stats.note_decoded(1.0, decode_ms=12.0)
+    stats.note_converted(3.0)
+    stages = stats.snapshot()["stages_ms"]
+    assert stages["decode"]["p50"] == 12.0
+    assert stages["convert"]["p50"] == 3.0
+
+
+def test_histogram_percentiles():
+    hist = RollingHistogram(size=100)
+    assert hist.percentile(50) is None
+    for value in range(1, 101):
+        hist.add(float(value))
+    assert hist.percentile(0) == 1.0
+    assert hist.percentile(100) == 100.0
+    assert 50.0 <= hist.percentile(50) <= 51.0
+
+
+def test_rate_meter_forgets_old_ticks():
+    meter = RateMeter(window=1.0)
+    meter.tick(0.0) # Long before now on the monotonic clock
+    assert meter.rate() == 0.0
@@ -0,0 +1,51 @@
+import numpy as np
+
+from smart_home_app.services.motion import HOLD_SECONDS, MotionDetector
+
+
+def _frame(lit=None):
+    # 320x240 black frame, optionally with a white (x0, y0, x1, y1) block
+    bgr = np.zeros((240, 320, 3), dtype=np.uint8)
+    if lit is not None:
+        x0, y0, x1, y1 = lit
+        bgr[y0:y1, x0:x1] = 255
+    return bgr
+
+
+def _run(detector, frames, start=0.0, step=0.2):
+    now = start
+    for bgr in frames:
+        detector.feed(bgr, now)
+        now += step
+    return now
+
+
+def test_events_carry_the_camera_id():
+    events = []
+    detector = MotionDetector("a1b2c3d4", on_event=events.append, checks_per_second=5)
+    now = _run(detector, [_frame()] + [_frame((0, 0, 160, 120))] * 3)
+    assert [e.kind for e in events] == ["start", "update"]
+    assert all(e.key == "a1b2c3d4" for e in events)
+    box = events[0].box
+    assert box[0] == 0.0 and box[1] == 0.0
+    assert 0.45 <= box[2] <= 0.55
+
+    # Once the background has settled, quiet for the hold time ends the event
+    _run(detector, [_frame()] * int(HOLD_SECONDS / 0.2 + 10), start=now)
+    assert events[-1].kind == "stop"
+    assert not detector.active
+
+
+def test_motion_outside_the_roi_is_ignored():
+    events = []
+    detector = MotionDetector("cam", roi=[(0.5, 0.5, 0.5, 0.5)], on_event=events.append)
+    _run(detector, [_frame()] + [_frame((0, 0, 100, 100))] * 4)
+    assert events == []
+
+
+def test_due_follows_the_check_rate():
+    detector = MotionDetector("cam", checks_per_second=5)
+    assert detector.due(0.0)
+    detector.feed(_frame(), 0.0)
+    assert not detector.due(0.1)
+    assert detector.due(0.2)
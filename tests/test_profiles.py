@@ -0,0 +1,40 @@
+from smart_home_app.services.profiles import MAIN, SUB, ProfileSelector, bridge_streams, camera_url, stream_name
+
+
+def test_selector_hysteresis():
+    selector = ProfileSelector(sub_max_width=1000, hysteresis=0.2)
+    assert selector.choose(900) == SUB
+    assert selector.choose(1100) == MAIN
+    # Once on main, only drop back well below the limit
+    assert selector.choose(900, current=MAIN) == MAIN
+    assert selector.choose(790, current=MAIN) == SUB
+    # Once on sub, switch up as soon as it is too small
+    assert selector.choose(1001, current=SUB) == MAIN
+
+
+def test_selector_accounts_for_zoom():
+    selector = ProfileSelector(sub_max_width=1000)
+    assert selector.choose(400, zoom=1.0) == SUB
+    assert selector.choose(400, zoom=3.0) == MAIN
+
+
+def test_selector_uses_main_without_a_substream():
+    assert ProfileSelector().choose(100, available=False) == MAIN
+    assert ProfileSelector(sub_max_width=0).choose(100) == MAIN
+
+
+def test_camera_url_falls_back_to_main():
+    cam = {"ip": "10.0.0.5", "user": "admin", "pass": "pw"}
+    assert camera_url(cam, SUB) == camera_url(cam, MAIN) == "rtsp://admin:pw@10.0.0.5:554/live/0/main"
+    cam["sub_path"] = "stream2"
+    assert camera_url(cam, SUB) == "rtsp://admin:pw@10.0.0.5:554/stream2"
+
+
+def test_bridge_streams_are_named_by_camera_id():
+    cam = {"id": "a1b2c3d4", "ip": "10.0.0.5", "sub_path": "/sub"}
+    assert sorted(bridge_streams(cam)) == [stream_name("a1b2c3d4"), stream_name("a1b2c3d4", SUB)]
+    xmeye = {"id": "e5f6a7b8", "ip": "10.0.0.6", "protocol": "xmeye"}
+    names = list(bridge_streams(xmeye))
+    # Raw source first, so it exists when its re-stream starts
+    assert names[:2] == ["cam_e5f6a7b8_raw", "cam_e5f6a7b8"]
+    assert bridge_streams({"ip": "10.0.0.7"}) == {}
@@ -0,0 +1,56 @@
+import os
+import time
+
+from smart_home_app.services.clips import CLIPS_DIR
+from smart_home_app.services.recorder import RetentionPolicy, camera_dirname
+
+
+def _segment(path, size, age_days=0.0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+    stamp = time.time() - age_days * 86400
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_camera_dirname_is_filesystem_safe():
+    assert camera_dirname("Front door / porch") == "Front_door_porch"
+    assert camera_dirname("...") == "camera"
+
+
+def test_camera_dirname_keeps_same_named_cameras_apart():
+    assert camera_dirname("Gate", "a1b2c3d4") == "Gate_a1b2c3d4"
+    assert camera_dirname("Gate", "a1b2c3d4") != camera_dirname("Gate", "e5f6a7b8")
+    # Never starts with "_", so it cannot collide with the clip tree
+    assert not camera_dirname("_clips", "a1b2c3d4").startswith("_")
+
+
+def test_retention_deletes_by_age(tmp_path):
+    old = _segment(tmp_path / "cam" / "old.mkv", 10, age_days=10)
+    new = _segment(tmp_path / "cam" / "new.mkv", 10, age_days=1)
+    assert RetentionPolicy(max_age_days=7, max_bytes=None).apply(tmp_path) == (1, 10)
+    assert not old.exists()
+    assert new.exists()
+
+
+def test_retention_deletes_oldest_until_under_budget(tmp_path):
+    segments = [_segment(tmp_path / "cam" / f"{n}.mp4", 100, age_days=3 - n) for n in range(3)]
+    assert RetentionPolicy(max_age_days=None, max_bytes=150).apply(tmp_path) == (2, 200)
+    assert [s.exists() for s in segments] == [False, False, True]
+
+
+def test_retention_spares_the_segment_being_written(tmp_path):
+    directory = tmp_path / "cam"
+    older = _segment(directory / "a.mkv", 100, age_days=2)
+    writing = _segment(directory / "b.mkv", 100, age_days=1)
+    RetentionPolicy(max_age_days=None, max_bytes=0).apply(tmp_path, active=(directory,))
+    assert not older.exists()
+    assert writing.exists()
+
+
+def test_retention_ignores_other_files_and_the_clip_tree(tmp_path):
+    note = _segment(tmp_path / "cam" / "notes.txt", 100, age_days=30)
+    clip = _segment(tmp_path / CLIPS_DIR / "cam" / "clip.mp4", 100, age_days=30)
+    assert RetentionPolicy(max_age_days=7, max_bytes=0).apply(tmp_path) == (0, 0)
+    assert note.exists()
+    assert clip.exists()
@@ -0,0 +1,43 @@
+import http.client
+import os
+
+import cv2
+import numpy as np
+
+from smart_home_app.services import thumbnails
+from smart_home_app.services.thumbnails import ThumbnailCache, ThumbnailRefresher, shrink_jpeg, thumbnail_key
+
+
+def test_key_is_stable_and_distinct_per_camera_id():
+    assert thumbnail_key("a1b2c3d4") == thumbnail_key("a1b2c3d4")
+    assert thumbnail_key("a1b2c3d4") != thumbnail_key("e5f6a7b8")
+    assert len(thumbnail_key("a1b2c3d4")) == 16
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ThumbnailCache(tmp_path, max_entries=2)
+    for n, key in enumerate(["a", "b"]):
+        cache.store(key, b"jpeg")
+        os.utime(cache.path(key), (1000 + n, 1000 + n))
+    assert cache.load("a") == b"jpeg" # Now the most recently used
+    cache.store("c", b"jpeg")
+    assert cache.load("b") is None
+    assert cache.load("a") == b"jpeg"
+    assert cache.load("c") == b"jpeg"
+
+
+def test_shrink_jpeg_downscales():
+    ok, jpeg = cv2.imencode(".jpg", np.zeros((1080, 1920, 3), dtype=np.uint8))
+    small = cv2.imdecode(np.frombuffer(shrink_jpeg(jpeg.tobytes(), width=320), np.uint8), cv2.IMREAD_COLOR)
+    assert small.shape[:2] == (180, 320)
+    assert shrink_jpeg(b"not a jpeg") is None
+
+
+def test_truncated_fetch_does_not_stop_the_refresher(tmp_path, monkeypatch):
+    def urlopen(url, timeout):
+        raise http.client.IncompleteRead(b"partial")
+
+    monkeypatch.setattr(thumbnails.urllib.request, "urlopen", urlopen)
+    refresher = ThumbnailRefresher(ThumbnailCache(tmp_path))
+    refresher._refresh(thumbnail_key("a1b2c3d4"), "cam_a1b2c3d4")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,63 @@
+import random
+
+import numpy as np
+import pytest
+
+from smart_home_app.services.frames import FULL_ROI
+from smart_home_app.services.video import ReconnectPolicy, crop_roi, reconnect_status
+
+
+def test_backoff_doubles_up_to_the_cap():
+    policy = ReconnectPolicy(base=1.0, factor=2.0, cap=10.0, jitter=0.0)
+    assert [policy.delay(n) for n in range(1, 6)] == [1.0, 2.0, 4.0, 8.0, 10.0]
+
+
+def test_jitter_stays_within_bounds():
+    random.seed(7)
+    policy = ReconnectPolicy(base=4.0, jitter=0.25)
+    delays = [policy.delay(1) for _ in range(200)]
+    assert all(3.0 <= d <= 5.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_exhausted_after_max_attempts():
+    policy = ReconnectPolicy(max_attempts=3)
+    assert not policy.exhausted(3)
+    assert policy.exhausted(4)
+    assert not ReconnectPolicy(max_attempts=None).exhausted(1000)
+
+
+def test_reconnect_status_text():
+    assert reconnect_status(2, 3.6) == "Reconnecting (attempt 2, next in 4s)"
+    assert reconnect_status(1, -1.0) == "Reconnecting (attempt 1, next in 0s)"
+
+
+def test_crop_without_roi_is_the_whole_frame():
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    view, roi = crop_roi(image, None)
+    assert view is image
+    assert roi == FULL_ROI
+
+
+def test_crop_is_a_view_with_margin():
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    view, roi = crop_roi(image, (0.5, 0.5, 0.2, 0.2), margin=0.25)
+    assert np.shares_memory(view, image)
+    # 0.2 wide plus a quarter of that on each side, in source pixels
+    assert view.shape == (30, 60, 3)
+    assert roi == pytest.approx((0.45, 0.45, 0.3, 0.3))
+
+
+def test_crop_is_clamped_to_the_frame():
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    view, roi = crop_roi(image, (0.9, 0.0, 0.2, 0.2), margin=0.25)
+    assert view.shape[:2] == (25, 30)
+    assert roi[0] + roi[2] == pytest.approx(1.0)
+    assert roi[1] == 0.0
+
+
+def test_crop_covering_everything_returns_the_frame():
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    view, roi = crop_roi(image, (0.1, 0.1, 0.8, 0.8), margin=0.25)
+    assert view is image
+    assert roi == FULL_ROI
@@ -0,0 +1,220 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from smart_home_app.services.wiz import (
+    CommandResult,
+    PilotCoalescer,
+    WiZLightClient,
+    WiZProtocol,
+    WiZPushListener,
+    is_ack,
+    summarize,
+)
+
+
+class FakeBulb:
+    """A UDP endpoint on a loopback address that answers like a WiZ bulb.
+
+    ``reply(message)`` returns the response dict, or ``None`` to stay silent.
+    """
+
+    def __init__(self, ip="127.0.0.1", port=0, reply=None):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((ip, port))
+        self.sock.settimeout(0.1)
+        self.ip, self.port = self.sock.getsockname()
+        self.reply = reply or (lambda message: {"id": message.get("id"), "method": message.get("method"), "result": {"success": True}})
+        self.received = []
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self._running:
+            try:
+                data, addr = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            message = json.loads(data)
+            self.received.append(message)
+            if "result" in message:
+                continue # An ack from the app (e.g. to a syncPilot push); bulbs do not answer those
+            response = self.reply(message)
+            if response is not None:
+                self.sock.sendto(json.dumps(response).encode(), addr)
+
+    def close(self):
+        self._running = False
+        self._thread.join()
+        self.sock.close()
+
+
+@pytest.fixture
+def bulb():
+    bulb = FakeBulb()
+    yield bulb
+    bulb.close()
+
+
+@pytest.fixture
+def client(bulb):
+    client = WiZLightClient(port=bulb.port)
+    yield client
+    client.close()
+
+
+def test_request_gets_its_own_reply(bulb, client):
+    bulb.reply = lambda m: {"id": m["id"], "method": "getPilot", "result": {"state": True, "dimming": 40}}
+    reply = client.get_state(bulb.ip)
+    assert reply["result"]["dimming"] == 40
+    assert client.protocol._pending == {}
+
+
+def test_silent_bulb_times_out(bulb, client):
+    bulb.reply = lambda m: None
+    assert client.send_request(bulb.ip, {"method": "getPilot", "params": {}}, timeout=0.2) is None
+    assert client.protocol._pending == {}
+
+
+def test_reply_without_id_matches_the_oldest_request_for_its_method():
+    protocol = WiZProtocol()
+    protocol._pending = {("10.0.0.5", 1): ("getPilot", None), ("10.0.0.5", 2): ("setPilot", None)}
+    assert protocol._match("10.0.0.5", {"method": "setPilot"}) == ("10.0.0.5", 2)
+    assert protocol._match("10.0.0.5", {"id": 3, "method": "setPilot"}) is None
+    assert protocol._match("10.0.0.6", {"method": "getPilot"}) is None
+
+
+def _wait_until(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_coalescer_sends_the_latest_value_last(bulb, client):
+    results = []
+    pilot = PilotCoalescer(client, min_interval=0.05, on_result=results.append)
+    for dimming in range(10, 101, 5):
+        pilot.update(bulb.ip, {"dimming": dimming})
+    _wait_until(lambda: not pilot.is_busy(bulb.ip))
+    sent = [m["params"]["dimming"] for m in bulb.received if m["method"] == "setPilot"]
+    assert sent[-1] == 100
+    assert sent == sorted(sent) # Never overtaken by an older value
+    stats = pilot.stats()
+    assert stats["coalesced"] > 0
+    assert stats["sent"] + stats["coalesced"] == 19
+    assert results[-1].ok
+
+
+def test_coalescer_stop_cancels_sends_in_flight(bulb, client):
+    bulb.reply = lambda m: None # Never acks, so the send keeps retransmitting
+    pilot = PilotCoalescer(client, min_interval=0.05)
+    pilot.update(bulb.ip, {"dimming": 50})
+    _wait_until(lambda: bulb.received)
+    pilot.stop()
+    assert not pilot.is_busy(bulb.ip)
+    assert client.protocol._pending == {}
+    count = len(bulb.received)
+    time.sleep(0.6)
+    assert len(bulb.received) == count
+
+
+def test_command_is_retransmitted_until_acked(bulb, client):
+    def reply(message):
+        # Lose the first copy
+        if len(bulb.received) == 1:
+            return None
+        return {"id": message["id"], "method": message["method"], "result": {"success": True}}
+
+    bulb.reply = reply
+    result = client.submit(client.async_command(bulb.ip, "setState", {"state": True}, timeout=0.05)).result(2.0)
+    assert result.ok
+    assert result.attempts == 2
+    # Every copy carries the same id, so a late ack to any of them counts
+    assert len({m["id"] for m in bulb.received}) == 1
+
+
+def test_refusal_is_not_retransmitted(bulb, client):
+    bulb.reply = lambda m: {"id": m["id"], "method": m["method"], "error": {"code": -32600, "message": "Invalid Request"}}
+    result = client.submit(client.async_command(bulb.ip, "setPilot", {"temp": 1}, timeout=0.05)).result(2.0)
+    assert not result.ok
+    assert result.attempts == 1
+    assert result.error == "Invalid Request"
+
+
+def test_silent_bulb_gives_up_after_the_retries(bulb, client):
+    bulb.reply = lambda m: None
+    result = client.submit(client.async_command(bulb.ip, "setState", {"state": False}, retries=2, timeout=0.02)).result(2.0)
+    assert (result.ok, result.attempts, result.error) == (False, 3, "no reply")
+
+
+def test_is_ack():
+    assert is_ack({"result": {"success": True}})
+    assert not is_ack({"result": {"success": False}})
+    assert not is_ack({"error": {"message": "nope"}})
+    assert not is_ack(None)
+
+
+def test_summarize():
+    results = [
+        CommandResult("10.0.0.5", "setState", True, 1),
+        CommandResult("10.0.0.6", "setState", False, 4, "no reply"),
+        CommandResult("10.0.0.7", "setState", False, 1, "Invalid Request"),
+    ]
+    assert summarize(results) == "1/3 lights confirmed; no reply: 10.0.0.6; refused: 10.0.0.7 (Invalid Request)"
+    assert summarize(results[:1]) == "1/1 lights confirmed"
+
+
+def test_probe_asks_every_light_at_once():
+    answering = FakeBulb("127.0.0.2")
+    others = [FakeBulb("127.0.0.3", answering.port), FakeBulb("127.0.0.4", answering.port, reply=lambda m: None)]
+    client = WiZLightClient(port=answering.port)
+    try:
+        start = time.monotonic()
+        found = client.probe(["127.0.0.4", "127.0.0.2", "127.0.0.3", "127.0.0.2"], timeout=0.3)
+        elapsed = time.monotonic() - start
+    finally:
+        client.close()
+        for bulb in [answering] + others:
+            bulb.close()
+    assert sorted(found) == ["127.0.0.2", "127.0.0.3"]
+    # One shared deadline, not one per light
+    assert elapsed < 0.6
+    assert len(answering.received) == 1 # Duplicates are asked once
+
+
+def test_pushes_from_unknown_hosts_are_ignored():
+    states = []
+    listener = WiZPushListener(WiZLightClient(), on_state=lambda ip, params: states.append((ip, params)))
+    listener.registered = {"10.0.0.5": False}
+    listener._pushed("10.0.0.9", {"state": True})
+    assert states == []
+    assert listener.registered == {"10.0.0.5": False}
+    listener._pushed("10.0.0.5", {"state": True})
+    assert states == [("10.0.0.5", {"state": True})]
+    assert listener.registered == {"10.0.0.5": True}
+
+
+def test_registered_bulb_pushes_its_state(bulb, client):
+    states = []
+    listener = WiZPushListener(client, on_state=lambda ip, params: states.append((ip, params)), port=0)
+    try:
+        listener.set_lights([bulb.ip])
+        _wait_until(lambda: listener.registered.get(bulb.ip))
+        registration = next(m for m in bulb.received if m["method"] == "registration")
+        assert registration["params"]["phoneMac"] == listener.mac
+
+        port = listener._transport.get_extra_info("sockname")[1]
+        bulb.sock.sendto(json.dumps({"method": "syncPilot", "params": {"state": False}}).encode(), ("127.0.0.1", port))
+        _wait_until(lambda: states)
+        assert states == [(bulb.ip, {"state": False})]
+        # The push is acknowledged, so the bulb does not resend it
+        _wait_until(lambda: any(m["method"] == "syncPilot" for m in bulb.received))
+    finally:
+        listener.stop()